@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the analytics aggregation queries.
+Compares the old one-query-per-figure overview against a single
+GROUP BY scan and against the materialized guest_stats read used by
+/api/analytics/overview.
+Usage: python -m benchmarks.bench_analytics
+"""
+
+import time
+
+from benchmarks.common import make_app, seed_guests, StatementCounter, report
+from src.models import db, Guest
+from src.services.aggregates import overview_stats
+from src.services.guest_stats import scan_guest_groups, rebuild_guest_stats
+from sqlalchemy import func
+
+def legacy_overview():
+    """The overview as it used to be computed: one round trip per figure"""
+    return {
+        'total': Guest.query.count(),
+        'confirmed': Guest.query.filter_by(rsvp_status='confirmed').count(),
+        'pending': Guest.query.filter_by(rsvp_status='pending').count(),
+        'declined': Guest.query.filter_by(rsvp_status='declined').count(),
+        'total_attendance': int(db.session.query(func.sum(Guest.number_of_guests)).filter_by(rsvp_status='confirmed').scalar() or 0),
+        'attendance_breakdown': {
+            'ceremony_only': Guest.query.filter_by(attendance_type='ceremony', rsvp_status='confirmed').count(),
+            'reception_only': Guest.query.filter_by(attendance_type='reception', rsvp_status='confirmed').count(),
+            'both_events': Guest.query.filter_by(attendance_type='both', rsvp_status='confirmed').count()
+        }
+    }
+
+def scanned_overview():
+    return overview_stats({'groups': scan_guest_groups()})
+
+def measure(fn, repeat=20):
+    with StatementCounter(db.engine) as counter:
+        result = fn()
+    statements = counter.count
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) * 1000 / repeat
+    return result, statements, elapsed
+
+def main():
+    app = make_app()
+    rows = []
+    
+    with app.app_context():
+        seeded = 0
+        for size in (1000, 10000, 50000):
+            seed_guests(db, size - seeded)
+            seeded = size
+            # Core inserts bypass the session listeners, so recount once
+            rebuild_guest_stats()
+            
+            legacy, legacy_statements, legacy_ms = measure(legacy_overview)
+            scanned, scan_statements, scan_ms = measure(scanned_overview)
+            current, current_statements, current_ms = measure(overview_stats)
+            assert legacy == scanned == current, (legacy, scanned, current)
+            
+            rows.append({'guests': size, 'impl': 'legacy', 'statements': legacy_statements, 'ms/call': legacy_ms})
+            rows.append({'guests': size, 'impl': 'single scan', 'statements': scan_statements, 'ms/call': scan_ms})
+            rows.append({'guests': size, 'impl': 'materialized', 'statements': current_statements, 'ms/call': current_ms})
+    
+    report('/api/analytics/overview aggregation', rows, ['guests', 'impl', 'statements', 'ms/call'])
+
+if __name__ == '__main__':
+    main()
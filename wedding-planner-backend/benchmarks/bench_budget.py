@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for /api/analytics/budget: the old seven-query version versus
+the one-query-per-table rollup, uncached and cached, at 10k and 100k
+costs and tasks spread over 20 planners.
+Usage: python -m benchmarks.bench_budget
+"""
+
+import time
+
+from sqlalchemy import func
+
+from benchmarks.common import make_app, seed_users, seed_rows, task_rows, cost_rows, StatementCounter, report
+from src.models import db, Task, Cost
+from src.services.aggregates import cost_stats, task_stats
+from src.services.budget_cache import budget_cache
+
+PLANNERS = 20
+
+def legacy_budget(user_id):
+    """The budget as it used to be computed: one round trip per figure"""
+    def total(status):
+        return float(db.session.query(func.sum(Cost.amount)).filter_by(user_id=user_id, status=status).scalar() or 0)
+    
+    by_category = db.session.query(Cost.category, func.sum(Cost.amount)).filter_by(user_id=user_id).group_by(Cost.category).all()
+    tasks = Task.query.filter_by(user_id=user_id)
+    return {
+        'costs': {
+            'total_planned': total('planned'),
+            'total_paid': total('paid'),
+            'total_pending': total('pending'),
+            'by_category': {category: float(amount or 0) for category, amount in by_category}
+        },
+        'tasks': {
+            'total': tasks.count(),
+            'completed': tasks.filter_by(status='completed').count(),
+            'in_progress': tasks.filter_by(status='in_progress').count()
+        }
+    }
+
+def rollup(user_id):
+    return {'costs': cost_stats(user_id), 'tasks': task_stats(user_id)}
+
+def measure(fn, repeat=10):
+    # Warm up (and fill the cache) before counting statements
+    fn()
+    with StatementCounter(db.engine) as counter:
+        fn()
+    statements = counter.count
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return statements, (time.perf_counter() - start) * 1000 / repeat
+
+def main():
+    app = make_app()
+    rows = []
+    
+    with app.app_context():
+        user_ids = seed_users(db, PLANNERS)
+        user_id = user_ids[0]
+        seeded = 0
+        for size in (10000, 100000):
+            seed_rows(db, Task, task_rows(user_ids, size - seeded, seed=size))
+            seed_rows(db, Cost, cost_rows(user_ids, size - seeded, seed=size))
+            seeded = size
+            
+            legacy = legacy_budget(user_id)
+            current = rollup(user_id)
+            for key in ('total_planned', 'total_paid', 'total_pending'):
+                assert abs(legacy['costs'][key] - current['costs'][key]) < 0.01
+            assert legacy['tasks']['completed'] == current['tasks']['completed']
+            
+            budget_cache.backend.clear()
+            for name, fn in (('legacy', legacy_budget), ('rollup', rollup), ('cached rollup', budget_cache.rollup)):
+                statements, ms = measure(lambda: fn(user_id))
+                rows.append({'rows': size, 'impl': name, 'statements': statements, 'ms/call': ms})
+    
+    report(f'/api/analytics/budget aggregation (rows per table, {PLANNERS} planners)', rows, ['rows', 'impl', 'statements', 'ms/call'])
+
+if __name__ == '__main__':
+    main()
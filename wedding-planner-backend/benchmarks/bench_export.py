@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the streaming guest export: time to first byte, total
+time and peak memory of /api/guests/export against building the full
+GET /api/guests array.
+Usage: python -m benchmarks.bench_export
+"""
+
+import time
+import tracemalloc
+
+from benchmarks.common import make_app, seed_guests, admin_headers, report
+from src.models import db
+
+VARIANTS = (
+    ('json array', '/api/guests'),
+    ('export csv', '/api/guests/export?format=csv'),
+    ('export ndjson', '/api/guests/export?format=ndjson'),
+)
+
+def consume(client, url, headers):
+    """Read a response chunk by chunk, discarding the data"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    
+    first_byte = None
+    size = 0
+    for chunk in response.response:
+        if first_byte is None:
+            first_byte = time.perf_counter()
+        size += len(chunk)
+    response.close()
+    
+    end = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    assert response.status_code == 200
+    return (first_byte - start) * 1000, (end - start) * 1000, peak / 1024, size
+
+def main():
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(app, db)
+    rows = []
+    
+    seeded = 0
+    for size in (1000, 10000, 100000):
+        with app.app_context():
+            seed_guests(db, size - seeded)
+        seeded = size
+        
+        for name, url in VARIANTS:
+            ttfb, total, peak_kib, body = consume(client, url, headers)
+            rows.append({'guests': size, 'variant': name, 'ttfb ms': ttfb, 'total ms': total,
+                         'peak KiB': peak_kib, 'bytes': body})
+    
+    report('Guest list export', rows, ['guests', 'variant', 'ttfb ms', 'total ms', 'peak KiB', 'bytes'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET /api/guests: the full list versus keyset pages
+and column projection, at 1k, 10k and 100k guests.
+Usage: python -m benchmarks.bench_guest_list
+"""
+
+from benchmarks.common import make_app, seed_guests, admin_headers, measure_request, report
+from src.models import db
+
+VARIANTS = (
+    ('full list', '/api/guests'),
+    ('page of 100', '/api/guests?limit=100'),
+    ('page, 4 fields', '/api/guests?limit=100&fields=first_name,last_name,email,rsvp_status'),
+    ('filtered page', '/api/guests?limit=100&rsvp_status=declined'),
+)
+
+def main():
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(app, db)
+    rows = []
+    
+    seeded = 0
+    for size in (1000, 10000, 100000):
+        with app.app_context():
+            seed_guests(db, size - seeded)
+        seeded = size
+        
+        for name, url in VARIANTS:
+            repeat = 1 if name == 'full list' and size >= 100000 else 5
+            latency, peak_kib, body = measure_request(client, url, headers, repeat=repeat)
+            rows.append({'guests': size, 'variant': name, 'ms': latency, 'peak KiB': peak_kib, 'bytes': body})
+        
+        # A page deep into the list costs the same as the first one
+        page = client.get('/api/guests?limit=100', headers=headers).get_json()
+        for _ in range(5):
+            page = client.get(f"/api/guests?limit=100&cursor={page['next_cursor']}", headers=headers).get_json()
+        latency, peak_kib, body = measure_request(
+            client, f"/api/guests?limit=100&cursor={page['next_cursor']}", headers
+        )
+        rows.append({'guests': size, 'variant': 'page 7 of 100', 'ms': latency, 'peak KiB': peak_kib, 'bytes': body})
+    
+    report('GET /api/guests', rows, ['guests', 'variant', 'ms', 'peak KiB', 'bytes'])
+
+if __name__ == '__main__':
+    main()
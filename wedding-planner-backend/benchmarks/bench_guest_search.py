@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET /api/guests/search at 50k guests: indexed lookups
+(FTS5 on SQLite, pg_trgm with DATABASE_URL pointing at PostgreSQL)
+against downloading the whole list and filtering it client-side.
+Usage: python -m benchmarks.bench_guest_search
+"""
+
+import time
+
+from benchmarks.common import make_app, seed_guests, admin_headers, measure_request, report
+from src.models import db
+from src.services.guest_search import parse_query, search_guest_ids, strategy
+
+GUESTS = 50000
+
+QUERIES = (
+    ('exact name', 'First31337'),
+    ('prefix', 'first3133'),
+    ('email fragment', 'guest4242@'),
+    ('two terms', 'first777 last777'),
+    ('typo', 'Frist31337'),
+    ('short prefix', 'fi'),
+)
+
+def client_side(client, headers, q):
+    """What the admin UI did before: fetch every guest, filter locally"""
+    guests = client.get('/api/guests', headers=headers).get_json()
+    terms = parse_query(q)
+    return [
+        guest for guest in guests
+        if all(any(term in (guest[field] or '').lower() for field in ('first_name', 'last_name', 'email')) for term in terms)
+    ]
+
+def main():
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(app, db)
+    rows = []
+    
+    with app.app_context():
+        seed_guests(db, GUESTS)
+        print(f'strategy: {strategy()}')
+        
+        for name, q in QUERIES:
+            terms = parse_query(q)
+            search_guest_ids(terms, 20)
+            start = time.perf_counter()
+            for _ in range(20):
+                ids, _ = search_guest_ids(terms, 20)
+            lookup = (time.perf_counter() - start) * 1000 / 20
+            
+            latency, peak_kib, body = measure_request(client, f'/api/guests/search?q={q}', headers, repeat=20)
+            rows.append({'query': name, 'hits': len(ids), 'lookup ms': lookup, 'endpoint ms': latency, 'bytes': body})
+    
+    start = time.perf_counter()
+    hits = client_side(client, headers, 'First31337')
+    rows.append({
+        'query': 'full list + filter', 'hits': len(hits), 'lookup ms': '',
+        'endpoint ms': (time.perf_counter() - start) * 1000, 'bytes': ''
+    })
+    
+    report(f'Guest search, {GUESTS} guests', rows, ['query', 'hits', 'lookup ms', 'endpoint ms', 'bytes'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for bulk guest import, in rows per second.
+Compares one ORM insert + commit per guest (the register endpoint's
+pattern) against import_guests() creating and then updating rows, both
+with its ON CONFLICT upsert and with the SELECT-then-write fallback.
+Usage: python -m benchmarks.bench_import
+"""
+
+import time
+
+from benchmarks.common import make_app, guest_rows, report
+from src.models import db, Guest
+from src.services import guest_import
+from src.services.guest_import import IMPORT_FIELDS, import_guests
+
+def invite_list(count, prefix='guest'):
+    rows = []
+    for i, row in enumerate(guest_rows(count)):
+        row['email'] = f'{prefix}{i}@example.com'
+        rows.append({field: row.get(field) for field in IMPORT_FIELDS})
+    return rows
+
+def one_commit_per_guest(rows):
+    for row in rows:
+        db.session.add(Guest(**row))
+        db.session.commit()
+
+def timed(fn, rows):
+    start = time.perf_counter()
+    fn(rows)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(rows) / elapsed
+
+def main():
+    app = make_app()
+    results = []
+    
+    with app.app_context():
+        rows = invite_list(2000, prefix='orm')
+        elapsed, rate = timed(one_commit_per_guest, rows)
+        results.append({'rows': len(rows), 'path': 'orm', 'method': 'commit per row', 'seconds': elapsed, 'rows/s': rate})
+        
+        upsert = guest_import._supports_upsert()
+        for path in ('upsert', 'fallback') if upsert else ('fallback',):
+            # The fallback serves databases without the unique guests.email index
+            guest_import._upsert_supported[db.engine.url] = path == 'upsert'
+            for size in (2000, 20000):
+                rows = invite_list(size)
+                Guest.query.filter(Guest.email.in_([row['email'] for row in rows])).delete()
+                db.session.commit()
+                
+                elapsed, rate = timed(import_guests, rows)
+                results.append({'rows': size, 'path': path, 'method': 'bulk create', 'seconds': elapsed, 'rows/s': rate})
+                
+                for row in rows:
+                    row['rsvp_status'] = 'confirmed'
+                elapsed, rate = timed(import_guests, rows)
+                results.append({'rows': size, 'path': path, 'method': 'bulk update', 'seconds': elapsed, 'rows/s': rate})
+        guest_import._upsert_supported[db.engine.url] = upsert
+    
+    report('Guest import throughput', results, ['rows', 'path', 'method', 'seconds', 'rows/s'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the background job queue: how long POST /api/guests/bulk
+holds the request inline versus with async=true, and how many jobs per
+second the workers drain through the local and shared (memory://)
+brokers.
+Usage: python -m benchmarks.bench_jobs [--guests 10000] [--jobs 500]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import func, select
+
+from benchmarks.common import make_app, admin_headers, guest_rows, report
+from src.models import db, Job
+from src.services import jobs, shared_store
+from src.services.guest_import import IMPORT_FIELDS
+
+@jobs.job_handler('bench.noop')
+def noop(params, progress):
+    return params
+
+def wait_for(app, job_ids, timeout=600):
+    """Seconds until every job in job_ids has finished or failed"""
+    start = time.perf_counter()
+    with app.app_context():
+        while time.perf_counter() - start < timeout:
+            pending = db.session.execute(
+                select(func.count()).select_from(Job).where(
+                    Job.id.in_(job_ids), Job.status.in_(('queued', 'running'))
+                )
+            ).scalar()
+            db.session.rollback()
+            if not pending:
+                break
+            time.sleep(0.01)
+    return time.perf_counter() - start
+
+def import_rows(count, offset):
+    rows = []
+    for i, row in enumerate(guest_rows(count)):
+        row = {field: row[field] for field in IMPORT_FIELDS if row.get(field) is not None}
+        row['email'] = f'guest{offset + i}@example.com'
+        rows.append(row)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--guests', type=int, default=10000)
+    parser.add_argument('--jobs', type=int, default=500)
+    args = parser.parse_args()
+    
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(app, db)
+    
+    rows = []
+    for mode, offset in (('inline', 0), ('async', args.guests)):
+        payload = import_rows(args.guests, offset)
+        url = '/api/guests/bulk' + ('?async=true' if mode == 'async' else '')
+        start = time.perf_counter()
+        response = client.post(url, json=payload, headers=headers)
+        held = (time.perf_counter() - start) * 1000
+        assert response.status_code in (200, 202), response.get_data(as_text=True)
+        done = held / 1000
+        if mode == 'async':
+            done += wait_for(app, [response.get_json()['id']])
+        rows.append({'mode': mode, 'status': response.status_code, 'request ms': held, 'done s': done})
+    report(f'Bulk import of {args.guests} guests', rows, ['mode', 'status', 'request ms', 'done s'])
+    
+    rows = []
+    brokers = (
+        ('local', jobs.LocalBroker()),
+        ('shared (memory://)', jobs.SharedBroker(shared_store.InMemoryStore())),
+    )
+    for name, broker in brokers:
+        jobs.workers.stop()
+        jobs.workers.broker = broker
+        jobs.workers.start(app, 2)
+        with app.app_context():
+            start = time.perf_counter()
+            job_ids = [jobs.enqueue('bench.noop', {'n': i}) for i in range(args.jobs)]
+            enqueue_ms = (time.perf_counter() - start) * 1000 / args.jobs
+        elapsed = (time.perf_counter() - start) + wait_for(app, job_ids)
+        rows.append({'broker': name, 'jobs': args.jobs, 'enqueue ms': enqueue_ms, 'jobs/s': args.jobs / elapsed})
+    report('No-op job throughput, 2 workers', rows, ['broker', 'jobs', 'enqueue ms', 'jobs/s'])
+
+if __name__ == '__main__':
+    main()
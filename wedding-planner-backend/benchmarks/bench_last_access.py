@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for last_accessed writes: one UPDATE + commit per access (what
+guest login used to do) versus the write-behind buffer, from concurrent
+threads. Reports the time an access adds to a request and the time spent
+flushing the buffer.
+Usage: python -m benchmarks.bench_last_access [--guests 5000] [--accesses 5000] [--threads 8]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.common import make_app, seed_guests, report
+from src.models import db, Guest
+from src.services.last_access import LastAccessBuffer
+
+def run(app, guest_ids, threads, access):
+    def one(guest_id):
+        with app.app_context():
+            guest = db.session.get(Guest, guest_id)
+            start = time.perf_counter()
+            access(guest)
+            elapsed = (time.perf_counter() - start) * 1000
+            db.session.remove()
+            return elapsed
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        timings = list(executor.map(one, guest_ids))
+    return timings, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--guests', type=int, default=5000)
+    parser.add_argument('--accesses', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+    
+    app = make_app()
+    with app.app_context():
+        seed_guests(db, args.guests)
+    rng = random.Random(1)
+    guest_ids = [rng.randint(1, args.guests) for _ in range(args.accesses)]
+    
+    def inline(guest):
+        guest.last_accessed = datetime.utcnow()
+        db.session.commit()
+    
+    rows = []
+    timings, wall = run(app, guest_ids, args.threads, inline)
+    rows.append({'mode': 'inline commit', 'p50 ms': statistics.median(timings),
+                 'p99 ms': statistics.quantiles(timings, n=100)[98], 'accesses/s': len(timings) / wall,
+                 'flushes': '', 'flush ms': ''})
+    
+    buffer = LastAccessBuffer(interval=1.0, max_events=500)
+    buffer.start(app)
+    timings, wall = run(app, guest_ids, args.threads, buffer.record)
+    with app.app_context():
+        start = time.perf_counter()
+        buffer.flush()
+        last_flush = (time.perf_counter() - start) * 1000
+    buffer.stop()
+    rows.append({'mode': 'write-behind', 'p50 ms': statistics.median(timings),
+                 'p99 ms': statistics.quantiles(timings, n=100)[98], 'accesses/s': len(timings) / wall,
+                 'flushes': buffer.flushes, 'flush ms': last_flush})
+    report(f'{args.accesses} guest accesses from {args.threads} threads', rows,
+           ['mode', 'p50 ms', 'p99 ms', 'accesses/s', 'flushes', 'flush ms'])
+    
+    with app.app_context():
+        rows = []
+        for size in (100, 1000, 5000):
+            batch = {guest_id: datetime.utcnow() for guest_id in range(1, min(size, args.guests) + 1)}
+            start = time.perf_counter()
+            buffer._write(batch)
+            rows.append({'guests': len(batch), 'batched ms': (time.perf_counter() - start) * 1000})
+        report('One batched flush', rows, ['guests', 'batched ms'])
+
+if __name__ == '__main__':
+    main()
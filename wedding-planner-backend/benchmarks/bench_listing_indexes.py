@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the task and cost listing queries without and with the
+composite indexes from migration 0006, at 100k tasks and 100k costs
+spread over 50 planners. Prints the query plan and latency of each shape.
+Usage: python -m benchmarks.bench_listing_indexes
+"""
+
+import time
+
+from sqlalchemy import text
+
+from benchmarks.common import make_app, seed_users, seed_rows, task_rows, cost_rows, report
+from src.migrations import MigrationContext
+from src.models import db, Task, Cost
+
+ROWS = 100000
+PLANNERS = 50
+
+def task_query(user_id, **filters):
+    """The same query GET /api/tasks builds"""
+    return Task.query.filter_by(user_id=user_id, **filters).order_by(Task.due_date.asc(), Task.priority.desc())
+
+def cost_query(user_id, **filters):
+    """The same query GET /api/costs builds"""
+    return Cost.query.filter_by(user_id=user_id, **filters).order_by(Cost.created_at.desc())
+
+SHAPES = (
+    ('tasks', lambda user_id: task_query(user_id)),
+    ('tasks status', lambda user_id: task_query(user_id, status='todo')),
+    ('tasks priority', lambda user_id: task_query(user_id, priority='high')),
+    ('tasks category', lambda user_id: task_query(user_id, category='venue')),
+    ('costs', lambda user_id: cost_query(user_id)),
+    ('costs category', lambda user_id: cost_query(user_id, category='venue')),
+    ('costs status', lambda user_id: cost_query(user_id, status='paid')),
+)
+
+def explain(query):
+    compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    prefix = 'EXPLAIN QUERY PLAN' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN'
+    rows = db.session.execute(text(f'{prefix} {compiled}')).all()
+    return [row[-1] for row in rows]
+
+def measure(query, repeat=20):
+    """Average milliseconds to fetch the rows (no ORM hydration)"""
+    statement = query.statement
+    db.session.execute(statement).all()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        db.session.execute(statement).all()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def listing_indexes():
+    return sorted(
+        (index for table in (Task.__table__, Cost.__table__) for index in table.indexes),
+        key=lambda index: index.name
+    )
+
+def run(label, user_id, rows):
+    print()
+    print(f'== {label} ==')
+    for name, build in SHAPES:
+        query = build(user_id)
+        print(f'{name}:')
+        for line in explain(query):
+            print(f'    {line}')
+        rows.append({'indexes': label, 'query': name, 'rows': query.count(), 'ms': measure(query)})
+
+def main():
+    app = make_app()
+    rows = []
+    
+    with app.app_context():
+        # make_app() applied every migration; start from the unindexed tables
+        for index in listing_indexes():
+            index.drop(bind=db.engine, checkfirst=True)
+        
+        user_ids = seed_users(db, PLANNERS)
+        seed_rows(db, Task, task_rows(user_ids, ROWS))
+        seed_rows(db, Cost, cost_rows(user_ids, ROWS))
+        user_id = user_ids[PLANNERS // 2]
+        
+        run('before', user_id, rows)
+        db.session.commit()
+        
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            context = MigrationContext(connection, autocommit=True)
+            for index in listing_indexes():
+                context.create_index(index)
+            connection.execute(text('ANALYZE'))
+        # Fresh connections, so no statement prepared before the indexes existed is reused
+        db.session.remove()
+        db.engine.dispose()
+        
+        run('after', user_id, rows)
+    
+    report(f'Task/cost listings ({ROWS} rows each, {PLANNERS} planners)', rows, ['indexes', 'query', 'rows', 'ms'])
+
+if __name__ == '__main__':
+    main()
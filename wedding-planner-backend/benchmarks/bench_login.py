@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for guest login latency under concurrency with each password
+hashing configuration, inline on the request thread or in the process
+pool. Also samples /api/health while the logins run to show how much
+hashing starves unrelated requests.
+Usage: python -m benchmarks.bench_login [--threads 16] [--logins 10]
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import make_app, report
+from src.models import db, Guest
+from src.services import passwords
+
+CONFIGS = (
+    ('werkzeug scrypt', dict(scheme='werkzeug', werkzeug_method='scrypt')),
+    ('bcrypt 12', dict(scheme='bcrypt', bcrypt_rounds=12)),
+)
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def run(app, threads, logins):
+    client = app.test_client()
+    login_ms, health_ms = [], []
+    done = threading.Event()
+    
+    def login(i):
+        start = time.perf_counter()
+        response = client.post('/api/guest-auth/login', json={'username': f'bench{i % threads}', 'password': 'secret'})
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return (time.perf_counter() - start) * 1000
+    
+    def probe_health():
+        while not done.is_set():
+            start = time.perf_counter()
+            client.get('/api/health')
+            health_ms.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+    
+    prober = threading.Thread(target=probe_health)
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        login_ms = list(executor.map(login, range(threads * logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    prober.join()
+    
+    return {
+        'login p50': statistics.median(login_ms),
+        'login p99': percentile(login_ms, 99),
+        'health p99': percentile(health_ms, 99) if health_ms else 0.0,
+        'logins/s': len(login_ms) / elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=10, help='logins per thread')
+    parser.add_argument('--workers', type=int, default=4, help='hashing pool size')
+    args = parser.parse_args()
+    
+    # Measures hashing throughput, so every attempt must reach the hasher
+    os.environ['RATE_LIMIT_ENABLED'] = 'false'
+    app = make_app()
+    rows = []
+    
+    for name, config in CONFIGS:
+        for workers in (0, args.workers):
+            passwords.configure(workers=workers, **config)
+            with app.app_context():
+                Guest.query.delete()
+                db.session.commit()
+                for i in range(args.threads):
+                    guest = Guest(first_name='Bench', last_name=str(i), email=f'bench{i}@example.com', username=f'bench{i}')
+                    guest.set_password('secret')
+                    db.session.add(guest)
+                db.session.commit()
+            
+            result = run(app, args.threads, args.logins)
+            result.update(hasher=name, pool=workers or 'inline')
+            rows.append(result)
+    
+    passwords.configure(workers=0)
+    report(f'Guest login, {args.threads} concurrent clients', rows,
+           ['hasher', 'pool', 'login p50', 'login p99', 'health p99', 'logins/s'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the email outbox against a local SMTP sink that answers
+every command after a fixed delay (a stand-in for network round trips):
+one connection per message sent inline, versus the outbox dispatcher
+on a pooled connection set at several concurrency levels. Reports
+messages per second.
+Usage: python -m benchmarks.bench_outbox [--messages 2000] [--latency-ms 2]
+"""
+
+import argparse
+import smtplib
+import socketserver
+import threading
+import time
+from email.message import EmailMessage
+
+from benchmarks.common import make_app, seed_guests, report
+from src.models import db, Content
+from src.services import outbox
+from src.services.rate_limit import Limit
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Accepts and discards mail; latency seconds before each reply"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, latency):
+        super().__init__(('127.0.0.1', 0), SMTPSinkHandler)
+        self.latency = latency
+        self.received = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        time.sleep(self.server.latency)
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+    
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply('220 sink ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b'EHLO':
+                self.reply('250-sink\r\n250 8BITMIME')
+            elif command == b'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with self.server.lock:
+                    self.server.received += 1
+                self.reply('250 OK queued')
+            elif command == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+def inline(port, count):
+    """What a request handler sending invitations itself would do"""
+    start = time.perf_counter()
+    for i in range(count):
+        message = EmailMessage()
+        message['From'] = 'wedding@localhost'
+        message['To'] = f'guest{i}@example.com'
+        message['Subject'] = 'Invitation'
+        message.set_content('You are invited')
+        with smtplib.SMTP('127.0.0.1', port) as connection:
+            connection.send_message(message)
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=2.0)
+    args = parser.parse_args()
+    
+    sink = SMTPSink(args.latency_ms / 1000)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    port = sink.server_address[1]
+    
+    app = make_app()
+    with app.app_context():
+        seed_guests(db, args.messages)
+        db.session.add(Content(key='invitation', title='Dear $first_name',
+                               content='Hello $first_name $last_name, you are invited. RSVP: $rsvp_status'))
+        db.session.commit()
+    
+    rows = []
+    count = min(args.messages, 300)
+    rows.append({'mode': 'inline, new conn', 'messages': count, 'connections': count, 'msg/s': inline(port, count)})
+    
+    outbox._settings.update(host='127.0.0.1', port=port, starttls=False, ssl=False, username=None,
+                            domain_rate=Limit(10 ** 6, 1), backend='smtp')
+    for concurrency in (1, 4, 16):
+        outbox._settings['concurrency'] = concurrency
+        with app.app_context():
+            outbox.queue_messages('invitation', campaign=f'bench-{concurrency}')
+            transport = outbox.make_transport()
+            result = outbox.dispatch(transport=transport)
+            transport.close()
+        rows.append({'mode': f'outbox, {concurrency} conn', 'messages': result['sent'],
+                     'connections': transport.connects, 'msg/s': result['messages_per_second']})
+    
+    outbox._settings['concurrency'] = 4
+    with app.app_context():
+        outbox.queue_messages('invitation', campaign='bench-memory')
+        result = outbox.dispatch(transport=outbox.MemoryTransport())
+    rows.append({'mode': 'outbox, memory', 'messages': result['sent'], 'connections': 0,
+                 'msg/s': result['messages_per_second']})
+    
+    report(f'Sending invitations, SMTP sink replying after {args.latency_ms:g} ms', rows,
+           ['mode', 'messages', 'connections', 'msg/s'])
+    sink.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for login rate limiting: a credential-stuffing burst against
+guest login with and without the limiter, plus the cost of one bucket
+check and the memory held per tracked key.
+Usage: python -m benchmarks.bench_rate_limit [--threads 16] [--attempts 20]
+"""
+
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import make_app, report
+from src.models import db, Guest
+from src.services import rate_limit, shared_store
+
+def burst(app, threads, attempts):
+    """Wrong-password logins from one IP, spread over a few accounts"""
+    client = app.test_client()
+    
+    def attempt(i):
+        start = time.perf_counter()
+        response = client.post('/api/guest-auth/login', json={'username': f'victim{i % 4}', 'password': 'guess'})
+        return response.status_code, (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(attempt, range(threads * attempts)))
+    elapsed = time.perf_counter() - start
+    
+    hashed = [ms for status, ms in results if status == 401]
+    rejected = [ms for status, ms in results if status == 429]
+    return {
+        'attempts': len(results),
+        'hashed': len(hashed),
+        '429s': len(rejected),
+        '401 p50 ms': statistics.median(hashed) if hashed else 0.0,
+        '429 p50 ms': statistics.median(rejected) if rejected else 0.0,
+        'wall s': elapsed
+    }
+
+def per_check(buckets, keys):
+    start = time.perf_counter()
+    for key in keys:
+        buckets.take(key)
+    return (time.perf_counter() - start) * 1e6 / len(keys)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--attempts', type=int, default=20, help='attempts per thread')
+    args = parser.parse_args()
+    
+    app = make_app()
+    with app.app_context():
+        for i in range(4):
+            guest = Guest(first_name='Victim', last_name=str(i), email=f'victim{i}@example.com', username=f'victim{i}')
+            guest.set_password('secret')
+            db.session.add(guest)
+        db.session.commit()
+    
+    rows = []
+    for enabled in ('false', 'true'):
+        os.environ['RATE_LIMIT_ENABLED'] = enabled
+        rate_limit.configure_rate_limits()
+        result = burst(app, args.threads, args.attempts)
+        result['limiter'] = 'on' if enabled == 'true' else 'off'
+        rows.append(result)
+    report('Credential-stuffing burst on /api/guest-auth/login', rows,
+           ['limiter', 'attempts', 'hashed', '429s', '401 p50 ms', '429 p50 ms', 'wall s'])
+    
+    limit = rate_limit.Limit(5, 60)
+    keys = [f'10.0.{i // 256}.{i % 256}' for i in range(100000)]
+    rows = []
+    backends = (
+        ('local', lambda: rate_limit.LocalBuckets(limit, maxsize=len(keys))),
+        ('shared (memory://)', lambda: rate_limit.SharedBuckets(shared_store.InMemoryStore(), limit, 'bench:')),
+    )
+    for name, make in backends:
+        buckets = make()
+        new_keys = per_check(buckets, keys)
+        repeat_keys = per_check(buckets, keys[:10000] * 5)
+        
+        tracemalloc.start()
+        held = make()
+        per_check(held, keys)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({'backend': name, 'new key us': new_keys, 'repeat key us': repeat_keys,
+                     'bytes/key': current / len(keys)})
+    report('Bucket check cost, 100k keys', rows, ['backend', 'new key us', 'repeat key us', 'bytes/key'])
+
+if __name__ == '__main__':
+    main()
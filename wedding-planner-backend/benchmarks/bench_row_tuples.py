@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the read-only list path: hydrating ORM instances versus
+selecting plain column tuples, both serialized with the compiled model
+serializers. Reports per-row CPU time and allocations at 10k and 50k rows,
+and the GET /api/tasks end-to-end latency.
+Usage: python -m benchmarks.bench_row_tuples
+"""
+
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from benchmarks.common import (
+    make_app, admin_headers, create_admin, seed_guests, seed_rows, task_rows, cost_rows,
+    measure_request, report
+)
+from src.models import db, Guest, Task, Cost
+from src.services.serialization import serializer_for
+
+def orm_path(model):
+    serializer = serializer_for(model)
+    return serializer.many(db.session.execute(select(model)).scalars().all())
+
+def tuple_path(model):
+    serializer = serializer_for(model)
+    return serializer.rows(db.session.execute(select(*serializer.select_columns())).all())
+
+def measure(fn, repeat=3):
+    """(ms per call, allocated blocks, peak KiB) with a fresh session each call"""
+    db.session.remove()
+    fn()
+    elapsed = 0.0
+    for _ in range(repeat):
+        db.session.remove()
+        start = time.perf_counter()
+        fn()
+        elapsed += time.perf_counter() - start
+    
+    db.session.remove()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return elapsed * 1000 / repeat, blocks, peak / 1024, len(result)
+
+def main():
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(app, db)
+    rows = []
+    requests = []
+    
+    with app.app_context():
+        user_id = create_admin(db).id
+        seeded = 0
+        for size in (10000, 50000):
+            seed_guests(db, size - seeded)
+            seed_rows(db, Task, task_rows([user_id], size - seeded, seed=size))
+            seed_rows(db, Cost, cost_rows([user_id], size - seeded, seed=size))
+            seeded = size
+            
+            for model in (Guest, Task, Cost):
+                for name, fn in (('ORM instances', orm_path), ('row tuples', tuple_path)):
+                    ms, blocks, peak_kib, count = measure(lambda: fn(model))
+                    rows.append({'rows': count, 'model': model.__name__, 'path': name, 'ms': ms,
+                                 'us/row': ms * 1000 / count, 'peak KiB': peak_kib})
+            
+            latency, peak_kib, body = measure_request(client, '/api/tasks', headers, repeat=3)
+            requests.append({'rows': size, 'endpoint': 'GET /api/tasks', 'ms': latency, 'peak KiB': peak_kib})
+    
+    report('Fetch + serialize, ORM instances vs row tuples', rows, ['rows', 'model', 'path', 'ms', 'us/row', 'peak KiB'])
+    report('End to end (row tuples)', requests, ['rows', 'endpoint', 'ms', 'peak KiB'])
+
+if __name__ == '__main__':
+    main()
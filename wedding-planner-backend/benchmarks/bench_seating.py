@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the seating solver: 500 confirmed guests across 50 tables
+with keep-together parties, keep-apart pairs and soft preferences. Compares
+the greedy start with the annealed plan, then re-solves incrementally after
+a single RSVP change.
+Usage: python -m benchmarks.bench_seating [--guests 500] [--tables 50]
+"""
+
+import argparse
+import os
+import random
+import time
+
+from benchmarks.common import make_app, guest_rows, report
+from src.models import db, Guest, Table, SeatingConstraint
+from src.services import seating
+from src.services.seating_solver import solve
+
+def seed(guest_count, table_count, rng):
+    rows = []
+    for row in guest_rows(guest_count):
+        row.update(rsvp_status='confirmed', number_of_guests=rng.choice([1, 1, 1, 1, 1, 1, 2, 2, 3]))
+        rows.append(row)
+    db.session.execute(Guest.__table__.insert(), rows)
+    db.session.execute(Table.__table__.insert(), [{'name': f'Table {t + 1}', 'capacity': 16} for t in range(table_count)])
+    
+    ids = [row.id for row in db.session.query(Guest.id)]
+    constraints = {}
+    for i in range(0, len(ids) - 1, 5):
+        if rng.random() < 0.4:
+            constraints[('together', ids[i], ids[i + 1])] = 1.0
+    for _ in range(len(ids) // 5):
+        a, b = sorted(rng.sample(ids, 2))
+        constraints[('apart', a, b)] = 1.0
+    for _ in range(len(ids) * 3):
+        a, b = sorted(rng.sample(ids, 2))
+        constraints[(rng.choice(['prefer', 'prefer', 'avoid']), a, b)] = float(rng.randint(1, 5))
+    db.session.execute(SeatingConstraint.__table__.insert(), [
+        {'kind': kind, 'guest_id': a, 'other_guest_id': b, 'weight': weight}
+        for (kind, a, b), weight in constraints.items()
+    ])
+    db.session.commit()
+    return ids
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--guests', type=int, default=500)
+    parser.add_argument('--tables', type=int, default=50)
+    args = parser.parse_args()
+    
+    # The RSVP change below is re-solved here, not on the background worker
+    os.environ['SEATING_AUTO_RESOLVE'] = 'false'
+    app = make_app()
+    rng = random.Random(7)
+    rows = []
+    
+    with app.app_context():
+        ids = seed(args.guests, args.tables, rng)
+        problem = seating.load_problem()
+        
+        for name, iterations in (('greedy only', 0), ('annealed', None)):
+            start = time.perf_counter()
+            result = solve(problem, iterations=iterations, seed=1)
+            rows.append({
+                'run': name, 'seconds': time.perf_counter() - start, 'score': result['score'],
+                'unseated': len(result['violations']['unseated']), 'apart broken': len(result['violations']['apart']),
+                'moved': ''
+            })
+        
+        start = time.perf_counter()
+        result = seating.run_solve(seed=1)
+        rows.append({
+            'run': 'full solve + save', 'seconds': time.perf_counter() - start, 'score': result['score'],
+            'unseated': len(result['violations']['unseated']), 'apart broken': len(result['violations']['apart']),
+            'moved': ''
+        })
+        
+        # One guest brings a plus-one
+        guest = db.session.get(Guest, ids[len(ids) // 2])
+        guest.number_of_guests += 1
+        db.session.commit()
+        
+        start = time.perf_counter()
+        result = seating.run_solve(seed=2, incremental=True)
+        rows.append({
+            'run': 'incremental re-solve', 'seconds': time.perf_counter() - start, 'score': result['score'],
+            'unseated': len(result['violations']['unseated']), 'apart broken': len(result['violations']['apart']),
+            'moved': result['stats']['moved_guests']
+        })
+    
+    report(f'Seating {args.guests} guests at {args.tables} tables ({problem.weights.sum()} seats, {len(problem)} parties)',
+           rows, ['run', 'seconds', 'score', 'unseated', 'apart broken', 'moved'])
+
+if __name__ == '__main__':
+    main()
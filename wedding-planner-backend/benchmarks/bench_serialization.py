@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for list serialization on 10k-row payloads:
+to_dict() + the stdlib JSON provider (the old path) versus the compiled
+per-model serializers with the stdlib and orjson providers.
+Usage: python -m benchmarks.bench_serialization
+"""
+
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.common import make_app, create_admin, seed_guests, seed_rows, task_rows, cost_rows, report
+from src.models import db, Guest, Task, Cost
+from src.services import serialization
+from src.services.serialization import ModelSerializer
+
+ROWS = 10000
+
+def measure(fn, repeat=5):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, len(body)
+
+def main():
+    app = make_app()
+    rows = []
+    
+    with app.app_context():
+        user_id = create_admin(db).id
+        seed_guests(db, ROWS)
+        seed_rows(db, Task, task_rows([user_id], ROWS))
+        seed_rows(db, Cost, cost_rows([user_id], ROWS))
+        
+        stdlib = DefaultJSONProvider(app)
+        variants = [
+            ('to_dict + stdlib', lambda model, objs: stdlib.dumps([obj.to_dict() for obj in objs])),
+            ('compiled + stdlib', lambda model, objs: stdlib.dumps(ModelSerializer(model).many(objs))),
+        ]
+        if serialization.orjson is not None:
+            fast = serialization.OrjsonProvider(app)
+            variants.append(('compiled + orjson', lambda model, objs: fast.dumps_bytes(
+                ModelSerializer(model, native_datetimes=True).many(objs)
+            )))
+        
+        for model in (Guest, Task, Cost):
+            objs = model.query.all()
+            for name, fn in variants:
+                ms, size = measure(lambda: fn(model, objs))
+                rows.append({'model': model.__name__, 'variant': name, 'ms': ms, 'us/row': ms * 1000 / len(objs), 'bytes': size})
+    
+    report(f'Serializing {ROWS} already-loaded rows', rows, ['model', 'variant', 'ms', 'us/row', 'bytes'])
+
+if __name__ == '__main__':
+    main()
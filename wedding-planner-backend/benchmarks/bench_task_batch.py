@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark for marking tasks complete: one PUT per task versus a single
+PATCH /api/tasks/batch, at 40 and 400 tasks.
+Usage: python -m benchmarks.bench_task_batch
+"""
+
+import time
+
+from benchmarks.common import make_app, admin_headers, create_admin, seed_rows, task_rows, StatementCounter, report
+from src.models import db, Task
+
+def main():
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(app, db)
+    rows = []
+    
+    with app.app_context():
+        user_id = create_admin(db).id
+    
+    for count in (40, 400):
+        with app.app_context():
+            db.session.query(Task).delete()
+            db.session.commit()
+            seed_rows(db, Task, ({**row, 'status': 'todo', 'completed_at': None, 'actual_cost': None}
+                                 for row in task_rows([user_id], count)))
+            ids = [task_id for (task_id,) in db.session.query(Task.id)]
+            
+            with StatementCounter(db.engine) as counter:
+                start = time.perf_counter()
+                for task_id in ids:
+                    response = client.put(f'/api/tasks/{task_id}', headers=headers, json={'status': 'completed'})
+                    assert response.status_code == 200
+                elapsed = (time.perf_counter() - start) * 1000
+            rows.append({'tasks': count, 'variant': 'PUT per task', 'requests': count,
+                         'statements': counter.count, 'ms': elapsed})
+            
+            with StatementCounter(db.engine) as counter:
+                start = time.perf_counter()
+                response = client.patch('/api/tasks/batch', headers=headers,
+                                        json=[{'id': task_id, 'status': 'todo'} for task_id in ids])
+                assert response.status_code == 200
+                elapsed = (time.perf_counter() - start) * 1000
+            rows.append({'tasks': count, 'variant': 'PATCH batch', 'requests': 1,
+                         'statements': counter.count, 'ms': elapsed})
+    
+    report('Bulk task status change', rows, ['tasks', 'variant', 'requests', 'statements', 'ms'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+Shared helpers for the benchmark scripts.
+Each benchmark runs against a throwaway SQLite database unless
+DATABASE_URL is already set in the environment.
+"""
+
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+def make_app():
+    """Create the Flask app against a temporary database"""
+    if not os.getenv('DATABASE_URL'):
+        path = os.path.join(tempfile.mkdtemp(prefix='wedding-bench-'), 'bench.db')
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    
+    from src.main import create_app
+    from src.migrations import upgrade
+    app = create_app()
+    with app.app_context():
+        upgrade()
+    return app
+
+class StatementCounter:
+    """Count SQL statements sent to the database while active"""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+    
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+    
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+    
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+@contextmanager
+def timer(results, key):
+    """Record elapsed wall time in milliseconds under results[key]"""
+    start = time.perf_counter()
+    yield
+    results[key] = (time.perf_counter() - start) * 1000
+
+def create_admin(db):
+    """Create the benchmark admin user and return it"""
+    from src.models import User
+    
+    user = User.query.filter_by(email='bench@example.com').first()
+    if not user:
+        user = User(email='bench@example.com', name='bench', role='admin')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+    return user
+
+def admin_headers(app, db):
+    """Authorization headers for the benchmark admin"""
+    from flask_jwt_extended import create_access_token
+    
+    with app.app_context():
+        user = create_admin(db)
+        token = create_access_token(identity=user.id)
+    return {'Authorization': f'Bearer {token}'}
+
+def measure_request(client, url, headers, repeat=5):
+    """Average latency (ms), peak traced memory (KiB) and response size of a GET"""
+    import tracemalloc
+    
+    client.get(url, headers=headers)
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url, headers=headers)
+    latency = (time.perf_counter() - start) * 1000 / repeat
+    
+    tracemalloc.start()
+    response = client.get(url, headers=headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return latency, peak / 1024, len(response.get_data())
+
+def guest_rows(count, seed=42):
+    """Generate plain guest dicts suitable for a bulk insert"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    restrictions = [None, None, None, 'vegetarian', 'vegan', 'gluten-free', 'Vegetarian, no pork']
+    allergies = [None, None, None, None, 'nuts', 'shellfish', 'peanuts, dairy']
+    
+    for i in range(count):
+        yield {
+            'first_name': f'First{i}',
+            'last_name': f'Last{i % 997}',
+            'email': f'guest{i}@example.com',
+            'phone': f'+1555{i:07d}',
+            'rsvp_status': rng.choice(['pending', 'confirmed', 'confirmed', 'declined']),
+            'attendance_type': rng.choice([None, 'ceremony', 'reception', 'both']),
+            'number_of_guests': rng.randint(1, 4),
+            'dietary_restrictions': rng.choice(restrictions),
+            'allergies': rng.choice(allergies),
+            'registered_at': now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+            'updated_at': now
+        }
+
+def seed_guests(db, count, batch_size=5000):
+    """Insert count guests with executemany batches"""
+    from src.models import Guest
+    
+    batch = []
+    for row in guest_rows(count):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.session.execute(Guest.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Guest.__table__.insert(), batch)
+    db.session.commit()
+
+TASK_CATEGORIES = ['venue', 'catering', 'decoration', 'music', 'photography', 'attire', 'flowers', 'transport']
+
+def seed_users(db, count):
+    """Insert count planner users (unusable password) and return their ids"""
+    from src.models import User
+    
+    now = datetime.utcnow()
+    db.session.execute(User.__table__.insert(), [
+        {'email': f'planner{i}@example.com', 'name': f'Planner {i}', 'role': 'admin',
+         'password_hash': '!', 'created_at': now}
+        for i in range(count)
+    ])
+    db.session.commit()
+    return [row.id for row in db.session.query(User.id).filter(User.email.like('planner%@example.com'))]
+
+def task_rows(user_ids, count, seed=42):
+    """Generate plain task dicts spread over user_ids"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for i in range(count):
+        status = rng.choice(['todo', 'todo', 'in_progress', 'completed', 'cancelled'])
+        estimated = rng.randint(50, 5000)
+        yield {
+            'user_id': user_ids[i % len(user_ids)],
+            'title': f'Task {i}',
+            'priority': rng.choice(['low', 'medium', 'high', 'urgent']),
+            'status': status,
+            'due_date': (now + timedelta(days=rng.randint(-60, 365))).date() if rng.random() > 0.1 else None,
+            'category': rng.choice(TASK_CATEGORIES),
+            'estimated_cost': estimated,
+            'actual_cost': estimated + rng.randint(-200, 400) if status == 'completed' else None,
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now,
+            'completed_at': now if status == 'completed' else None
+        }
+
+def cost_rows(user_ids, count, seed=42):
+    """Generate plain cost dicts spread over user_ids"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for i in range(count):
+        status = rng.choice(['planned', 'pending', 'paid', 'paid'])
+        yield {
+            'user_id': user_ids[i % len(user_ids)],
+            'name': f'Cost {i}',
+            'category': rng.choice(TASK_CATEGORIES),
+            'amount': rng.randint(20, 20000),
+            'status': status,
+            'payment_date': (now - timedelta(days=rng.randint(0, 365))).date() if status == 'paid' else None,
+            'vendor': f'Vendor {i % 311}',
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now
+        }
+
+def seed_rows(db, model, rows, batch_size=5000):
+    """Insert generated rows into model's table with executemany batches"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.session.execute(model.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(model.__table__.insert(), batch)
+    db.session.commit()
+
+def report(title, rows, columns):
+    """Print a small fixed-width results table"""
+    print()
+    print(title)
+    print('-' * len(title))
+    print('  '.join(f'{c:>14}' for c in columns))
+    for row in rows:
+        print('  '.join(f'{row.get(c, ""):>14}' if not isinstance(row.get(c), float)
+                        else f'{row[c]:>14.2f}' for c in columns))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Load test comparing the Flask development server with the gunicorn
+production entry point on /api/health and /api/guests.
+Starts each server as a subprocess against the same seeded database
+and drives it with keep-alive HTTP clients.
+Usage: python -m benchmarks.load_test [--clients 16] [--duration 5] [--guests 500]
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import make_app, seed_guests, admin_headers, report
+from src.models import db
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = (
+    ('flask dev server', [sys.executable, 'src/main.py'], {}),
+    ('gunicorn', [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'src.wsgi:app'],
+     {'GUNICORN_ACCESS_LOG': '', 'GUNICORN_LOG_LEVEL': 'warning'}),
+)
+
+def wait_for(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+def drive(port, path, headers, clients, duration):
+    """Hammer one path from `clients` threads for `duration` seconds"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[0] += 1
+            except (OSError, http.client.HTTPException):
+                errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+    
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    latencies.sort()
+    return {
+        'req/s': len(latencies) / duration,
+        'p50 ms': statistics.median(latencies) if latencies else 0.0,
+        'p99 ms': latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+        'errors': errors[0]
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--guests', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+    
+    app = make_app()
+    headers = admin_headers(app, db)
+    with app.app_context():
+        seed_guests(db, args.guests)
+    
+    paths = ('/api/health', '/api/guests?limit=50')
+    rows = []
+    
+    for port, (name, command, extra_env) in enumerate(SERVERS, start=5801):
+        env = dict(os.environ, PORT=str(port), PYTHONPATH=BACKEND_DIR,
+                   WEB_CONCURRENCY=str(args.workers), GUNICORN_THREADS=str(args.threads), **extra_env)
+        server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for(port)
+            for path in paths:
+                result = drive(port, path, headers, args.clients, args.duration)
+                result.update(server=name, path=path)
+                rows.append(result)
+        finally:
+            server.terminate()
+            server.wait()
+    
+    report(f'Load test, {args.clients} keep-alive clients', rows,
+           ['server', 'path', 'req/s', 'p50 ms', 'p99 ms', 'errors'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Script to bulk import guests from a CSV or JSON file, upserting by email.
+Usage: python import_guests.py <guests.csv|guests.json> [--batch-size N]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from src.main import create_app
+from src.services.guest_import import DEFAULT_BATCH_SIZE, parse_csv, import_guests
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import guests, upserting by email')
+    parser.add_argument('path', help='CSV file with a header row, or a JSON array of guests')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    
+    with open(args.path, encoding='utf-8-sig') as f:
+        text = f.read()
+    rows = json.loads(text) if args.path.lower().endswith('.json') else parse_csv(text)
+    if isinstance(rows, dict):
+        rows = rows.get('guests', [])
+    
+    app = create_app()
+    
+    with app.app_context():
+        print("=" * 50)
+        print("Wedding Planner - Guest Import")
+        print("=" * 50)
+        print()
+        
+        start = time.perf_counter()
+        report = import_guests(rows, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        
+        print(f"Created: {report['created']}")
+        print(f"Updated: {report['updated']}")
+        print(f"Failed:  {report['failed']}")
+        print(f"Time:    {elapsed:.2f}s ({len(rows) / elapsed if elapsed else 0:.0f} rows/s)")
+        
+        for error in report['errors']:
+            print(f"  row {error['row']} ({error['email']}): {error['error']}")
+    
+    return 1 if report['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
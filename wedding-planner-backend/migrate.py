@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Apply or list versioned schema migrations (src/migrations/versions).
+Run before starting the server after every deploy. Safe to run multiple times.
+Usage: python migrate.py [upgrade [--to VERSION] | status]
+"""
+
+import argparse
+import sys
+
+from src.main import create_app
+from src.migrations import upgrade, status
+
+def main():
+    parser = argparse.ArgumentParser(description='Wedding Planner schema migrations')
+    subcommands = parser.add_subparsers(dest='command')
+    upgrade_parser = subcommands.add_parser('upgrade', help='apply pending migrations')
+    upgrade_parser.add_argument('--to', dest='target', help='stop after this version')
+    subcommands.add_parser('status', help='list applied and pending migrations')
+    args = parser.parse_args()
+    
+    app = create_app()
+    
+    with app.app_context():
+        print("=" * 50)
+        print("Wedding Planner - Schema Migrations")
+        print("=" * 50)
+        print()
+        
+        if args.command == 'status':
+            for migration, applied_at in status():
+                state = f"applied {applied_at:%Y-%m-%d %H:%M}" if applied_at else "pending"
+                print(f"  {migration.version}  {migration.description}  [{state}]")
+            return 0
+        
+        try:
+            applied = upgrade(
+                target=getattr(args, 'target', None),
+                log=lambda migration: print(f"→ {migration.version}: {migration.description}")
+            )
+        except Exception as e:
+            print()
+            print(f"❌ Migration failed: {str(e)}")
+            return 1
+        
+        if applied:
+            print(f"✅ Applied {len(applied)} migration(s)")
+        else:
+            print("✅ Database is up to date")
+        return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
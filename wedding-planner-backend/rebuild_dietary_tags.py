@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Script to re-parse every guest's dietary restrictions and allergies into
+the guest_dietary_tags table, e.g. after changing the normalization rules.
+Usage: python rebuild_dietary_tags.py
+"""
+
+from src.main import create_app
+from src.services.dietary import rebuild_dietary_tags
+
+def main():
+    app = create_app()
+    
+    with app.app_context():
+        print("=" * 50)
+        print("Wedding Planner - Dietary Tags")
+        print("=" * 50)
+        print()
+        
+        total = rebuild_dietary_tags()
+        print(f"✅ Rebuilt guest_dietary_tags: {total} tag(s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild or verify the materialized guest_stats table.
+Usage: python rebuild_guest_stats.py [--check]
+"""
+
+import sys
+
+from src.main import create_app
+from src.services.guest_stats import rebuild_guest_stats, check_guest_stats
+
+def main():
+    app = create_app()
+    check_only = '--check' in sys.argv[1:]
+    
+    with app.app_context():
+        print("=" * 50)
+        print("Wedding Planner - Guest Statistics")
+        print("=" * 50)
+        print()
+        
+        if check_only:
+            mismatches = check_guest_stats()
+            if not mismatches:
+                print("✅ guest_stats matches a full recount")
+                return 0
+            
+            print(f"❌ {len(mismatches)} mismatching group(s) (stored -> actual):")
+            for (rsvp_status, attendance_type), (stored, actual) in sorted(mismatches.items(), key=str):
+                print(f"  {rsvp_status}/{attendance_type}: count {stored[0]} -> {actual[0]}, attendance {stored[1]} -> {actual[1]}")
+            print()
+            print("Run without --check to rebuild.")
+            return 1
+        
+        groups = rebuild_guest_stats()
+        print(f"✅ Rebuilt guest_stats from {sum(count for count, _ in groups.values())} guests in {len(groups)} group(s)")
+        return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,5 +2,10 @@
 # Startup script for Render deployment
 cd "$(dirname "$0")"
 export PYTHONPATH="${PYTHONPATH}:$(pwd)"
-python src/main.py
+if [ "$FLASK_ENV" = "development" ]; then
+    python src/main.py
+else
+    python migrate.py upgrade || exit 1
+    exec gunicorn -c gunicorn.conf.py src.wsgi:app
+fi
 
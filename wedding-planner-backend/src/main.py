@@ -11,9 +11,43 @@ from src.routes.tasks import tasks_bp
 from src.routes.costs import costs_bp
 from src.routes.content import content_bp
 from src.routes.analytics import analytics_bp
+from src.routes.seating import seating_bp
+from src.routes.jobs import jobs_bp
+from src.routes.events import events_bp
+from src.routes.outbox import outbox_bp
+from src.services.guest_stats import register_guest_stats_listeners
+from src.services.user_cache import user_cache, register_user_cache_listeners
+from src.services import passwords
+from src.services.rate_limit import configure_rate_limits
+from src.services.content_cache import configure_content_cache, register_content_cache_listeners
+from src.services.budget_cache import configure_budget_cache, register_budget_cache_listeners
+from src.services.dietary import register_dietary_listeners
+from src.services.seating import configure_seating, register_seating_listeners
+from src.services.jobs import start_job_workers
+from src.services.last_access import configure_last_access
+from src.services.events import configure_events, register_event_listeners
+from src.services.outbox import configure_outbox
+from src.services.serialization import configure_json
+from src.services.profiling import init_profiling
+from src.migrations import upgrade
 
 load_dotenv()
 
+def engine_options(database_url):
+    """SQLAlchemy engine/pool options from the environment"""
+    options = {
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800))
+    }
+    
+    # SQLite uses its own pool classes, which take no sizing options
+    if not database_url.startswith('sqlite'):
+        options['pool_size'] = int(os.getenv('DB_POOL_SIZE', os.getenv('GUNICORN_THREADS', 4)))
+        options['max_overflow'] = int(os.getenv('DB_MAX_OVERFLOW', 2))
+        options['pool_timeout'] = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    
+    return options
+
 def create_app():
     app = Flask(__name__)
     
@@ -33,6 +67,7 @@ def create_app():
         app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///wedding_planner.db'
     
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
     
     # CORS configuration
     frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:5173')
@@ -50,10 +85,55 @@ def create_app():
     app.register_blueprint(costs_bp, url_prefix='/api/costs')
     app.register_blueprint(content_bp, url_prefix='/api/content')
     app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.register_blueprint(seating_bp, url_prefix='/api/seating')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    app.register_blueprint(outbox_bp, url_prefix='/api/outbox')
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    # Password hashing backend, cost and process pool size
+    passwords.configure_from_env()
+    
+    # Login throttling per client IP and per account (RATE_LIMIT_*)
+    configure_rate_limits()
+    
+    # Keep materialized guest statistics and dietary tags in step with guest writes
+    register_guest_stats_listeners()
+    register_dietary_listeners()
+    
+    # Admin existence/role cache used by @admin_required
+    user_cache.configure(
+        maxsize=int(os.getenv('USER_CACHE_SIZE', 1024)),
+        ttl=float(os.getenv('USER_CACHE_TTL', 60))
+    )
+    register_user_cache_listeners()
+    
+    # Pre-serialized public content, invalidated when Content commits
+    configure_content_cache()
+    register_content_cache_listeners()
+    
+    # Per-user budget rollups, invalidated when Task or Cost commits
+    configure_budget_cache()
+    register_budget_cache_listeners()
+    
+    # Background seating solves; RSVP changes re-solve the plan incrementally
+    configure_seating()
+    register_seating_listeners()
+    
+    # Live change stream for GET /api/events, published after each commit
+    configure_events()
+    register_event_listeners()
+    
+    # Invitation and reminder email: SMTP pool, concurrency and domain rates (SMTP_*, OUTBOX_*)
+    configure_outbox()
+    
+    # Guest last_accessed timestamps written in batches off the request path
+    configure_last_access(app)
+    
+    # orjson-backed JSON responses when available (JSON_BACKEND)
+    configure_json(app)
+    
+    # Opt-in per-request timing, SQL counts and /api/metrics (PROFILING_ENABLED)
+    init_profiling(app)
     
     @app.route('/api/health')
     def health():
@@ -63,6 +143,10 @@ def create_app():
 
 if __name__ == '__main__':
     app = create_app()
+    # Schema changes run via migrate.py in production; apply them here for local development
+    with app.app_context():
+        upgrade()
+    start_job_workers(app)
     port = int(os.getenv('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_ENV') == 'development')
 
@@ -0,0 +1,157 @@
+"""
+Versioned schema migrations.
+
+Each module in src/migrations/versions is named v<NNNN>_<slug>.py and
+defines upgrade(ctx); its docstring's first line is the description.
+Applied versions are recorded in the schema_migrations table. Modules
+that set TRANSACTIONAL = False run on an autocommit connection, which
+PostgreSQL needs for CREATE INDEX CONCURRENTLY.
+"""
+
+import importlib
+import pkgutil
+from datetime import datetime
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+from src.models import db
+
+# Arbitrary key for pg_advisory_lock, so two deploys never migrate at once
+ADVISORY_LOCK_ID = 74318205
+
+metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', metadata,
+    Column('version', String(32), primary_key=True),
+    Column('description', String(255)),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+class Migration:
+    def __init__(self, version, description, module):
+        self.version = version
+        self.description = description
+        self.module = module
+        self.transactional = getattr(module, 'TRANSACTIONAL', True)
+    
+    def __repr__(self):
+        return f'<Migration {self.version} {self.description}>'
+
+class MigrationContext:
+    """Schema helpers passed to each migration's upgrade()"""
+    
+    def __init__(self, connection, autocommit):
+        self.connection = connection
+        self.autocommit = autocommit
+        self.dialect = connection.dialect.name
+    
+    def execute(self, statement, params=None):
+        if isinstance(statement, str):
+            statement = text(statement)
+        return self.connection.execute(statement, params or {})
+    
+    def create_tables(self, *tables):
+        """Create the given tables (all model tables if none) that are missing"""
+        db.metadata.create_all(self.connection, tables=list(tables) or None, checkfirst=True)
+    
+    def has_column(self, table_name, column_name):
+        return any(column['name'] == column_name for column in inspect(self.connection).get_columns(table_name))
+    
+    def add_column(self, table_name, column_name, ddl):
+        """ALTER TABLE ... ADD COLUMN unless the column exists; True if added"""
+        if self.has_column(table_name, column_name):
+            return False
+        self.execute(f'ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}')
+        return True
+    
+    def create_index(self, index):
+        """Create a model Index if missing, CONCURRENTLY on PostgreSQL outside a transaction"""
+        concurrent = self.dialect == 'postgresql' and self.autocommit
+        if concurrent:
+            # An interrupted CONCURRENTLY build leaves an INVALID index behind
+            # that checkfirst would treat as present
+            invalid = self.execute(
+                'SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+                'WHERE c.relname = :name AND NOT i.indisvalid',
+                {'name': index.name}
+            ).first()
+            if invalid is not None:
+                self.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index.name}')
+            index.dialect_kwargs['postgresql_concurrently'] = True
+        try:
+            index.create(bind=self.connection, checkfirst=True)
+        finally:
+            if concurrent:
+                index.dialect_kwargs['postgresql_concurrently'] = False
+
+def discover():
+    """All migrations in src/migrations/versions, ordered by version"""
+    from src.migrations import versions
+    
+    found = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        if not info.name.startswith('v'):
+            continue
+        module = importlib.import_module(f'{versions.__name__}.{info.name}')
+        version = info.name[1:].split('_', 1)[0]
+        description = (module.__doc__ or info.name).strip().splitlines()[0]
+        found.append(Migration(version, description, module))
+    return sorted(found, key=lambda migration: migration.version)
+
+def applied_versions(connection):
+    metadata.create_all(connection, checkfirst=True)
+    return {row.version: row.applied_at for row in connection.execute(select(schema_migrations))}
+
+def status():
+    """(migration, applied_at or None) for every known migration"""
+    with db.engine.begin() as connection:
+        applied = applied_versions(connection)
+    return [(migration, applied.get(migration.version)) for migration in discover()]
+
+def _record(connection, migration):
+    connection.execute(schema_migrations.insert().values(
+        version=migration.version,
+        description=migration.description[:255],
+        applied_at=datetime.utcnow()
+    ))
+
+def _apply(migration):
+    if migration.transactional:
+        with db.engine.begin() as connection:
+            migration.module.upgrade(MigrationContext(connection, autocommit=False))
+            _record(connection, migration)
+        return
+    
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        migration.module.upgrade(MigrationContext(connection, autocommit=True))
+    with db.engine.begin() as connection:
+        _record(connection, migration)
+
+def upgrade(target=None, log=None):
+    """Apply pending migrations up to target (default: all); returns those applied"""
+    applied = []
+    lock = db.engine.connect()
+    try:
+        if lock.dialect.name == 'postgresql':
+            lock.execute(text('SELECT pg_advisory_lock(:id)'), {'id': ADVISORY_LOCK_ID})
+            lock.commit()
+        
+        with db.engine.begin() as connection:
+            done = applied_versions(connection)
+        
+        for migration in discover():
+            if migration.version in done:
+                continue
+            if target is not None and migration.version > target:
+                break
+            if log:
+                log(migration)
+            _apply(migration)
+            applied.append(migration)
+    finally:
+        if lock.dialect.name == 'postgresql':
+            lock.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': ADVISORY_LOCK_ID})
+            lock.commit()
+        lock.close()
+    
+    # Migrations may run Core DDL/DML the ORM session has not seen
+    db.session.expire_all()
+    return applied
@@ -0,0 +1,6 @@
+"""Create all model tables that do not exist yet"""
+
+def upgrade(ctx):
+    # Idempotent, so databases created by the old db.create_all() at
+    # startup pass through unchanged
+    ctx.create_tables()
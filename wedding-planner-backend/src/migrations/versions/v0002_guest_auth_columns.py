@@ -0,0 +1,15 @@
+"""Add guest username and password_hash columns"""
+
+from src.models import Guest
+
+# Lets the username index go on a live guests table without a write lock
+TRANSACTIONAL = False
+
+def upgrade(ctx):
+    # Uniqueness comes from the index; SQLite cannot ADD COLUMN ... UNIQUE
+    ctx.add_column('guests', 'username', 'VARCHAR(80)')
+    ctx.add_column('guests', 'password_hash', 'VARCHAR(255)')
+    
+    for index in Guest.__table__.indexes:
+        if index.name == 'ix_guests_username':
+            ctx.create_index(index)
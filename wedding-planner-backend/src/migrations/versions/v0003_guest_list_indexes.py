@@ -0,0 +1,10 @@
+"""Add missing guests indexes (keyset pagination, email lookups)"""
+
+from src.models import Guest
+
+TRANSACTIONAL = False
+
+def upgrade(ctx):
+    # db.create_all() never added indexes to an existing table
+    for index in sorted(Guest.__table__.indexes, key=lambda index: index.name):
+        ctx.create_index(index)
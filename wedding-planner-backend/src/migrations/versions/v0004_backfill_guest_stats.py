@@ -0,0 +1,9 @@
+"""Build guest_stats from an existing guest list"""
+
+from src.services.guest_stats import ensure_guest_stats
+
+# Runs through the ORM session, which commits on its own
+TRANSACTIONAL = False
+
+def upgrade(ctx):
+    ensure_guest_stats()
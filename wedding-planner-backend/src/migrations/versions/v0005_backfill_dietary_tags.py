@@ -0,0 +1,8 @@
+"""Parse existing guests' dietary text into guest_dietary_tags"""
+
+from src.services.dietary import ensure_dietary_tags
+
+TRANSACTIONAL = False
+
+def upgrade(ctx):
+    ensure_dietary_tags()
@@ -0,0 +1,10 @@
+"""Add composite indexes for the task and cost listings"""
+
+from src.models import Task, Cost
+
+TRANSACTIONAL = False
+
+def upgrade(ctx):
+    for table in (Task.__table__, Cost.__table__):
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            ctx.create_index(index)
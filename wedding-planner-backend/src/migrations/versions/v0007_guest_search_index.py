@@ -0,0 +1,55 @@
+"""Add the guest search index (pg_trgm on PostgreSQL, FTS5 on SQLite)"""
+
+from src.services.guest_search import FTS_TABLE, SEARCH_DOCUMENT, TRIGRAM_INDEX
+
+TRANSACTIONAL = False
+
+SQLITE_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON guests BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email, username)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.username);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON guests BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email, username)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.username);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF first_name, last_name, email, username ON guests BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email, username)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.username);
+        INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email, username)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.username);
+    END""",
+)
+
+def _upgrade_postgresql(ctx):
+    ctx.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    invalid = ctx.execute(
+        'SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+        'WHERE c.relname = :name AND NOT i.indisvalid',
+        {'name': TRIGRAM_INDEX}
+    ).first()
+    if invalid is not None:
+        ctx.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {TRIGRAM_INDEX}')
+    ctx.execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {TRIGRAM_INDEX} '
+        f'ON guests USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)'
+    )
+
+def _upgrade_sqlite(ctx):
+    try:
+        ctx.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            f"first_name, last_name, email, username, content='guests', content_rowid='id', tokenize='trigram')"
+        )
+    except Exception:
+        # SQLite older than 3.34 or built without FTS5: search falls back to LIKE
+        return
+    for trigger in SQLITE_TRIGGERS:
+        ctx.execute(trigger)
+    ctx.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+def upgrade(ctx):
+    if ctx.dialect == 'postgresql':
+        _upgrade_postgresql(ctx)
+    elif ctx.dialect == 'sqlite':
+        _upgrade_sqlite(ctx)
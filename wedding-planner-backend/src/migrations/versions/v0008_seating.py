@@ -0,0 +1,6 @@
+"""Add seating tables, seat assignments and seating constraints"""
+
+from src.models import Table, SeatAssignment, SeatingConstraint
+
+def upgrade(ctx):
+    ctx.create_tables(Table.__table__, SeatAssignment.__table__, SeatingConstraint.__table__)
@@ -0,0 +1,6 @@
+"""Add the jobs table for background admin operations"""
+
+from src.models import Job
+
+def upgrade(ctx):
+    ctx.create_tables(Job.__table__)
@@ -0,0 +1,6 @@
+"""Add the outbox table for invitation and reminder emails"""
+
+from src.models import OutboxMessage
+
+def upgrade(ctx):
+    ctx.create_tables(OutboxMessage.__table__)
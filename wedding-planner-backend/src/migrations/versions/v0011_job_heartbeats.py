@@ -0,0 +1,5 @@
+"""Add jobs.heartbeat_at so jobs orphaned by a dead worker can be failed"""
+
+def upgrade(ctx):
+    ctx.add_column('jobs', 'heartbeat_at', 'TIMESTAMP')
+    ctx.execute("UPDATE jobs SET heartbeat_at = started_at WHERE status = 'running'")
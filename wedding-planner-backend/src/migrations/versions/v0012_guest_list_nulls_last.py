@@ -0,0 +1,20 @@
+"""Rebuild the guest list keyset indexes as registered_at DESC NULLS LAST on PostgreSQL"""
+
+from src.models import Guest
+
+TRANSACTIONAL = False
+
+# Replaced on PostgreSQL, whose ascending index cannot serve DESC NULLS LAST
+OLD_INDEXES = (
+    'ix_guests_registered_at_id',
+    'ix_guests_rsvp_status_registered_at_id',
+    'ix_guests_attendance_type_registered_at_id'
+)
+
+def upgrade(ctx):
+    if ctx.dialect != 'postgresql':
+        return
+    for index in sorted(Guest.__table__.indexes, key=lambda index: index.name):
+        ctx.create_index(index)
+    for name in OLD_INDEXES:
+        ctx.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,51 @@
+"""Make guests.email unique (merging duplicate guests) so imports can upsert"""
+
+import logging
+from sqlalchemy import delete, func, inspect, select, update
+from src.models import Guest, GuestDietaryTag, OutboxMessage, SeatAssignment, SeatingConstraint
+from src.services.guest_stats import rebuild_guest_stats
+
+TRANSACTIONAL = False
+
+logger = logging.getLogger(__name__)
+
+def _duplicates(ctx):
+    """Ids of guests sharing an email with a better row: one with a login, else the oldest"""
+    table = Guest.__table__
+    rows = ctx.connection.execute(
+        select(table.c.id, table.c.email)
+        .where(table.c.email.in_(
+            select(table.c.email).group_by(table.c.email).having(func.count() > 1)
+        ))
+        .order_by(table.c.email, table.c.username.is_(None), table.c.id)
+    )
+    seen, duplicates = set(), []
+    for guest_id, email in rows:
+        if email in seen:
+            duplicates.append(guest_id)
+        seen.add(email)
+    return duplicates
+
+def upgrade(ctx):
+    duplicates = _duplicates(ctx)
+    if duplicates:
+        logger.warning('Removing %d guests whose email another guest already has', len(duplicates))
+        # Explicit, as SQLite does not enforce the ON DELETE actions without PRAGMA foreign_keys
+        for table, column in ((GuestDietaryTag.__table__, 'guest_id'), (SeatAssignment.__table__, 'guest_id'),
+                              (SeatingConstraint.__table__, 'guest_id'), (SeatingConstraint.__table__, 'other_guest_id')):
+            ctx.connection.execute(delete(table).where(table.c[column].in_(duplicates)))
+        outbox = OutboxMessage.__table__
+        ctx.connection.execute(update(outbox).where(outbox.c.guest_id.in_(duplicates)).values(guest_id=None))
+        ctx.connection.execute(delete(Guest.__table__).where(Guest.__table__.c.id.in_(duplicates)))
+        rebuild_guest_stats()
+    
+    # The index keeps its name but becomes unique; checkfirst would skip it, so drop it first
+    index = next(index for index in Guest.__table__.indexes if index.name == 'ix_guests_email')
+    unique = any(
+        found['name'] == index.name and found.get('unique')
+        for found in inspect(ctx.connection).get_indexes('guests')
+    )
+    if not unique:
+        concurrently = 'CONCURRENTLY ' if ctx.dialect == 'postgresql' else ''
+        ctx.execute(f'DROP INDEX {concurrently}IF EXISTS {index.name}')
+        ctx.create_index(index)
@@ -7,6 +7,14 @@ from .guest import Guest
 from .task import Task
 from .cost import Cost
 from .content import Content
+from .guest_stats import GuestStats
+from .dietary_tag import GuestDietaryTag
+from .table import Table
+from .seat_assignment import SeatAssignment
+from .seating_constraint import SeatingConstraint
+from .job import Job
+from .outbox import OutboxMessage
 
-__all__ = ['db', 'User', 'Guest', 'Task', 'Cost', 'Content']
+__all__ = ['db', 'User', 'Guest', 'Task', 'Cost', 'Content', 'GuestStats', 'GuestDietaryTag',
+           'Table', 'SeatAssignment', 'SeatingConstraint', 'Job', 'OutboxMessage']
 
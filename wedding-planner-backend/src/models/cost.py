@@ -4,6 +4,12 @@ from datetime import datetime
 class Cost(db.Model):
     """Cost model for wedding budget tracking"""
     __tablename__ = 'costs'
+    __table_args__ = (
+        # GET /api/costs: user_id plus optional category/status, newest first
+        db.Index('ix_costs_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_costs_user_id_category_created_at', 'user_id', 'category', 'created_at'),
+        db.Index('ix_costs_user_id_status_created_at', 'user_id', 'status', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
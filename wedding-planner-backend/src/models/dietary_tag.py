@@ -0,0 +1,22 @@
+from src.models import db
+
+class GuestDietaryTag(db.Model):
+    """Canonical dietary restriction/allergy tag parsed from a guest's free text"""
+    __tablename__ = 'guest_dietary_tags'
+    __table_args__ = (
+        db.UniqueConstraint('guest_id', 'kind', 'tag', name='uq_guest_dietary_tags_guest_kind_tag'),
+        db.Index('ix_guest_dietary_tags_kind_tag', 'kind', 'tag'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id', ondelete='CASCADE'), nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)  # restriction, allergy
+    tag = db.Column(db.String(50), nullable=False)  # e.g. 'vegetarian', 'gluten-free', 'peanuts'
+    
+    def to_dict(self):
+        """Convert tag to dictionary"""
+        return {
+            'guest_id': self.guest_id,
+            'kind': self.kind,
+            'tag': self.tag
+        }
@@ -1,6 +1,6 @@
 from src.models import db
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.services.passwords import hash_password, verify_password, needs_rehash
 
 class Guest(db.Model):
     """Guest model for wedding registration"""
@@ -10,7 +10,7 @@ class Guest(db.Model):
     # Primary guest information
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(120), nullable=False, index=True)
+    email = db.Column(db.String(120), nullable=False, unique=True, index=True)  # Import upsert key
     phone = db.Column(db.String(20))
     
     # Authentication
@@ -36,13 +36,42 @@ class Guest(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_accessed = db.Column(db.DateTime)
     
+    # Keyset pagination of the guest list, optionally filtered by status/type,
+    # ordered by registered_at DESC NULLS LAST, id DESC. SQLite reads that order
+    # backwards off an ascending index; PostgreSQL sorts NULLs high, so it
+    # needs the direction in the index. Declared after the columns to use .desc()
+    __table_args__ = (
+        db.Index('ix_guests_registered_at_id', 'registered_at', 'id').ddl_if(dialect='sqlite'),
+        db.Index('ix_guests_rsvp_status_registered_at_id', 'rsvp_status', 'registered_at', 'id').ddl_if(dialect='sqlite'),
+        db.Index('ix_guests_attendance_type_registered_at_id', 'attendance_type', 'registered_at', 'id').ddl_if(dialect='sqlite'),
+        db.Index(
+            'ix_guests_registered_at_desc_id', registered_at.desc().nulls_last(), id.desc()
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_guests_rsvp_status_registered_at_desc_id', rsvp_status, registered_at.desc().nulls_last(), id.desc()
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_guests_attendance_type_registered_at_desc_id', attendance_type, registered_at.desc().nulls_last(), id.desc()
+        ).ddl_if(dialect='postgresql'),
+    )
+    
+    # Parsed from dietary_restrictions/allergies on write (src/services/dietary.py)
+    dietary_tags = db.relationship('GuestDietaryTag', backref='guest', cascade='all, delete-orphan', lazy=True)
+    
+    seat_assignment = db.relationship('SeatAssignment', backref='guest', cascade='all, delete-orphan', uselist=False, lazy=True)
+    
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        """Check password against hash"""
-        return check_password_hash(self.password_hash, password) if self.password_hash else False
+        """Check password against hash, upgrading the hash if the hashing settings changed"""
+        if not verify_password(self.password_hash, password):
+            return False
+        if needs_rehash(self.password_hash):
+            # Caller commits; the new hash is written with the login's transaction
+            self.password_hash = hash_password(password)
+        return True
     
     def to_dict(self, include_sensitive=False):
         """Convert guest to dictionary"""
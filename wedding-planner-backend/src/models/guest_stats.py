@@ -0,0 +1,28 @@
+from src.models import db
+from datetime import datetime
+
+class GuestStats(db.Model):
+    """Materialized guest counts per RSVP status and attendance type.
+    
+    Maintained incrementally by the session listeners in
+    src/services/guest_stats.py. NULL statuses/types are stored as ''
+    so they can be part of the primary key.
+    """
+    __tablename__ = 'guest_stats'
+    
+    rsvp_status = db.Column(db.String(20), primary_key=True, default='')
+    attendance_type = db.Column(db.String(20), primary_key=True, default='')
+    guest_count = db.Column(db.Integer, nullable=False, default=0)
+    attendance = db.Column(db.Integer, nullable=False, default=0)  # Sum of number_of_guests
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert stats row to dictionary"""
+        return {
+            'rsvp_status': self.rsvp_status or None,
+            'attendance_type': self.attendance_type or None,
+            'guest_count': self.guest_count,
+            'attendance': self.attendance,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,42 @@
+from src.models import db
+from datetime import datetime
+import json
+
+class Job(db.Model):
+    """Background job queued by an admin request and run by the job workers"""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_created_at', 'status', 'created_at'),
+    )
+    
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(50), nullable=False)  # e.g. guests.import, seating.solve
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, finished, failed
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'))
+    
+    params = db.Column(db.Text)  # JSON
+    progress = db.Column(db.Integer, nullable=False, default=0)  # Percent
+    message = db.Column(db.String(255))
+    result = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # Refreshed by the worker while running
+    
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'user_id': self.user_id,
+            'progress': self.progress,
+            'message': self.message,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
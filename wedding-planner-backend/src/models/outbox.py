@@ -0,0 +1,48 @@
+from src.models import db
+from datetime import datetime
+
+class OutboxMessage(db.Model):
+    """One email to one guest, queued for the outbox dispatcher.
+    
+    The body is rendered from the Content entry named by template when the
+    message is sent; campaign + recipient is unique, so queueing the same
+    campaign twice does not email anyone twice.
+    """
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        db.UniqueConstraint('campaign', 'recipient', name='uq_outbox_campaign_recipient'),
+        # Dispatcher: next queued messages that are due
+        db.Index('ix_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    campaign = db.Column(db.String(100), nullable=False)  # Defaults to the template key
+    template = db.Column(db.String(100), nullable=False)  # Content.key
+    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id', ondelete='SET NULL'), index=True)
+    recipient = db.Column(db.String(120), nullable=False)
+    domain = db.Column(db.String(120), nullable=False)  # For per-domain rate limits
+    
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    claimed_at = db.Column(db.DateTime)
+    sent_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        """Convert outbox message to dictionary"""
+        return {
+            'id': self.id,
+            'campaign': self.campaign,
+            'template': self.template,
+            'guest_id': self.guest_id,
+            'recipient': self.recipient,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
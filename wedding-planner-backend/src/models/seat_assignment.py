@@ -0,0 +1,28 @@
+from src.models import db
+from datetime import datetime
+
+class SeatAssignment(db.Model):
+    """A confirmed guest's party seated at a table.
+    
+    Written by the seating solver (src/services/seating.py) or by hand;
+    pinned assignments are never moved by the solver.
+    """
+    __tablename__ = 'seat_assignments'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id', ondelete='CASCADE'), nullable=False, unique=True)
+    table_id = db.Column(db.Integer, db.ForeignKey('seating_tables.id', ondelete='CASCADE'), nullable=False, index=True)
+    seats = db.Column(db.Integer, nullable=False, default=1)  # number_of_guests when seated
+    pinned = db.Column(db.Boolean, nullable=False, default=False)
+    
+    assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert assignment to dictionary"""
+        return {
+            'guest_id': self.guest_id,
+            'table_id': self.table_id,
+            'seats': self.seats,
+            'pinned': self.pinned,
+            'assigned_at': self.assigned_at.isoformat() if self.assigned_at else None
+        }
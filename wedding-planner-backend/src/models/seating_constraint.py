@@ -0,0 +1,32 @@
+from src.models import db
+from datetime import datetime
+
+class SeatingConstraint(db.Model):
+    """Pairwise seating rule between two guests.
+    
+    together and apart are hard constraints; prefer and avoid are soft
+    preferences scored by weight.
+    """
+    __tablename__ = 'seating_constraints'
+    __table_args__ = (
+        db.UniqueConstraint('guest_id', 'other_guest_id', 'kind', name='uq_seating_constraints_pair_kind'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # together, apart, prefer, avoid
+    guest_id = db.Column(db.Integer, db.ForeignKey('guests.id', ondelete='CASCADE'), nullable=False, index=True)
+    other_guest_id = db.Column(db.Integer, db.ForeignKey('guests.id', ondelete='CASCADE'), nullable=False, index=True)
+    weight = db.Column(db.Float, nullable=False, default=1.0)  # Soft preferences only
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert constraint to dictionary"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'guest_id': self.guest_id,
+            'other_guest_id': self.other_guest_id,
+            'weight': self.weight,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,27 @@
+from src.models import db
+from datetime import datetime
+
+class Table(db.Model):
+    """Reception table guests are seated at"""
+    __tablename__ = 'seating_tables'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    capacity = db.Column(db.Integer, nullable=False)  # Seats, counted like number_of_guests
+    notes = db.Column(db.Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    assignments = db.relationship('SeatAssignment', backref='table', cascade='all, delete-orphan', lazy=True)
+    
+    def to_dict(self):
+        """Convert table to dictionary"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'capacity': self.capacity,
+            'notes': self.notes,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -25,6 +25,15 @@ class Task(db.Model):
     
     user = db.relationship('User', backref=db.backref('tasks', lazy=True))
     
+    # GET /api/tasks: user_id plus an optional equality filter, ordered by
+    # due_date ASC, priority DESC. Declared after the columns to use .desc()
+    __table_args__ = (
+        db.Index('ix_tasks_user_id_due_date_priority', user_id, due_date, priority.desc()),
+        db.Index('ix_tasks_user_id_status_due_date_priority', user_id, status, due_date, priority.desc()),
+        db.Index('ix_tasks_user_id_priority_due_date', user_id, priority, due_date),
+        db.Index('ix_tasks_user_id_category_due_date_priority', user_id, category, due_date, priority.desc()),
+    )
+    
     def to_dict(self):
         """Convert task to dictionary"""
         return {
@@ -37,8 +46,8 @@ class Task(db.Model):
             'due_date': self.due_date.isoformat() if self.due_date else None,
             'category': self.category,
             'assigned_to': self.assigned_to,
-            'estimated_cost': float(self.estimated_cost) if self.estimated_cost else None,
-            'actual_cost': float(self.actual_cost) if self.actual_cost else None,
+            'estimated_cost': float(self.estimated_cost) if self.estimated_cost is not None else None,
+            'actual_cost': float(self.actual_cost) if self.actual_cost is not None else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None
@@ -1,5 +1,5 @@
 from src.models import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.services.passwords import hash_password, verify_password, needs_rehash
 from datetime import datetime
 
 class User(db.Model):
@@ -16,11 +16,16 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        """Check password against hash"""
-        return check_password_hash(self.password_hash, password)
+        """Check password against hash, upgrading the hash if the hashing settings changed"""
+        if not verify_password(self.password_hash, password):
+            return False
+        if needs_rehash(self.password_hash):
+            # Caller commits; the new hash is written with the login's transaction
+            self.password_hash = hash_password(password)
+        return True
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -1,175 +1,78 @@
-from flask import Blueprint, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models import db, Guest, Task, Cost, User
-from sqlalchemy import func
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from src.models import Job
+from src.services.admin_auth import admin_required
+from src.services.aggregates import overview_stats, attendance_stats, dietary_summary, spending_series
+from src.services.budget_cache import budget_cache
+from src.services.dietary import tag_counts
+from src.services.jobs import enqueue
 
 analytics_bp = Blueprint('analytics', __name__)
 
 @analytics_bp.route('/overview', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_overview():
     """Get registration overview statistics"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # Guest statistics
-    total_guests = Guest.query.count()
-    confirmed_guests = Guest.query.filter_by(rsvp_status='confirmed').count()
-    pending_guests = Guest.query.filter_by(rsvp_status='pending').count()
-    declined_guests = Guest.query.filter_by(rsvp_status='declined').count()
-    
-    # Total attendance count (including plus-ones)
-    total_attendance = db.session.query(func.sum(Guest.number_of_guests)).filter_by(rsvp_status='confirmed').scalar() or 0
-    
-    # Attendance type breakdown
-    ceremony_only = Guest.query.filter_by(attendance_type='ceremony', rsvp_status='confirmed').count()
-    reception_only = Guest.query.filter_by(attendance_type='reception', rsvp_status='confirmed').count()
-    both_events = Guest.query.filter_by(attendance_type='both', rsvp_status='confirmed').count()
-    
     return jsonify({
-        'guests': {
-            'total': total_guests,
-            'confirmed': confirmed_guests,
-            'pending': pending_guests,
-            'declined': declined_guests,
-            'total_attendance': int(total_attendance),
-            'attendance_breakdown': {
-                'ceremony_only': ceremony_only,
-                'reception_only': reception_only,
-                'both_events': both_events
-            }
-        }
+        'guests': overview_stats()
     }), 200
 
 @analytics_bp.route('/dietary', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_dietary():
-    """Get dietary requirements summary"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    """Get dietary requirements summary.
     
-    # Count guests with dietary restrictions
-    guests_with_restrictions = Guest.query.filter(
-        Guest.dietary_restrictions.isnot(None),
-        Guest.dietary_restrictions != ''
-    ).count()
-    
-    guests_with_allergies = Guest.query.filter(
-        Guest.allergies.isnot(None),
-        Guest.allergies != ''
-    ).count()
-    
-    guests_with_special_requests = Guest.query.filter(
-        Guest.special_requests.isnot(None),
-        Guest.special_requests != ''
-    ).count()
-    
-    # Get all dietary restrictions (simplified - in production, you'd parse JSON)
-    all_restrictions = []
-    all_allergies = []
-    
-    guests = Guest.query.filter(
-        Guest.dietary_restrictions.isnot(None),
-        Guest.dietary_restrictions != ''
-    ).all()
-    
-    for guest in guests:
-        if guest.dietary_restrictions:
-            all_restrictions.append(guest.dietary_restrictions)
-        if guest.allergies:
-            all_allergies.append(guest.allergies)
+    Tags are parsed from the free text when a guest is written, so the
+    per-tag counts come from one GROUP BY over guest_dietary_tags.
+    Pass rsvp_status=confirmed to count only confirmed guests.
+    """
+    rsvp_status = request.args.get('rsvp_status')
     
     return jsonify({
-        'summary': {
-            'guests_with_restrictions': guests_with_restrictions,
-            'guests_with_allergies': guests_with_allergies,
-            'guests_with_special_requests': guests_with_special_requests
-        },
-        'details': {
-            'restrictions': all_restrictions,
-            'allergies': all_allergies
-        }
+        'summary': dietary_summary(rsvp_status),
+        'details': tag_counts(rsvp_status)
     }), 200
 
 @analytics_bp.route('/attendance', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_attendance():
     """Get detailed attendance statistics"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # RSVP status breakdown
-    rsvp_breakdown = db.session.query(
-        Guest.rsvp_status,
-        func.count(Guest.id).label('count')
-    ).group_by(Guest.rsvp_status).all()
-    
-    # Attendance type breakdown
-    attendance_breakdown = db.session.query(
-        Guest.attendance_type,
-        func.count(Guest.id).label('count')
-    ).filter_by(rsvp_status='confirmed').group_by(Guest.attendance_type).all()
-    
-    # Recent registrations (last 7 days)
-    from datetime import datetime, timedelta
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    recent_registrations = Guest.query.filter(
-        Guest.registered_at >= seven_days_ago
-    ).count()
-    
-    return jsonify({
-        'rsvp_breakdown': {status: count for status, count in rsvp_breakdown},
-        'attendance_breakdown': {atype: count for atype, count in attendance_breakdown},
-        'recent_registrations': recent_registrations
-    }), 200
+    return jsonify(attendance_stats()), 200
 
 @analytics_bp.route('/budget', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_budget():
-    """Get budget and cost analytics"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    """Get budget and cost analytics.
     
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # Cost statistics
-    total_planned = db.session.query(func.sum(Cost.amount)).filter_by(status='planned', user_id=user_id).scalar() or 0
-    total_paid = db.session.query(func.sum(Cost.amount)).filter_by(status='paid', user_id=user_id).scalar() or 0
-    total_pending = db.session.query(func.sum(Cost.amount)).filter_by(status='pending', user_id=user_id).scalar() or 0
-    
-    # Cost by category
-    cost_by_category = db.session.query(
-        Cost.category,
-        func.sum(Cost.amount).label('total')
-    ).filter_by(user_id=user_id).group_by(Cost.category).all()
+    Costs come as totals and a category x status pivot, tasks as counts
+    and estimated-vs-actual variance; one query per table, cached per user
+    until one of their costs or tasks changes.
+    """
+    user_id = get_jwt_identity()
     
-    # Task statistics
-    total_tasks = Task.query.filter_by(user_id=user_id).count()
-    completed_tasks = Task.query.filter_by(user_id=user_id, status='completed').count()
-    in_progress_tasks = Task.query.filter_by(user_id=user_id, status='in_progress').count()
+    return jsonify(budget_cache.rollup(user_id)), 200
+
+@analytics_bp.route('/budget/series', methods=['GET'])
+@admin_required
+def get_budget_series():
+    """Get spending per day/week/month of payment_date, for charting"""
+    user_id = get_jwt_identity()
     
-    return jsonify({
-        'costs': {
-            'total_planned': float(total_planned),
-            'total_paid': float(total_paid),
-            'total_pending': float(total_pending),
-            'by_category': {category: float(total) for category, total in cost_by_category}
-        },
-        'tasks': {
-            'total': total_tasks,
-            'completed': completed_tasks,
-            'in_progress': in_progress_tasks,
-            'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        }
-    }), 200
+    try:
+        series = spending_series(
+            user_id,
+            bucket=request.args.get('bucket', 'month'),
+            status=request.args.get('status'),
+            category=request.args.get('category')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'bucket': request.args.get('bucket', 'month'), 'series': series}), 200
 
+@analytics_bp.route('/rebuild', methods=['POST'])
+@admin_required
+def rebuild():
+    """Queue a full recount of guest statistics and dietary tags as a background job"""
+    job_id = enqueue('analytics.rebuild', user_id=int(get_jwt_identity()))
+    return jsonify(Job.query.get(job_id).to_dict()), 202, {'Location': f'/api/jobs/{job_id}'}
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from src.models import db, User
+from src.services.admin_auth import admin_required, admin_claims
+from src.services.user_cache import user_cache
+from src.services.rate_limit import login_rate_limited
 from datetime import datetime
 
 auth_bp = Blueprint('auth', __name__)
@@ -32,6 +35,7 @@ def register():
     }), 201
 
 @auth_bp.route('/login', methods=['POST'])
+@login_rate_limited('email')
 def login():
     """Login and get JWT token"""
     data = request.get_json()
@@ -44,7 +48,11 @@ def login():
     if not user or not user.check_password(data['password']):
         return jsonify({'error': 'Invalid credentials'}), 401
     
-    access_token = create_access_token(identity=user.id)
+    # Persist a hash upgraded by check_password
+    if db.session.is_modified(user):
+        db.session.commit()
+    
+    access_token = create_access_token(identity=user.id, additional_claims=admin_claims(user))
     
     return jsonify({
         'access_token': access_token,
@@ -89,3 +97,9 @@ def update_profile():
     
     return jsonify(user.to_dict()), 200
 
+
+@auth_bp.route('/cache-stats', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    """Hit/miss counters of the admin user cache"""
+    return jsonify(user_cache.stats()), 200
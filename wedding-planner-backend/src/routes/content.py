@@ -1,66 +1,119 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models import db, Content, User
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import verify_jwt_in_request
+from src.models import db, Content
+from src.services.admin_auth import admin_required, current_admin_role
+from src.services.http_cache import make_etag, not_modified, apply_cache_headers
+from src.services.content_cache import content_cache, PUBLIC_LIST, key_entry
+from src.services.serialization import serializer_for
+from sqlalchemy import func
+from datetime import datetime
 
 content_bp = Blueprint('content', __name__)
 
+def _cached_response(entry, public=True):
+    """Response (or 304) for a pre-serialized cache entry"""
+    last_modified = datetime.fromisoformat(entry['last_modified']) if entry['last_modified'] else None
+    
+    cached = not_modified(entry['etag'], last_modified, public=public)
+    if cached is not None:
+        return cached
+    
+    response = current_app.response_class(entry['body'], mimetype='application/json')
+    return apply_cache_headers(response, entry['etag'], last_modified, public=public)
+
+def _cache_and_respond(name, data, etag, last_modified):
+    """Serialize once, store the bytes in the content cache and respond"""
+    body = current_app.json.dumps(data).encode('utf-8') + b'\n'
+    content_cache.put(name, etag, last_modified, body)
+    return _cached_response({
+        'etag': etag,
+        'last_modified': last_modified.isoformat() if last_modified else None,
+        'body': body
+    })
+
 @content_bp.route('', methods=['GET'])
 def get_content():
     """Get public content (no auth required) or all content (admin)"""
     is_public_only = not request.args.get('admin', '').lower() == 'true'
     
     if is_public_only:
-        # Public endpoint - only return public content
+        # Public endpoint - only return public content, served from the cache when possible
+        entry = content_cache.get(PUBLIC_LIST)
+        if entry is not None:
+            return _cached_response(entry)
+        
         contents = Content.query.filter_by(is_public=True).order_by(Content.order.asc()).all()
-    else:
-        # Check if user is authenticated for admin access
-        try:
-            from flask_jwt_extended import get_jwt_identity
-            user_id = get_jwt_identity()
-            user = User.query.get(user_id)
-            
-            if not user:
-                return jsonify({'error': 'Unauthorized'}), 401
-            
-            # Return all content for admin
-            contents = Content.query.order_by(Content.order.asc()).all()
-        except:
+        last_modified = max((content.updated_at for content in contents if content.updated_at), default=None)
+        etag = make_etag('public', last_modified, len(contents))
+        return _cache_and_respond(PUBLIC_LIST, serializer_for(Content).many(contents), etag, last_modified)
+    
+    # Check if user is authenticated for admin access
+    try:
+        verify_jwt_in_request()
+        
+        if current_admin_role() is None:
             return jsonify({'error': 'Unauthorized'}), 401
-    
-    return jsonify([content.to_dict() for content in contents]), 200
+    except:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    # Validators: any create/update/delete moves the max timestamp or the count
+    query = Content.query
+    last_modified, count = query.with_entities(func.max(Content.updated_at), func.count(Content.id)).one()
+    etag = make_etag('all', last_modified, count)
+    
+    cached = not_modified(etag, last_modified, public=False)
+    if cached is not None:
+        return cached
+    
+    # Return all content for admin
+    contents = query.order_by(Content.order.asc()).all()
+    response = jsonify(serializer_for(Content).many(contents))
+    return apply_cache_headers(response, etag, last_modified, public=False), 200
 
 @content_bp.route('/<string:key>', methods=['GET'])
 def get_content_by_key(key):
     """Get specific content by key"""
-    content = Content.query.filter_by(key=key).first()
+    entry = content_cache.get(key_entry(key))
+    if entry is not None:
+        return _cached_response(entry)
     
-    if not content:
+    validator = db.session.query(Content.id, Content.updated_at, Content.is_public).filter_by(key=key).first()
+    
+    if not validator:
         return jsonify({'error': 'Content not found'}), 404
     
     # Check if content is public or user is admin
-    if not content.is_public:
+    if not validator.is_public:
         try:
-            from flask_jwt_extended import get_jwt_identity
-            user_id = get_jwt_identity()
-            user = User.query.get(user_id)
+            verify_jwt_in_request()
             
-            if not user:
+            if current_admin_role() is None:
                 return jsonify({'error': 'Unauthorized'}), 401
         except:
             return jsonify({'error': 'Unauthorized'}), 401
     
-    return jsonify(content.to_dict()), 200
+    etag = make_etag(f'key:{key}', validator.updated_at, validator.id)
+    cached = not_modified(etag, validator.updated_at, public=validator.is_public)
+    if cached is not None:
+        return cached
+    
+    content = db.session.get(Content, validator.id)
+    if validator.is_public:
+        return _cache_and_respond(key_entry(key), content.to_dict(), etag, validator.updated_at)
+    
+    response = jsonify(content.to_dict())
+    return apply_cache_headers(response, etag, validator.updated_at, public=False), 200
+
+@content_bp.route('/cache-stats', methods=['GET'])
+@admin_required
+def get_content_cache_stats():
+    """Hit/miss counters of the public content cache"""
+    return jsonify(content_cache.stats()), 200
 
 @content_bp.route('', methods=['POST'])
-@jwt_required()
+@admin_required
 def create_content():
     """Create new content (admin only)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
     data = request.get_json()
     
     if not data or not data.get('key') or not data.get('content'):
@@ -84,15 +137,9 @@ def create_content():
     return jsonify(content.to_dict()), 201
 
 @content_bp.route('/<int:content_id>', methods=['PUT'])
-@jwt_required()
+@admin_required
 def update_content(content_id):
     """Update content (admin only)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
     content = Content.query.get(content_id)
     
     if not content:
@@ -124,15 +171,9 @@ def update_content(content_id):
     return jsonify(content.to_dict()), 200
 
 @content_bp.route('/<int:content_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_content(content_id):
     """Delete content (admin only)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
     content = Content.query.get(content_id)
     
     if not content:
@@ -1,44 +1,41 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models import db, Cost, User
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select
+from src.models import db, Cost
+from src.services.admin_auth import admin_required
+from src.services.serialization import serializer_for
 from datetime import datetime
 
 costs_bp = Blueprint('costs', __name__)
 
 @costs_bp.route('', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_costs():
     """Get all costs for the current user"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     # Filtering options
     category = request.args.get('category')
     status = request.args.get('status')
     
-    query = Cost.query.filter_by(user_id=user_id)
+    # Read-only: select plain column tuples instead of hydrating Cost objects
+    serializer = serializer_for(Cost)
+    query = select(*serializer.select_columns()).filter_by(user_id=user_id)
     
     if category:
         query = query.filter_by(category=category)
     if status:
         query = query.filter_by(status=status)
     
-    costs = query.order_by(Cost.created_at.desc()).all()
+    rows = db.session.execute(query.order_by(Cost.created_at.desc())).all()
     
-    return jsonify([cost.to_dict() for cost in costs]), 200
+    return jsonify(serializer.rows(rows)), 200
 
 @costs_bp.route('', methods=['POST'])
-@jwt_required()
+@admin_required
 def create_cost():
     """Create a new cost item"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     data = request.get_json()
     
@@ -70,14 +67,10 @@ def create_cost():
     return jsonify(cost.to_dict()), 201
 
 @costs_bp.route('/<int:cost_id>', methods=['PUT'])
-@jwt_required()
+@admin_required
 def update_cost(cost_id):
     """Update a cost item"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     cost = Cost.query.filter_by(id=cost_id, user_id=user_id).first()
     
@@ -115,14 +108,10 @@ def update_cost(cost_id):
     return jsonify(cost.to_dict()), 200
 
 @costs_bp.route('/<int:cost_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_cost(cost_id):
     """Delete a cost item"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     cost = Cost.query.filter_by(id=cost_id, user_id=user_id).first()
     
@@ -0,0 +1,94 @@
+import json
+import time
+from flask import Blueprint, Response, request, jsonify
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from src.services.admin_auth import admin_required, current_admin_role
+from src.services import events as event_service
+from src.services.events import event_bus, issue_stream_token, read_stream_token
+from src.services.user_cache import user_cache
+
+events_bp = Blueprint('events', __name__)
+
+# Seconds between keep-alive comments, so proxies keep an idle stream open
+HEARTBEAT_SECONDS = 15
+# Streams end after this long and the browser reconnects with Last-Event-ID,
+# so a server thread is never held indefinitely
+MAX_STREAM_SECONDS = 600
+# Milliseconds the browser waits before reconnecting
+RETRY_MS = 3000
+
+def _format(item):
+    return f"id: {item['id']}\nevent: {item['type']}\ndata: {json.dumps(item['data'], separators=(',', ':'))}\n\n"
+
+def _stream(user_id, last_event_id):
+    # Subscribed on first iteration, so the finally below always unsubscribes
+    subscription, missed, complete = event_bus.subscribe(user_id, last_event_id)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        if not complete:
+            # Too far behind to replay: refetch the lists, then follow the stream
+            yield 'event: resync\ndata: {}\n\n'
+        for item in missed:
+            yield _format(item)
+        
+        deadline = time.monotonic() + MAX_STREAM_SECONDS
+        while time.monotonic() < deadline:
+            item = subscription.get(HEARTBEAT_SECONDS)
+            if subscription.overflowed:
+                while subscription.get(0) is not None:
+                    pass
+                subscription.overflowed = False
+                yield 'event: resync\ndata: {}\n\n'
+            elif item is None:
+                yield ': ping\n\n'
+            else:
+                yield _format(item)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+@events_bp.route('', methods=['GET'])
+def stream_events():
+    """Server-sent stream of guest, task and cost changes (admin only).
+    
+    Events: guest.created, guest.rsvp_changed, guest.deleted,
+    guests.imported, task.completed and cost.paid (the last two only for
+    the admin's own items), plus resync when the client should refetch.
+    EventSource cannot send headers, so instead of the JWT it may pass
+    ?token= from POST /api/events/token. Reconnects resume after the
+    Last-Event-ID header or ?last_event_id=.
+    """
+    token = request.args.get('token')
+    if token is not None:
+        user_id = read_stream_token(token)
+        if user_id is None:
+            return jsonify({'error': 'Invalid or expired stream token'}), 401
+        if user_cache.get_role(int(user_id)) is None:
+            return jsonify({'error': 'User not found'}), 404
+    else:
+        verify_jwt_in_request()
+        if current_admin_role() is None:
+            return jsonify({'error': 'User not found'}), 404
+        user_id = get_jwt_identity()
+    
+    if event_bus.subscriber_count() >= event_service.MAX_STREAMS:
+        # Each stream holds a request thread; refuse rather than starve the API
+        return jsonify({'error': 'Too many open event streams; retry later'}), 503, {'Retry-After': '30'}
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID must be an integer'}), 400
+    
+    return Response(
+        _stream(user_id, last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@events_bp.route('/token', methods=['POST'])
+@admin_required
+def create_stream_token():
+    """Issue a short-lived token for opening the event stream with EventSource"""
+    token, expires_in = issue_stream_token(get_jwt_identity())
+    return jsonify({'token': token, 'expires_in': expires_in}), 200
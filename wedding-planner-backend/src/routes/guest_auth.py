@@ -1,11 +1,15 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
 from src.models import db, Guest
+from src.services.admin_auth import guest_claims
+from src.services.last_access import last_access
+from src.services.rate_limit import login_rate_limited
 from datetime import datetime
 
 guest_auth_bp = Blueprint('guest_auth', __name__)
 
 @guest_auth_bp.route('/login', methods=['POST'])
+@login_rate_limited('username')
 def guest_login():
     """Guest login endpoint"""
     data = request.get_json()
@@ -18,11 +22,14 @@ def guest_login():
     if not guest or not guest.check_password(data['password']):
         return jsonify({'error': 'Invalid credentials'}), 401
     
-    # Update last accessed
-    guest.last_accessed = datetime.utcnow()
-    db.session.commit()
+    # Persist a hash upgraded by check_password
+    if db.session.is_modified(guest):
+        db.session.commit()
+    
+    # Written behind the request in batches
+    last_access.record(guest)
     
-    access_token = create_access_token(identity=f"guest_{guest.id}")
+    access_token = create_access_token(identity=f"guest_{guest.id}", additional_claims=guest_claims())
     
     return jsonify({
         'access_token': access_token,
@@ -62,7 +69,7 @@ def guest_register():
         
         db.session.commit()
         
-        access_token = create_access_token(identity=f"guest_{existing_guest.id}")
+        access_token = create_access_token(identity=f"guest_{existing_guest.id}", additional_claims=guest_claims())
         return jsonify({
             'message': 'Guest account created',
             'access_token': access_token,
@@ -90,7 +97,7 @@ def guest_register():
     db.session.add(guest)
     db.session.commit()
     
-    access_token = create_access_token(identity=f"guest_{guest.id}")
+    access_token = create_access_token(identity=f"guest_{guest.id}", additional_claims=guest_claims())
     
     return jsonify({
         'message': 'Guest registered successfully',
@@ -1,10 +1,39 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models import db, Guest, User
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import get_jwt_identity
+from src.models import db, Guest, Job
+from src.services.admin_auth import admin_required
+from src.services.pagination import (
+    PaginationError, parse_limit, parse_offset, parse_fields, encode_cursor, after_cursor_desc, order_desc
+)
+from src.services.export import EXPORT_FORMATS, stream_rows, iter_export
+from src.services.guest_import import DEFAULT_BATCH_SIZE, parse_csv, import_guests
+from src.services.guest_search import SearchError, parse_query, search_guest_ids
+from src.services.jobs import enqueue
+from src.services.serialization import serializer_for
+from sqlalchemy import select
 from datetime import datetime
+import json
 
 guests_bp = Blueprint('guests', __name__)
 
+# Columns that may be requested with ?fields= on the guest list
+LIST_FIELDS = (
+    'id', 'first_name', 'last_name', 'email', 'phone', 'rsvp_status',
+    'attendance_type', 'number_of_guests', 'dietary_restrictions', 'allergies',
+    'special_requests', 'address', 'notes', 'registered_at', 'updated_at', 'last_accessed'
+)
+
+def _apply_filters(query):
+    """Apply the rsvp_status/attendance_type filters shared by list and export"""
+    rsvp_status = request.args.get('rsvp_status')
+    attendance_type = request.args.get('attendance_type')
+    
+    if rsvp_status:
+        query = query.filter(Guest.rsvp_status == rsvp_status)
+    if attendance_type:
+        query = query.filter(Guest.attendance_type == attendance_type)
+    return query
+
 @guests_bp.route('/register', methods=['POST'])
 def register_guest():
     """Public endpoint for guest registration"""
@@ -62,41 +91,151 @@ def register_guest():
         'guest': guest.to_dict()
     }), 201
 
+@guests_bp.route('/bulk', methods=['POST'])
+@admin_required
+def bulk_import_guests():
+    """Create or update many guests by email (admin only).
+    
+    Accepts a JSON array (or {"guests": [...]}), a text/csv body, or a
+    multipart upload in the "file" field. Returns per-row errors; with
+    async=true the import runs as a background job and the response is
+    the job (poll GET /api/jobs/<id> for the report).
+    """
+    try:
+        batch_size = max(1, int(request.args.get('batch_size', DEFAULT_BATCH_SIZE)))
+    except ValueError:
+        return jsonify({'error': 'batch_size must be an integer'}), 400
+    
+    upload = request.files.get('file')
+    try:
+        if upload:
+            text = upload.read().decode('utf-8-sig')
+            rows = json.loads(text) if upload.filename.lower().endswith('.json') else parse_csv(text)
+        elif request.mimetype == 'text/csv':
+            rows = parse_csv(request.get_data(as_text=True))
+        else:
+            rows = request.get_json(silent=True)
+    except (UnicodeDecodeError, ValueError):
+        return jsonify({'error': 'Could not parse the uploaded guest list'}), 400
+    
+    if isinstance(rows, dict):
+        rows = rows.get('guests')
+    if not isinstance(rows, list):
+        return jsonify({'error': 'Expected a list of guests as JSON or CSV'}), 400
+    
+    if request.args.get('async', 'false').lower() == 'true':
+        job_id = enqueue('guests.import', {'rows': rows, 'batch_size': batch_size}, int(get_jwt_identity()))
+        return jsonify(Job.query.get(job_id).to_dict()), 202, {'Location': f'/api/jobs/{job_id}'}
+    
+    report = import_guests(rows, batch_size=batch_size)
+    return jsonify(report), 200
+
 @guests_bp.route('', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_guests():
-    """Get all guests (admin only)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    """Get all guests (admin only).
     
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    Pass limit and/or cursor for keyset pagination ordered by
+    (registered_at, id) descending, and fields=a,b,c to select only
+    those columns.
+    """
+    # Pagination and projection options
+    paginate = 'limit' in request.args or 'cursor' in request.args
+    try:
+        limit = parse_limit(request.args.get('limit')) if paginate else None
+        fields = parse_fields(request.args.get('fields'), LIST_FIELDS, required=('id', 'registered_at'))
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Filtering options
-    rsvp_status = request.args.get('rsvp_status')
-    attendance_type = request.args.get('attendance_type')
+    # Read-only: select plain column tuples instead of hydrating Guest objects
+    serializer = serializer_for(Guest, fields)
+    query = _apply_filters(select(*serializer.select_columns()))
     
-    query = Guest.query
+    if request.args.get('cursor'):
+        try:
+            query = query.filter(after_cursor_desc(Guest.registered_at, Guest.id, request.args['cursor']))
+        except PaginationError as e:
+            return jsonify({'error': str(e)}), 400
     
-    if rsvp_status:
-        query = query.filter_by(rsvp_status=rsvp_status)
-    if attendance_type:
-        query = query.filter_by(attendance_type=attendance_type)
+    query = query.order_by(*order_desc(Guest.registered_at, Guest.id))
+    
+    if not paginate:
+        rows = db.session.execute(query).all()
+        return jsonify(serializer.rows(rows)), 200
+    
+    # Fetch one extra row to know whether another page exists
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
-    guests = query.order_by(Guest.registered_at.desc()).all()
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(rows[-1].registered_at, rows[-1].id)
     
-    return jsonify([guest.to_dict() for guest in guests]), 200
+    return jsonify({
+        'guests': serializer.rows(rows),
+        'next_cursor': next_cursor
+    }), 200
+
+@guests_bp.route('/search', methods=['GET'])
+@admin_required
+def search_guests():
+    """Search guests by name, email or username (admin only).
+    
+    Substring and prefix matches come first, then fuzzy matches, best
+    first. Paged with limit/offset; fields= selects columns.
+    """
+    try:
+        terms = parse_query(request.args.get('q'))
+        limit = parse_limit(request.args.get('limit'), default=20)
+        offset = parse_offset(request.args.get('offset'))
+        fields = parse_fields(request.args.get('fields'), LIST_FIELDS, required=('id',))
+    except (SearchError, PaginationError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    ids, has_more = search_guest_ids(terms, limit, offset)
+    
+    serializer = serializer_for(Guest, fields)
+    rows = db.session.execute(select(*serializer.select_columns()).where(Guest.id.in_(ids))).all() if ids else []
+    by_id = {item['id']: item for item in serializer.rows(rows)}
+    
+    return jsonify({
+        'guests': [by_id[guest_id] for guest_id in ids if guest_id in by_id],
+        'next_offset': offset + limit if has_more else None
+    }), 200
+
+@guests_bp.route('/export', methods=['GET'])
+@admin_required
+def export_guests():
+    """Stream the guest list as CSV or NDJSON (admin only).
+    
+    Rows are read through a server-side cursor and written out as they
+    arrive, so memory stays flat regardless of the number of guests.
+    Supports the same filters and fields= projection as the guest list.
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    try:
+        fields = parse_fields(request.args.get('fields'), LIST_FIELDS) or list(LIST_FIELDS)
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query = select(*[getattr(Guest, field) for field in fields])
+    query = _apply_filters(query).order_by(*order_desc(Guest.registered_at, Guest.id))
+    
+    filename = f"guests-{datetime.utcnow().strftime('%Y%m%d')}.{export_format}"
+    return Response(
+        stream_with_context(iter_export(export_format, stream_rows(query), fields)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
 
 @guests_bp.route('/<int:guest_id>', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_guest(guest_id):
     """Get specific guest details (admin only)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
     guest = Guest.query.get(guest_id)
     
     if not guest:
@@ -105,15 +244,9 @@ def get_guest(guest_id):
     return jsonify(guest.to_dict()), 200
 
 @guests_bp.route('/<int:guest_id>', methods=['PUT'])
-@jwt_required()
+@admin_required
 def update_guest(guest_id):
     """Update guest information (admin only)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
     guest = Guest.query.get(guest_id)
     
     if not guest:
@@ -127,6 +260,8 @@ def update_guest(guest_id):
     if 'last_name' in data:
         guest.last_name = data['last_name']
     if 'email' in data:
+        if Guest.query.filter_by(email=data['email']).filter(Guest.id != guest_id).first():
+            return jsonify({'error': 'Email already in use'}), 400
         guest.email = data['email']
     if 'phone' in data:
         guest.phone = data['phone']
@@ -153,15 +288,9 @@ def update_guest(guest_id):
     return jsonify(guest.to_dict()), 200
 
 @guests_bp.route('/<int:guest_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_guest(guest_id):
     """Delete guest (admin only)"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
     guest = Guest.query.get(guest_id)
     
     if not guest:
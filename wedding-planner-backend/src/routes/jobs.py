@@ -0,0 +1,45 @@
+from flask import Blueprint, request, jsonify
+from src.models import Job
+from src.services.admin_auth import admin_required
+
+jobs_bp = Blueprint('jobs', __name__)
+
+JOB_STATUSES = ('queued', 'running', 'finished', 'failed')
+MAX_LIMIT = 200
+
+@jobs_bp.route('', methods=['GET'])
+@admin_required
+def get_jobs():
+    """Get recent background jobs, newest first (admin only).
+    
+    Filter with status and kind; limit defaults to 50.
+    """
+    status = request.args.get('status')
+    kind = request.args.get('kind')
+    
+    try:
+        limit = min(MAX_LIMIT, max(1, int(request.args.get('limit', 50))))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if status and status not in JOB_STATUSES:
+        return jsonify({'error': f"status must be one of: {', '.join(JOB_STATUSES)}"}), 400
+    
+    query = Job.query
+    if status:
+        query = query.filter_by(status=status)
+    if kind:
+        query = query.filter_by(kind=kind)
+    jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
+    
+    return jsonify([job.to_dict() for job in jobs]), 200
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+@admin_required
+def get_job(job_id):
+    """Get a job's status, progress and, once finished, its result"""
+    job = Job.query.get(job_id)
+    
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict()), 200
@@ -0,0 +1,104 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from src.models import Content, Job, OutboxMessage
+from src.services.admin_auth import admin_required
+from src.services.jobs import enqueue, find_active
+from src.services.outbox import OUTBOX_STATUSES, campaign_counts, email_configured, queue_messages
+from src.services.pagination import PaginationError, parse_limit, parse_offset
+
+outbox_bp = Blueprint('outbox', __name__)
+
+RSVP_STATUSES = ('pending', 'confirmed', 'declined')
+ATTENDANCE_TYPES = ('ceremony', 'reception', 'both')
+
+def _dispatch_job():
+    """The queued or live running send job, or a new one; a second dispatcher would double the domain rates"""
+    job_id = find_active('outbox.send') or enqueue('outbox.send', user_id=int(get_jwt_identity()))
+    return Job.query.get(job_id)
+
+@outbox_bp.route('', methods=['GET'])
+@admin_required
+def get_campaigns():
+    """Get message counts per campaign and status"""
+    return jsonify({'campaigns': campaign_counts()}), 200
+
+@outbox_bp.route('', methods=['POST'])
+@admin_required
+def queue_campaign():
+    """Queue an email to every matching guest (admin only).
+    
+    template names a Content entry: its title is the subject and its
+    content the body, with $first_name, $last_name, $email, $username,
+    $rsvp_status, $attendance_type and $number_of_guests filled in per
+    guest. Filter with rsvp_status, attendance_type or guest_ids; campaign
+    (default: the template key) makes repeats skip guests already queued.
+    Unless send is false, a background send job is started; that needs
+    SMTP_HOST (503 otherwise).
+    """
+    data = request.get_json() or {}
+    template = data.get('template')
+    campaign = data.get('campaign') or template
+    guest_ids = data.get('guest_ids')
+    
+    if not template:
+        return jsonify({'error': 'template is required'}), 400
+    if len(campaign) > 100:
+        return jsonify({'error': 'campaign must be at most 100 characters'}), 400
+    if data.get('rsvp_status') and data['rsvp_status'] not in RSVP_STATUSES:
+        return jsonify({'error': f"rsvp_status must be one of: {', '.join(RSVP_STATUSES)}"}), 400
+    if data.get('attendance_type') and data['attendance_type'] not in ATTENDANCE_TYPES:
+        return jsonify({'error': f"attendance_type must be one of: {', '.join(ATTENDANCE_TYPES)}"}), 400
+    if guest_ids is not None and (not isinstance(guest_ids, list) or not all(
+        isinstance(guest_id, int) and not isinstance(guest_id, bool) for guest_id in guest_ids
+    )):
+        return jsonify({'error': 'guest_ids must be a list of integers'}), 400
+    if not Content.query.filter_by(key=template).first():
+        return jsonify({'error': 'Template not found'}), 404
+    if data.get('send', True) and not email_configured():
+        return jsonify({'error': 'Email sending is not configured; queue with send false or set SMTP_HOST'}), 503
+    
+    queued = queue_messages(
+        template, campaign, rsvp_status=data.get('rsvp_status'),
+        attendance_type=data.get('attendance_type'), guest_ids=guest_ids
+    )
+    if not data.get('send', True):
+        return jsonify({'campaign': campaign, 'queued': queued}), 201
+    
+    job = _dispatch_job()
+    return jsonify({'campaign': campaign, 'queued': queued, 'job': job.to_dict()}), 202, {'Location': f'/api/jobs/{job.id}'}
+
+@outbox_bp.route('/dispatch', methods=['POST'])
+@admin_required
+def dispatch_outbox():
+    """Start sending queued messages, e.g. retries a finished run left for later"""
+    if not email_configured():
+        return jsonify({'error': 'Email sending is not configured; set SMTP_HOST'}), 503
+    job = _dispatch_job()
+    return jsonify(job.to_dict()), 202, {'Location': f'/api/jobs/{job.id}'}
+
+@outbox_bp.route('/messages', methods=['GET'])
+@admin_required
+def get_messages():
+    """Get outbox messages, oldest first; filter with campaign and status"""
+    status = request.args.get('status')
+    campaign = request.args.get('campaign')
+    
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        offset = parse_offset(request.args.get('offset'))
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    if status and status not in OUTBOX_STATUSES:
+        return jsonify({'error': f"status must be one of: {', '.join(OUTBOX_STATUSES)}"}), 400
+    
+    query = OutboxMessage.query
+    if status:
+        query = query.filter_by(status=status)
+    if campaign:
+        query = query.filter_by(campaign=campaign)
+    messages = query.order_by(OutboxMessage.id).offset(offset).limit(limit + 1).all()
+    
+    return jsonify({
+        'messages': [message.to_dict() for message in messages[:limit]],
+        'next_offset': offset + limit if len(messages) > limit else None
+    }), 200
@@ -0,0 +1,209 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from src.models import db, Guest, Table, SeatAssignment, SeatingConstraint, Job
+from src.services.admin_auth import admin_required
+from src.services.seating import MAX_ITERATIONS, plan, submit_solve
+from src.services.seating_solver import CONSTRAINT_KINDS, SOFT_KINDS
+from datetime import datetime
+
+seating_bp = Blueprint('seating', __name__)
+
+def _positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+@seating_bp.route('', methods=['GET'])
+@admin_required
+def get_plan():
+    """Get the seating plan: tables with seated guests, and unseated confirmed guests"""
+    return jsonify(plan()), 200
+
+@seating_bp.route('/tables', methods=['GET'])
+@admin_required
+def get_tables():
+    """Get all tables"""
+    tables = Table.query.order_by(Table.id).all()
+    return jsonify([table.to_dict() for table in tables]), 200
+
+@seating_bp.route('/tables', methods=['POST'])
+@admin_required
+def create_table():
+    """Create a table"""
+    data = request.get_json()
+    
+    if not data or not data.get('name') or not _positive_int(data.get('capacity')):
+        return jsonify({'error': 'Name and a positive integer capacity are required'}), 400
+    
+    table = Table(name=data['name'], capacity=data['capacity'], notes=data.get('notes'))
+    db.session.add(table)
+    db.session.commit()
+    
+    return jsonify(table.to_dict()), 201
+
+@seating_bp.route('/tables/<int:table_id>', methods=['PUT'])
+@admin_required
+def update_table(table_id):
+    """Update a table"""
+    table = Table.query.get(table_id)
+    
+    if not table:
+        return jsonify({'error': 'Table not found'}), 404
+    
+    data = request.get_json() or {}
+    
+    if 'name' in data:
+        table.name = data['name']
+    if 'capacity' in data:
+        if not _positive_int(data['capacity']):
+            return jsonify({'error': 'Capacity must be a positive integer'}), 400
+        table.capacity = data['capacity']
+    if 'notes' in data:
+        table.notes = data['notes']
+    
+    table.updated_at = datetime.utcnow()
+    db.session.commit()
+    
+    return jsonify(table.to_dict()), 200
+
+@seating_bp.route('/tables/<int:table_id>', methods=['DELETE'])
+@admin_required
+def delete_table(table_id):
+    """Delete a table; its guests become unseated"""
+    table = Table.query.get(table_id)
+    
+    if not table:
+        return jsonify({'error': 'Table not found'}), 404
+    
+    db.session.delete(table)
+    db.session.commit()
+    
+    return jsonify({'message': 'Table deleted successfully'}), 200
+
+@seating_bp.route('/constraints', methods=['GET'])
+@admin_required
+def get_constraints():
+    """Get all seating constraints"""
+    constraints = SeatingConstraint.query.order_by(SeatingConstraint.id).all()
+    return jsonify([constraint.to_dict() for constraint in constraints]), 200
+
+@seating_bp.route('/constraints', methods=['POST'])
+@admin_required
+def create_constraint():
+    """Create a constraint between two guests.
+    
+    kind is together or apart (hard), or prefer or avoid (soft, scored
+    by weight).
+    """
+    data = request.get_json() or {}
+    kind = data.get('kind')
+    guest_id = data.get('guest_id')
+    other_guest_id = data.get('other_guest_id')
+    
+    if kind not in CONSTRAINT_KINDS:
+        return jsonify({'error': f"kind must be one of: {', '.join(CONSTRAINT_KINDS)}"}), 400
+    if not _positive_int(guest_id) or not _positive_int(other_guest_id) or guest_id == other_guest_id:
+        return jsonify({'error': 'guest_id and other_guest_id must be two different guests'}), 400
+    if Guest.query.filter(Guest.id.in_([guest_id, other_guest_id])).count() != 2:
+        return jsonify({'error': 'Guest not found'}), 404
+    
+    weight = data.get('weight', 1.0)
+    if kind in SOFT_KINDS and (not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight <= 0):
+        return jsonify({'error': 'weight must be a positive number'}), 400
+    
+    # Stored in one direction so a pair has one row per kind
+    guest_id, other_guest_id = sorted((guest_id, other_guest_id))
+    if SeatingConstraint.query.filter_by(kind=kind, guest_id=guest_id, other_guest_id=other_guest_id).first():
+        return jsonify({'error': 'Constraint already exists'}), 400
+    
+    constraint = SeatingConstraint(
+        kind=kind, guest_id=guest_id, other_guest_id=other_guest_id,
+        weight=float(weight) if kind in SOFT_KINDS else 1.0
+    )
+    db.session.add(constraint)
+    db.session.commit()
+    
+    return jsonify(constraint.to_dict()), 201
+
+@seating_bp.route('/constraints/<int:constraint_id>', methods=['DELETE'])
+@admin_required
+def delete_constraint(constraint_id):
+    """Delete a seating constraint"""
+    constraint = SeatingConstraint.query.get(constraint_id)
+    
+    if not constraint:
+        return jsonify({'error': 'Constraint not found'}), 404
+    
+    db.session.delete(constraint)
+    db.session.commit()
+    
+    return jsonify({'message': 'Constraint deleted successfully'}), 200
+
+@seating_bp.route('/assignments/<int:guest_id>', methods=['PUT'])
+@admin_required
+def assign_guest(guest_id):
+    """Seat a confirmed guest at a table by hand; pinned (default) keeps the solver from moving them"""
+    guest = Guest.query.get(guest_id)
+    
+    if not guest:
+        return jsonify({'error': 'Guest not found'}), 404
+    if guest.rsvp_status != 'confirmed':
+        return jsonify({'error': 'Only confirmed guests can be seated'}), 400
+    
+    data = request.get_json() or {}
+    table = Table.query.get(data.get('table_id')) if _positive_int(data.get('table_id')) else None
+    if not table:
+        return jsonify({'error': 'Table not found'}), 404
+    
+    seats = guest.number_of_guests or 1
+    seated = db.session.query(db.func.coalesce(db.func.sum(SeatAssignment.seats), 0)).filter(
+        SeatAssignment.table_id == table.id, SeatAssignment.guest_id != guest.id
+    ).scalar()
+    if seated + seats > table.capacity:
+        return jsonify({'error': 'Table is full'}), 400
+    
+    assignment = guest.seat_assignment or SeatAssignment(guest_id=guest.id)
+    assignment.table_id = table.id
+    assignment.seats = seats
+    assignment.pinned = bool(data.get('pinned', True))
+    assignment.assigned_at = datetime.utcnow()
+    db.session.add(assignment)
+    db.session.commit()
+    
+    return jsonify(assignment.to_dict()), 200
+
+@seating_bp.route('/assignments/<int:guest_id>', methods=['DELETE'])
+@admin_required
+def unassign_guest(guest_id):
+    """Remove a guest's seat"""
+    assignment = SeatAssignment.query.filter_by(guest_id=guest_id).first()
+    
+    if not assignment:
+        return jsonify({'error': 'Assignment not found'}), 404
+    
+    db.session.delete(assignment)
+    db.session.commit()
+    
+    return jsonify({'message': 'Guest unseated'}), 200
+
+@seating_bp.route('/solve', methods=['POST'])
+@admin_required
+def solve_seating():
+    """Queue a seating solve as a background job (admin only).
+    
+    incremental=true starts from the current plan and moves as few guests
+    as possible; otherwise every unpinned guest is re-seated. Poll
+    GET /api/jobs/<id> for the outcome.
+    """
+    data = request.get_json(silent=True) or {}
+    iterations = data.get('iterations')
+    seed = data.get('seed')
+    
+    if iterations is not None and (not _positive_int(iterations) or iterations > MAX_ITERATIONS):
+        return jsonify({'error': f'iterations must be an integer between 1 and {MAX_ITERATIONS}'}), 400
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+        return jsonify({'error': 'seed must be a non-negative integer'}), 400
+    
+    job_id = submit_solve(
+        iterations=iterations, seed=seed, incremental=bool(data.get('incremental', False)),
+        user_id=int(get_jwt_identity())
+    )
+    return jsonify(Job.query.get(job_id).to_dict()), 202, {'Location': f'/api/jobs/{job_id}'}
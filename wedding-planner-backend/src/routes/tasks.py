@@ -1,26 +1,28 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models import db, Task, User
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select
+from src.models import db, Task
+from src.services.admin_auth import admin_required
+from src.services.serialization import serializer_for
+from src.services.task_batch import BatchError, batch_create, batch_update, batch_delete
 from datetime import datetime
 
 tasks_bp = Blueprint('tasks', __name__)
 
 @tasks_bp.route('', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_tasks():
     """Get all tasks for the current user"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     # Filtering options
     status = request.args.get('status')
     priority = request.args.get('priority')
     category = request.args.get('category')
     
-    query = Task.query.filter_by(user_id=user_id)
+    # Read-only: select plain column tuples instead of hydrating Task objects
+    serializer = serializer_for(Task)
+    query = select(*serializer.select_columns()).filter_by(user_id=user_id)
     
     if status:
         query = query.filter_by(status=status)
@@ -29,19 +31,15 @@ def get_tasks():
     if category:
         query = query.filter_by(category=category)
     
-    tasks = query.order_by(Task.due_date.asc(), Task.priority.desc()).all()
+    rows = db.session.execute(query.order_by(Task.due_date.asc(), Task.priority.desc())).all()
     
-    return jsonify([task.to_dict() for task in tasks]), 200
+    return jsonify(serializer.rows(rows)), 200
 
 @tasks_bp.route('', methods=['POST'])
-@jwt_required()
+@admin_required
 def create_task():
     """Create a new task"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     data = request.get_json()
     
@@ -73,15 +71,55 @@ def create_task():
     
     return jsonify(task.to_dict()), 201
 
+def _batch_items(key):
+    """The list from a JSON array body or from body[key]"""
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    return data
+
+@tasks_bp.route('/batch', methods=['POST'])
+@admin_required
+def create_tasks_batch():
+    """Create many tasks in one transaction (JSON array or {"tasks": [...]})"""
+    user_id = get_jwt_identity()
+    try:
+        report = batch_create(user_id, _batch_items('tasks'))
+    except BatchError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(report), 201
+
+@tasks_bp.route('/batch', methods=['PATCH'])
+@admin_required
+def update_tasks_batch():
+    """Update many tasks in one transaction.
+    
+    Takes a JSON array (or {"tasks": [...]}) of objects with an id and the
+    fields to change, as for PUT /api/tasks/<id>. Returns a result per item.
+    """
+    user_id = get_jwt_identity()
+    try:
+        report = batch_update(user_id, _batch_items('tasks'))
+    except BatchError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(report), 200
+
+@tasks_bp.route('/batch', methods=['DELETE'])
+@admin_required
+def delete_tasks_batch():
+    """Delete many tasks in one transaction (JSON array of ids or {"ids": [...]})"""
+    user_id = get_jwt_identity()
+    try:
+        report = batch_delete(user_id, _batch_items('ids'))
+    except BatchError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(report), 200
+
 @tasks_bp.route('/<int:task_id>', methods=['PUT'])
-@jwt_required()
+@admin_required
 def update_task(task_id):
     """Update a task"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     task = Task.query.filter_by(id=task_id, user_id=user_id).first()
     
@@ -125,14 +163,10 @@ def update_task(task_id):
     return jsonify(task.to_dict()), 200
 
 @tasks_bp.route('/<int:task_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required
 def delete_task(task_id):
     """Delete a task"""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
     
     task = Task.query.filter_by(id=task_id, user_id=user_id).first()
     
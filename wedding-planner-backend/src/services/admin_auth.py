@@ -0,0 +1,39 @@
+from functools import wraps
+from flask import jsonify
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, get_jwt_identity
+from src.services.user_cache import user_cache
+
+def admin_claims(user):
+    """Additional JWT claims for an admin access token"""
+    return {'role': user.role}
+
+def guest_claims():
+    """Additional JWT claims for a guest access token"""
+    return {'role': 'guest'}
+
+def current_admin_role():
+    """Role of the admin behind the verified JWT, or None"""
+    if get_jwt().get('role') == 'guest':
+        return None
+    
+    identity = get_jwt_identity()
+    try:
+        user_id = int(identity)
+    except (TypeError, ValueError):
+        # Guest tokens issued before role claims carry "guest_<id>"
+        return None
+    return user_cache.get_role(user_id)
+
+def admin_required(fn):
+    """Require a JWT belonging to an existing admin user.
+    
+    Replaces @jwt_required() plus a User lookup in the handler; the
+    existence check is served from user_cache on repeat requests.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        if current_admin_role() is None:
+            return jsonify({'error': 'User not found'}), 404
+        return fn(*args, **kwargs)
+    return wrapper
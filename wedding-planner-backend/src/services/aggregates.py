@@ -0,0 +1,234 @@
+from src.models import db, Guest, Task, Cost
+from src.services.guest_stats import read_guest_groups, rebuild_guest_stats
+from src.services.dietary import rebuild_dietary_tags
+from src.services.jobs import job_handler
+from sqlalchemy import func, case, and_
+from datetime import datetime, timedelta
+
+RSVP_STATUSES = ('confirmed', 'pending', 'declined')
+ATTENDANCE_TYPES = ('ceremony', 'reception', 'both')
+COST_STATUSES = ('planned', 'paid', 'pending')
+
+def count_where(*conditions):
+    """COUNT of rows matching all conditions, as a SUM(CASE ...) expression"""
+    return func.sum(case((and_(*conditions), 1), else_=0))
+
+def sum_where(column, *conditions):
+    """SUM of column over rows matching all conditions"""
+    return func.sum(case((and_(*conditions), column), else_=0))
+
+def guest_breakdown(include_recent=False, recent_days=7):
+    """Guest counts grouped by RSVP status and attendance type.
+    
+    Reads the materialized guest_stats rows rather than scanning guests;
+    every guest analytics endpoint is derived from the returned dict.
+    """
+    breakdown = {'groups': read_guest_groups()}
+    
+    if include_recent:
+        since = datetime.utcnow() - timedelta(days=recent_days)
+        breakdown['recent_registrations'] = Guest.query.filter(Guest.registered_at >= since).count()
+    
+    return breakdown
+
+def _count(groups, rsvp_status=None, attendance_type=None):
+    total = 0
+    for (status, atype), (count, _) in groups.items():
+        if rsvp_status is not None and status != rsvp_status:
+            continue
+        if attendance_type is not None and atype != attendance_type:
+            continue
+        total += count
+    return total
+
+def overview_stats(breakdown=None):
+    """Guest totals for /api/analytics/overview"""
+    breakdown = breakdown if breakdown is not None else guest_breakdown()
+    groups = breakdown['groups']
+    
+    total_attendance = sum(
+        attendance for (status, _), (_, attendance) in groups.items() if status == 'confirmed'
+    )
+    
+    return {
+        'total': _count(groups),
+        'confirmed': _count(groups, 'confirmed'),
+        'pending': _count(groups, 'pending'),
+        'declined': _count(groups, 'declined'),
+        'total_attendance': total_attendance,
+        'attendance_breakdown': {
+            'ceremony_only': _count(groups, 'confirmed', 'ceremony'),
+            'reception_only': _count(groups, 'confirmed', 'reception'),
+            'both_events': _count(groups, 'confirmed', 'both')
+        }
+    }
+
+def attendance_stats(breakdown=None):
+    """RSVP and attendance breakdowns for /api/analytics/attendance"""
+    breakdown = breakdown if breakdown is not None else guest_breakdown(include_recent=True)
+    
+    rsvp_breakdown = {}
+    attendance_breakdown = {}
+    for (status, atype), (count, _) in breakdown['groups'].items():
+        rsvp_breakdown[status] = rsvp_breakdown.get(status, 0) + count
+        if status == 'confirmed':
+            attendance_breakdown[atype] = attendance_breakdown.get(atype, 0) + count
+    
+    return {
+        'rsvp_breakdown': rsvp_breakdown,
+        'attendance_breakdown': attendance_breakdown,
+        'recent_registrations': breakdown['recent_registrations']
+    }
+
+def dietary_summary(rsvp_status=None):
+    """Counts of guests with restrictions, allergies and special requests in one query"""
+    def filled(column):
+        return and_(column.isnot(None), column != '')
+    
+    query = db.session.query(
+        count_where(filled(Guest.dietary_restrictions)),
+        count_where(filled(Guest.allergies)),
+        count_where(filled(Guest.special_requests))
+    )
+    if rsvp_status:
+        query = query.filter(Guest.rsvp_status == rsvp_status)
+    restrictions, allergies, special_requests = query.one()
+    
+    return {
+        'guests_with_restrictions': int(restrictions or 0),
+        'guests_with_allergies': int(allergies or 0),
+        'guests_with_special_requests': int(special_requests or 0)
+    }
+
+def cost_stats(user_id):
+    """Cost totals by status and a category x status pivot from one GROUP BY scan"""
+    rows = db.session.query(
+        Cost.category,
+        Cost.status,
+        func.sum(Cost.amount)
+    ).filter_by(user_id=user_id).group_by(Cost.category, Cost.status).all()
+    
+    totals = {status: 0.0 for status in COST_STATUSES}
+    by_category = {}
+    pivot = {}
+    for category, status, amount in rows:
+        amount = float(amount or 0)
+        if status in totals:
+            totals[status] += amount
+        by_category[category] = by_category.get(category, 0.0) + amount
+        
+        cell = pivot.setdefault(category, {status: 0.0 for status in COST_STATUSES})
+        cell[status] = cell.get(status, 0.0) + amount
+    
+    for category, cell in pivot.items():
+        cell['total'] = by_category[category]
+    
+    return {
+        'total_planned': totals['planned'],
+        'total_paid': totals['paid'],
+        'total_pending': totals['pending'],
+        'total': sum(by_category.values()),
+        'by_category': by_category,
+        'pivot': pivot
+    }
+
+def _variance(estimated, actual):
+    """Actual minus estimated, over tasks that have both figures"""
+    return {
+        'estimated': estimated,
+        'actual': actual,
+        'variance': actual - estimated,
+        'variance_pct': ((actual - estimated) / estimated * 100) if estimated else None
+    }
+
+def task_stats(user_id):
+    """Task counts and estimated-vs-actual cost variance, per category, from one GROUP BY"""
+    costed = and_(Task.estimated_cost.isnot(None), Task.actual_cost.isnot(None))
+    rows = db.session.query(
+        Task.category,
+        func.count(Task.id),
+        count_where(Task.status == 'completed'),
+        count_where(Task.status == 'in_progress'),
+        func.sum(Task.estimated_cost),
+        func.sum(Task.actual_cost),
+        sum_where(Task.estimated_cost, costed),
+        sum_where(Task.actual_cost, costed),
+        count_where(costed, Task.actual_cost > Task.estimated_cost)
+    ).filter(Task.user_id == user_id).group_by(Task.category).all()
+    
+    total = completed = in_progress = over_budget = 0
+    estimated_total = actual_total = costed_estimated = costed_actual = 0.0
+    by_category = {}
+    for category, count, done, active, estimated, actual, c_estimated, c_actual, over in rows:
+        done, active, over = int(done or 0), int(active or 0), int(over or 0)
+        c_estimated, c_actual = float(c_estimated or 0), float(c_actual or 0)
+        total += count
+        completed += done
+        in_progress += active
+        over_budget += over
+        estimated_total += float(estimated or 0)
+        actual_total += float(actual or 0)
+        costed_estimated += c_estimated
+        costed_actual += c_actual
+        by_category[category or 'uncategorized'] = dict(
+            _variance(c_estimated, c_actual),
+            tasks=count, completed=done, over_budget=over,
+            estimated_total=float(estimated or 0), actual_total=float(actual or 0)
+        )
+    
+    return {
+        'total': total,
+        'completed': completed,
+        'in_progress': in_progress,
+        'completion_rate': (completed / total * 100) if total > 0 else 0,
+        'estimated_total': estimated_total,
+        'actual_total': actual_total,
+        'over_budget': over_budget,
+        'variance': _variance(costed_estimated, costed_actual),
+        'by_category': by_category
+    }
+
+SERIES_BUCKETS = ('day', 'week', 'month')
+
+def _bucket_start(column, bucket):
+    """First day of the day/week/month bucket containing a date column"""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        if bucket == 'month':
+            return func.strftime('%Y-%m-01', column)
+        if bucket == 'week':
+            # Monday of the ISO week: step back to Sunday, then forward a day
+            return func.date(column, '-6 days', 'weekday 1')
+        return func.date(column)
+    return func.to_char(func.date_trunc(bucket, column), 'YYYY-MM-DD')
+
+def spending_series(user_id, bucket='month', status=None, category=None):
+    """Cost amounts summed per payment_date bucket, with a running total"""
+    if bucket not in SERIES_BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(SERIES_BUCKETS)}")
+    
+    start = _bucket_start(Cost.payment_date, bucket).label('bucket')
+    query = db.session.query(
+        start,
+        func.sum(Cost.amount),
+        func.count(Cost.id)
+    ).filter(Cost.user_id == user_id, Cost.payment_date.isnot(None))
+    if status:
+        query = query.filter(Cost.status == status)
+    if category:
+        query = query.filter(Cost.category == category)
+    
+    series = []
+    cumulative = 0.0
+    for period, amount, count in query.group_by(start).order_by(start).all():
+        amount = float(amount or 0)
+        cumulative += amount
+        series.append({'bucket': period, 'amount': amount, 'items': count, 'cumulative': cumulative})
+    return series
+
+@job_handler('analytics.rebuild')
+def rebuild_analytics(params, progress):
+    """Recount the materialized guest statistics and re-parse every dietary tag"""
+    groups = rebuild_guest_stats()
+    progress(50, 100, 'Guest statistics rebuilt')
+    tags = rebuild_dietary_tags()
+    return {'guest_groups': len(groups), 'dietary_tags': tags}
@@ -0,0 +1,107 @@
+import json
+import os
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.models import Task, Cost
+from src.services import shared_store
+from src.services.aggregates import cost_stats, task_stats
+from src.services.content_cache import LocalBackend, SharedBackend
+
+ALL_USERS = '*'
+# Default TTL of a process-local cache when other server processes can write:
+# their invalidations never reach it, so entries may be this many seconds stale
+MULTI_PROCESS_LOCAL_TTL = 5
+
+class BudgetCache:
+    """Per-user budget rollups, dropped when that user's costs or tasks commit"""
+    
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def rollup(self, user_id):
+        """{'costs': cost_stats, 'tasks': task_stats} for the user, cached"""
+        name = f'rollup:{user_id}'
+        raw = self.backend.get(name)
+        if raw is not None:
+            self.hits += 1
+            return json.loads(raw)
+        
+        self.misses += 1
+        data = {'costs': cost_stats(user_id), 'tasks': task_stats(user_id)}
+        self.backend.set(name, json.dumps(data).encode('utf-8'))
+        return data
+    
+    def invalidate(self, user_ids):
+        if ALL_USERS in user_ids:
+            self.backend.clear()
+        else:
+            self.backend.delete(*[f'rollup:{user_id}' for user_id in user_ids])
+        self.invalidations += 1
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0
+        }
+
+budget_cache = BudgetCache(LocalBackend(ttl=300, maxsize=256))
+
+def configure_budget_cache():
+    """Select the backend from BUDGET_CACHE_BACKEND (local or shared) and BUDGET_CACHE_TTL.
+    
+    The local backend is only invalidated by writes in its own process, so
+    unless WEB_CONCURRENCY is 1 its TTL defaults to MULTI_PROCESS_LOCAL_TTL.
+    """
+    if os.getenv('BUDGET_CACHE_BACKEND', 'local') == 'shared':
+        budget_cache.backend = SharedBackend(
+            shared_store.connect(os.getenv('SHARED_STORE_URL')),
+            ttl=int(os.getenv('BUDGET_CACHE_TTL', 300)), prefix='wedding:budget:'
+        )
+    else:
+        # gunicorn.conf.py runs several workers when WEB_CONCURRENCY is unset
+        single_process = os.getenv('WEB_CONCURRENCY') == '1'
+        ttl = int(os.getenv('BUDGET_CACHE_TTL', 300 if single_process else MULTI_PROCESS_LOCAL_TTL))
+        budget_cache.backend = LocalBackend(ttl=ttl, maxsize=256)
+
+def _mark(session, user_ids):
+    session.info.setdefault('budget_cache_dirty', set()).update(user_ids)
+
+def _after_flush(session, flush_context):
+    user_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Task, Cost)):
+            user_ids.add(obj.user_id)
+    if user_ids:
+        _mark(session, user_ids)
+
+def _do_orm_execute(orm_execute_state):
+    # Set-based UPDATE/DELETE/INSERT (e.g. the task batch endpoints) name no
+    # single object, so they drop every cached rollup
+    if orm_execute_state.is_select:
+        return
+    if any(mapper.class_ in (Task, Cost) for mapper in orm_execute_state.all_mappers):
+        _mark(orm_execute_state.session, {ALL_USERS})
+
+def _after_commit(session):
+    user_ids = session.info.pop('budget_cache_dirty', None)
+    if user_ids:
+        budget_cache.invalidate(user_ids)
+
+def _after_rollback(session):
+    session.info.pop('budget_cache_dirty', None)
+
+def register_budget_cache_listeners():
+    """Invalidate cached rollups once a transaction touching Task or Cost commits"""
+    if event.contains(Session, 'after_commit', _after_commit):
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'do_orm_execute', _do_orm_execute)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from src.models import Content
+from src.services import shared_store
+
+PUBLIC_LIST = 'list:public'
+
+def key_entry(key):
+    return f'key:{key}'
+
+class LocalBackend:
+    """Per-process dict of name -> bytes with TTL and an entry limit"""
+    
+    def __init__(self, ttl=30, maxsize=512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, name):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            self._entries.move_to_end(name)
+            return entry[0]
+    
+    def set(self, name, value):
+        with self._lock:
+            self._entries[name] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def delete(self, *names):
+        with self._lock:
+            for name in names:
+                self._entries.pop(name, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SharedBackend:
+    """Entries in a Redis-style store so every worker sees one invalidation"""
+    
+    def __init__(self, client, ttl=300, prefix='wedding:content:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+    
+    def get(self, name):
+        return self.client.get(self.prefix + name)
+    
+    def set(self, name, value):
+        self.client.set(self.prefix + name, value, ex=self.ttl)
+    
+    def delete(self, *names):
+        if names:
+            self.client.delete(*[self.prefix + name for name in names])
+    
+    def clear(self):
+        names = self.client.keys(self.prefix + '*')
+        if names:
+            self.client.delete(*names)
+
+class ContentCache:
+    """Read-through cache of pre-serialized public content responses.
+    
+    Each entry is the JSON body plus its ETag and Last-Modified, so a hit
+    needs neither a query nor to_dict()/jsonify.
+    """
+    
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    def get(self, name):
+        raw = self.backend.get(name)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, last_modified, body = raw.split(b'\n', 2)
+        return {'etag': etag.decode('ascii'), 'last_modified': last_modified.decode('ascii') or None, 'body': body}
+    
+    def put(self, name, etag, last_modified, body):
+        stamp = last_modified.isoformat() if last_modified else ''
+        self.backend.set(name, b'\n'.join([etag.encode('ascii'), stamp.encode('ascii'), body]))
+    
+    def invalidate(self, names):
+        if names:
+            self.backend.delete(*names)
+            self.invalidations += 1
+    
+    def clear(self):
+        self.backend.clear()
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0
+        }
+
+content_cache = ContentCache(LocalBackend())
+
+def configure_content_cache():
+    """Select the backend from CONTENT_CACHE_BACKEND (local or shared)"""
+    ttl = int(os.getenv('CONTENT_CACHE_TTL', 30))
+    if os.getenv('CONTENT_CACHE_BACKEND', 'local') == 'shared':
+        content_cache.backend = SharedBackend(shared_store.connect(os.getenv('SHARED_STORE_URL')), ttl=ttl)
+    else:
+        content_cache.backend = LocalBackend(ttl=ttl)
+
+def _after_flush(session, flush_context):
+    names = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Content):
+            names.add(key_entry(obj.key))
+            # A renamed key must drop the entry under its old name too
+            for old_key in inspect(obj).attrs['key'].history.deleted:
+                names.add(key_entry(old_key))
+    if names:
+        names.add(PUBLIC_LIST)
+        session.info.setdefault('content_cache_dirty', set()).update(names)
+
+def _after_commit(session):
+    names = session.info.pop('content_cache_dirty', None)
+    if names:
+        content_cache.invalidate(sorted(names))
+
+def _after_rollback(session):
+    session.info.pop('content_cache_dirty', None)
+
+def register_content_cache_listeners():
+    """Invalidate cached content once a transaction touching Content commits"""
+    if event.contains(Session, 'after_commit', _after_commit):
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
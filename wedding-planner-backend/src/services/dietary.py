@@ -0,0 +1,158 @@
+import re
+from sqlalchemy import event, inspect, func
+from sqlalchemy.orm import Session
+from src.models import db, Guest, GuestDietaryTag
+
+RESTRICTION = 'restriction'
+ALLERGY = 'allergy'
+
+# Free-text source column for each tag kind
+SOURCES = (('dietary_restrictions', RESTRICTION), ('allergies', ALLERGY))
+
+# Separators between items in the free text
+_SPLIT = re.compile(r'[,;/\n+&]|\band\b|\bor\b', re.IGNORECASE)
+
+# Leading/trailing filler that carries no meaning on its own
+_FILLER = re.compile(
+    r'^(?:i am |i\'m |we are |strictly |severe |mild |very |allergic to |allergy to |intolerant to |no |non[- ])+'
+    r'|(?: allergy| allergies| intolerance| intolerant| only| diet| please)+$',
+    re.IGNORECASE
+)
+
+# Spelling variants -> canonical tag
+CANONICAL = {
+    'veggie': 'vegetarian', 'vegetarian': 'vegetarian', 'vego': 'vegetarian',
+    'vegan': 'vegan', 'plant based': 'vegan', 'plant-based': 'vegan',
+    'pescatarian': 'pescatarian', 'pescetarian': 'pescatarian',
+    'gluten': 'gluten-free', 'gluten free': 'gluten-free', 'gluten-free': 'gluten-free', 'gf': 'gluten-free',
+    'celiac': 'gluten-free', 'coeliac': 'gluten-free', 'wheat': 'gluten-free',
+    'dairy': 'dairy-free', 'dairy free': 'dairy-free', 'dairy-free': 'dairy-free', 'lactose': 'dairy-free',
+    'lactose free': 'dairy-free', 'lactose-free': 'dairy-free', 'milk': 'dairy-free',
+    'halal': 'halal', 'kosher': 'kosher',
+    'pork': 'no pork', 'beef': 'no beef',
+    'nut': 'tree nuts', 'nuts': 'tree nuts', 'tree nut': 'tree nuts', 'tree nuts': 'tree nuts',
+    'peanut': 'peanuts', 'peanuts': 'peanuts',
+    'shellfish': 'shellfish', 'shrimp': 'shellfish', 'prawns': 'shellfish', 'crustaceans': 'shellfish',
+    'fish': 'fish', 'egg': 'eggs', 'eggs': 'eggs', 'soy': 'soy', 'soya': 'soy',
+    'sesame': 'sesame', 'mustard': 'mustard', 'celery': 'celery', 'sulphites': 'sulphites', 'sulfites': 'sulphites',
+}
+
+# In a restriction field "no dairy"/"dairy" means dairy-free; as an allergy it is the allergen itself
+ALLERGENS = {
+    'dairy-free': 'dairy', 'gluten-free': 'gluten', 'no pork': 'pork', 'no beef': 'beef'
+}
+
+_IGNORED = {'', 'none', 'n/a', 'na', 'nothing', 'no', '-', 'nil'}
+
+def parse_tags(text, kind=RESTRICTION):
+    """Tokenize free text into sorted canonical tags"""
+    if not text:
+        return []
+    
+    tags = set()
+    for token in _SPLIT.split(text):
+        token = ' '.join(token.strip().lower().strip('.!').split())
+        if token in _IGNORED:
+            continue
+        token = _FILLER.sub('', token).strip()
+        if token in _IGNORED:
+            continue
+        
+        tag = CANONICAL.get(token, token)
+        if kind == ALLERGY:
+            tag = ALLERGENS.get(tag, tag)
+        tags.add(tag[:50])
+    
+    return sorted(tags)
+
+def build_tags(guest):
+    """GuestDietaryTag rows for a guest's current free text, reusing unchanged rows"""
+    # Keeping existing rows matters: delete-orphan runs after inserts in a
+    # flush, so re-adding the same (kind, tag) would hit the unique constraint
+    existing = {(row.kind, row.tag): row for row in guest.dietary_tags} if guest.id else {}
+    return [
+        existing.get((kind, tag)) or GuestDietaryTag(kind=kind, tag=tag)
+        for field, kind in SOURCES
+        for tag in parse_tags(getattr(guest, field), kind)
+    ]
+
+def tag_rows(guest_id, values):
+    """Plain dicts for Core inserts of a guest's tags"""
+    return [
+        {'guest_id': guest_id, 'kind': kind, 'tag': tag}
+        for field, kind in SOURCES
+        for tag in parse_tags(values.get(field), kind)
+    ]
+
+def _before_flush(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Guest) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        changed = any(state.attrs[field].history.has_changes() for field, _ in SOURCES)
+        if state.pending or changed:
+            obj.dietary_tags = build_tags(obj)
+
+def register_dietary_listeners():
+    """Re-tag guests whose dietary text changes in an ORM flush"""
+    if event.contains(Session, 'before_flush', _before_flush):
+        return
+    event.listen(Session, 'before_flush', _before_flush)
+
+def rebuild_dietary_tags(batch_size=1000):
+    """Re-parse every guest's dietary text into guest_dietary_tags"""
+    table = GuestDietaryTag.__table__
+    db.session.execute(table.delete())
+    
+    rows = []
+    total = 0
+    query = db.session.query(Guest.id, Guest.dietary_restrictions, Guest.allergies).filter(
+        (Guest.dietary_restrictions.isnot(None) & (Guest.dietary_restrictions != '')) |
+        (Guest.allergies.isnot(None) & (Guest.allergies != ''))
+    )
+    for guest_id, dietary_restrictions, allergies in query.yield_per(batch_size):
+        rows.extend(tag_rows(guest_id, {'dietary_restrictions': dietary_restrictions, 'allergies': allergies}))
+        if len(rows) >= batch_size:
+            db.session.execute(table.insert(), rows)
+            total += len(rows)
+            rows = []
+    if rows:
+        db.session.execute(table.insert(), rows)
+        total += len(rows)
+    
+    db.session.commit()
+    return total
+
+def ensure_dietary_tags():
+    """Tag existing guests on first boot after the table was added"""
+    if GuestDietaryTag.query.first() is not None:
+        return
+    has_text = Guest.query.filter(
+        (Guest.dietary_restrictions.isnot(None) & (Guest.dietary_restrictions != '')) |
+        (Guest.allergies.isnot(None) & (Guest.allergies != ''))
+    ).first()
+    if has_text is not None:
+        rebuild_dietary_tags()
+
+def tag_counts(rsvp_status=None):
+    """Per-tag guest and head counts from one indexed GROUP BY.
+    
+    'guests' counts registrations; 'people' weights each by number_of_guests.
+    """
+    query = db.session.query(
+        GuestDietaryTag.kind,
+        GuestDietaryTag.tag,
+        func.count(Guest.id),
+        func.sum(func.coalesce(Guest.number_of_guests, 1))
+    ).join(Guest, Guest.id == GuestDietaryTag.guest_id)
+    
+    if rsvp_status:
+        query = query.filter(Guest.rsvp_status == rsvp_status)
+    
+    counts = {RESTRICTION: [], ALLERGY: []}
+    for kind, tag, guests, people in query.group_by(GuestDietaryTag.kind, GuestDietaryTag.tag).all():
+        counts.setdefault(kind, []).append({'tag': tag, 'guests': guests, 'people': int(people or 0)})
+    
+    for entries in counts.values():
+        entries.sort(key=lambda entry: (-entry['people'], entry['tag']))
+    return counts
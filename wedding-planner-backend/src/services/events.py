@@ -0,0 +1,273 @@
+import collections
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from src.models import Guest, Task, Cost
+from src.services import shared_store
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'wedding:events'
+SEQUENCE_KEY = 'wedding:events:seq'
+# Recent events kept per process for Last-Event-ID replay
+HISTORY_SIZE = 1000
+# Events a slow stream may fall behind by before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 500
+
+# Seconds a stream token may be used to open GET /api/events
+STREAM_TOKEN_SECONDS = 60
+# Open streams per process; each holds a gthread request thread, so keep it
+# below GUNICORN_THREADS or dashboards starve ordinary requests
+MAX_STREAMS = 2
+
+# Guest attributes an RSVP-changed event reports
+GUEST_FIELDS = ('rsvp_status', 'attendance_type', 'number_of_guests')
+
+class Subscription:
+    """One stream's queue of events; overflowing it asks the client to resync"""
+    
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.queue = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+    
+    def wants(self, item):
+        owner = item['data'].get('user_id')
+        return owner is None or str(owner) == str(self.user_id)
+    
+    def put(self, item):
+        if not self.wants(item):
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.overflowed = True
+    
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class EventBus:
+    """In-process fan-out of committed changes to the open event streams.
+    
+    Every event gets an increasing id; with a shared store the ids come
+    from one INCR counter and events travel over its pub/sub channel, so
+    a stream sees the commits of every worker process.
+    """
+    
+    def __init__(self):
+        self.client = None
+        self.published = 0
+        # Seeded from the clock so ids keep increasing across restarts
+        self._ids = itertools.count(int(time.time() * 1000))
+        self._subscribers = set()
+        self._history = collections.deque(maxlen=HISTORY_SIZE)
+        self._lock = threading.Lock()
+        self._relay = None
+    
+    def use_shared(self, client):
+        self.client = client
+        if self._relay is None:
+            self._relay = threading.Thread(target=self._listen, name='event-relay', daemon=True)
+            self._relay.start()
+    
+    def use_local(self):
+        self.client = None
+    
+    def publish(self, kind, data):
+        """Send an event to every stream; never raises, commits must not fail on it"""
+        try:
+            if self.client is not None:
+                item = {'id': int(self.client.incr(SEQUENCE_KEY)), 'type': kind, 'data': data}
+                self.client.publish(CHANNEL, json.dumps(item, default=str))
+            else:
+                self.deliver({'id': next(self._ids), 'type': kind, 'data': data})
+            self.published += 1
+        except Exception:
+            logger.exception('Could not publish %s event', kind)
+    
+    def deliver(self, item):
+        with self._lock:
+            self._history.append(item)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(item)
+    
+    def subscribe(self, user_id, last_event_id=None):
+        """Register a stream; returns (subscription, missed events, complete)
+        
+        complete is False when events after last_event_id have already
+        dropped out of the replay history.
+        """
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscribers.add(subscription)
+            history = list(self._history)
+        if last_event_id is None:
+            return subscription, [], True
+        missed = [item for item in history if item['id'] > last_event_id and subscription.wants(item)]
+        complete = bool(history) and history[0]['id'] <= last_event_id + 1 and last_event_id <= history[-1]['id']
+        return subscription, missed, complete
+    
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+    
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+    
+    def _listen(self):
+        while True:
+            client = self.client
+            if client is None:
+                time.sleep(1)
+                continue
+            pubsub = None
+            try:
+                pubsub = client.pubsub()
+                pubsub.subscribe(CHANNEL)
+                while self.client is client:
+                    message = pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get('type') == 'message':
+                        self.deliver(json.loads(message['data']))
+            except Exception:
+                logger.exception('Event relay lost its connection; retrying')
+                time.sleep(1)
+            finally:
+                if pubsub is not None:
+                    pubsub.close()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'shared' if self.client is not None else 'local',
+                'subscribers': len(self._subscribers),
+                'published': self.published
+            }
+
+event_bus = EventBus()
+
+def configure_events():
+    """Select the transport from EVENTS_BACKEND (local or shared), EVENTS_TOKEN_SECONDS and EVENTS_MAX_STREAMS.
+    
+    With several server processes (WEB_CONCURRENCY unset or above 1) and a
+    redis:// SHARED_STORE_URL the backend defaults to shared, since a local
+    stream only sees commits made by its own process.
+    """
+    global STREAM_TOKEN_SECONDS, MAX_STREAMS
+    STREAM_TOKEN_SECONDS = max(1, int(os.getenv('EVENTS_TOKEN_SECONDS', 60)))
+    threads = int(os.getenv('GUNICORN_THREADS', 4))
+    MAX_STREAMS = max(1, int(os.getenv('EVENTS_MAX_STREAMS', max(1, threads // 2))))
+    
+    url = os.getenv('SHARED_STORE_URL') or ''
+    multi_process = os.getenv('WEB_CONCURRENCY') != '1'
+    default = 'shared' if multi_process and url.startswith(('redis://', 'rediss://')) else 'local'
+    if os.getenv('EVENTS_BACKEND', default) == 'shared':
+        event_bus.use_shared(shared_store.connect(url))
+    else:
+        event_bus.use_local()
+        if multi_process:
+            logger.warning('EVENTS_BACKEND=local with several workers: /api/events streams only see their own worker\'s commits')
+
+def _stream_tokens():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='events-stream')
+
+def issue_stream_token(user_id):
+    """Short-lived token for ?token= on the event stream; returns (token, seconds valid).
+    
+    EventSource cannot send an Authorization header and query strings end
+    up in access logs, so the stream takes this instead of a JWT: it is
+    only good for opening a stream, and only for STREAM_TOKEN_SECONDS.
+    """
+    return _stream_tokens().dumps(str(user_id)), STREAM_TOKEN_SECONDS
+
+def read_stream_token(token):
+    """User id behind a stream token, or None if it is invalid or expired"""
+    try:
+        return _stream_tokens().loads(token, max_age=STREAM_TOKEN_SECONDS)
+    except BadSignature:
+        return None
+
+def _previous(obj, field):
+    history = inspect(obj).attrs[field].history
+    return history.deleted[0] if history.deleted else getattr(obj, field)
+
+def _guest_data(guest, **extra):
+    data = {'id': guest.id, 'first_name': guest.first_name, 'last_name': guest.last_name}
+    data.update({field: getattr(guest, field) for field in GUEST_FIELDS})
+    data.update(extra)
+    return data
+
+def _task_data(task):
+    return {'id': task.id, 'user_id': task.user_id, 'title': task.title}
+
+def _cost_data(cost):
+    amount = float(cost.amount) if cost.amount is not None else None
+    return {'id': cost.id, 'user_id': cost.user_id, 'name': cost.name, 'category': cost.category, 'amount': amount}
+
+def _collect_events(session):
+    events = []
+    for obj in session.new:
+        if isinstance(obj, Guest):
+            events.append(('guest.created', _guest_data(obj)))
+        elif isinstance(obj, Task) and obj.status == 'completed':
+            events.append(('task.completed', _task_data(obj)))
+        elif isinstance(obj, Cost) and obj.status == 'paid':
+            events.append(('cost.paid', _cost_data(obj)))
+    
+    for obj in session.dirty:
+        if obj in session.deleted:
+            continue
+        if isinstance(obj, Guest):
+            previous = {field: _previous(obj, field) for field in GUEST_FIELDS}
+            if any(previous[field] != getattr(obj, field) for field in GUEST_FIELDS):
+                events.append(('guest.rsvp_changed', _guest_data(obj, previous=previous)))
+        elif isinstance(obj, Task):
+            if obj.status == 'completed' and _previous(obj, 'status') != 'completed':
+                events.append(('task.completed', _task_data(obj)))
+        elif isinstance(obj, Cost):
+            if obj.status == 'paid' and _previous(obj, 'status') != 'paid':
+                events.append(('cost.paid', _cost_data(obj)))
+    
+    for obj in session.deleted:
+        if isinstance(obj, Guest):
+            events.append(('guest.deleted', {'id': obj.id, **{field: _previous(obj, field) for field in GUEST_FIELDS}}))
+    return events
+
+def _after_flush(session, flush_context):
+    events = _collect_events(session)
+    if events:
+        session.info.setdefault('events', []).extend(events)
+
+def _after_commit(session):
+    for kind, data in session.info.pop('events', ()):
+        event_bus.publish(kind, data)
+
+def _after_rollback(session):
+    session.info.pop('events', None)
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    # No-op; registered with active_history so previous values are loaded for _previous()
+    pass
+
+def register_event_listeners():
+    """Publish guest, task and cost changes once their transaction commits"""
+    if event.contains(Session, 'after_commit', _after_commit):
+        return
+    
+    for attribute in (Guest.rsvp_status, Guest.attendance_type, Guest.number_of_guests, Task.status, Cost.status):
+        event.listen(attribute, 'set', _load_previous_value, active_history=True)
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
@@ -0,0 +1,64 @@
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from src.models import db
+from src.services.serialization import dumps_line
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# Rows written per chunk handed to the WSGI server
+CHUNK_ROWS = 500
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def stream_rows(statement, batch_size=EXPORT_BATCH_SIZE):
+    """Iterate a column select() through a server-side cursor in fixed batches"""
+    return db.session.execute(statement.execution_options(stream_results=True, yield_per=batch_size))
+
+def iter_csv(rows, fields):
+    """Yield CSV text in chunks: a header line, then CHUNK_ROWS rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    
+    pending = 0
+    for row in rows:
+        writer.writerow(['' if value is None else _plain(value) for value in row])
+        pending += 1
+        if pending >= CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    yield buffer.getvalue()
+
+def iter_ndjson(rows, fields):
+    """Yield one JSON object per line, CHUNK_ROWS lines at a time"""
+    lines = []
+    for row in rows:
+        lines.append(dumps_line(dict(zip(fields, row))))
+        if len(lines) >= CHUNK_ROWS:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def iter_export(export_format, rows, fields):
+    """Chunk generator for the requested export format"""
+    if export_format == 'csv':
+        return iter_csv(rows, fields)
+    return iter_ndjson(rows, fields)
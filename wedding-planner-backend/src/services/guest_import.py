@@ -0,0 +1,216 @@
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import bindparam, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from src.models import db, Guest, GuestDietaryTag
+from src.services.guest_stats import apply_deltas
+from src.services.dietary import SOURCES, tag_rows
+from src.services.events import event_bus
+from src.services.jobs import job_handler
+
+DEFAULT_BATCH_SIZE = 500
+
+# Columns a bulk import may set; email is the upsert key
+IMPORT_FIELDS = (
+    'email', 'first_name', 'last_name', 'phone', 'rsvp_status', 'attendance_type',
+    'number_of_guests', 'dietary_restrictions', 'allergies', 'special_requests',
+    'address', 'notes'
+)
+
+RSVP_STATUSES = ('pending', 'confirmed', 'declined')
+ATTENDANCE_TYPES = ('ceremony', 'reception', 'both')
+
+_upsert_supported = {}
+
+def parse_csv(text):
+    """Parse CSV text with a header row into a list of dicts"""
+    reader = csv.DictReader(io.StringIO(text))
+    return [
+        {key.strip(): (value.strip() if isinstance(value, str) else value)
+         for key, value in row.items() if key}
+        for row in reader
+    ]
+
+def _clean(row):
+    """Validate one input row; returns (values, error)"""
+    if not isinstance(row, dict):
+        return None, 'Row must be an object'
+    
+    # Empty cells mean "not provided" so they never overwrite stored values
+    values = {field: row[field] for field in IMPORT_FIELDS if row.get(field) not in (None, '')}
+    
+    missing = [field for field in ('email', 'first_name', 'last_name') if field not in values]
+    if missing:
+        return None, f"Missing required field(s): {', '.join(missing)}"
+    
+    values['email'] = str(values['email']).strip()
+    
+    if 'rsvp_status' in values and values['rsvp_status'] not in RSVP_STATUSES:
+        return None, f"Invalid rsvp_status '{values['rsvp_status']}'"
+    if 'attendance_type' in values and values['attendance_type'] not in ATTENDANCE_TYPES:
+        return None, f"Invalid attendance_type '{values['attendance_type']}'"
+    if 'number_of_guests' in values:
+        try:
+            values['number_of_guests'] = int(values['number_of_guests'])
+        except (TypeError, ValueError):
+            return None, 'number_of_guests must be an integer'
+        if values['number_of_guests'] < 1:
+            return None, 'number_of_guests must be at least 1'
+    
+    return values, None
+
+def _supports_upsert():
+    """True when the dialect has ON CONFLICT and guests.email is uniquely indexed"""
+    engine = db.engine
+    if engine.url not in _upsert_supported:
+        supported = False
+        if engine.dialect.name in ('postgresql', 'sqlite'):
+            inspector = inspect(engine)
+            unique_sets = [index['column_names'] for index in inspector.get_indexes('guests') if index.get('unique')]
+            unique_sets += [constraint['column_names'] for constraint in inspector.get_unique_constraints('guests')]
+            supported = ['email'] in unique_sets
+        _upsert_supported[engine.url] = supported
+    return _upsert_supported[engine.url]
+
+def _stats_key(values):
+    return (values.get('rsvp_status') or '', values.get('attendance_type') or ''), values.get('number_of_guests') or 0
+
+def _write_batch(connection, batch):
+    """Upsert one batch of cleaned rows; returns (created, updated)"""
+    table = Guest.__table__
+    now = datetime.utcnow()
+    columns = [table.c[field] for field in IMPORT_FIELDS]
+    
+    # One round trip tells us which emails exist and what they hold now
+    existing = {
+        row.email: row._asdict()
+        for row in connection.execute(
+            select(table.c.id, *columns).where(table.c.email.in_([values['email'] for values in batch]))
+        )
+    }
+    
+    inserts, updates, deltas = [], [], {}
+    retag = []
+    
+    def add_delta(key, count, attendance):
+        old = deltas.get(key, (0, 0))
+        deltas[key] = (old[0] + count, old[1] + attendance)
+    
+    for values in batch:
+        current = existing.get(values['email'])
+        if current is None:
+            merged = {field: values.get(field) for field in IMPORT_FIELDS}
+            merged['rsvp_status'] = merged['rsvp_status'] or 'pending'
+            merged['number_of_guests'] = merged['number_of_guests'] or 1
+            merged.update(registered_at=now, updated_at=now)
+            inserts.append(merged)
+            if any(merged[field] for field, _ in SOURCES):
+                retag.append(merged)
+        else:
+            merged = {field: values.get(field, current[field]) for field in IMPORT_FIELDS}
+            merged.update(b_id=current['id'], updated_at=now)
+            updates.append(merged)
+            if any(merged[field] != current[field] for field, _ in SOURCES):
+                retag.append(merged)
+            key, attendance = _stats_key(current)
+            add_delta(key, -1, -attendance)
+        
+        key, attendance = _stats_key(merged)
+        add_delta(key, 1, attendance)
+    
+    if _supports_upsert():
+        rows = inserts + [{k: v for k, v in row.items() if k != 'b_id'} for row in updates]
+        dialect_insert = postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=['email'],
+            set_={field: statement.excluded[field] for field in IMPORT_FIELDS + ('updated_at',) if field != 'email'}
+        )
+        for row in rows:
+            row.setdefault('registered_at', now)
+        connection.execute(statement, rows)
+    else:
+        if inserts:
+            connection.execute(table.insert(), inserts)
+        if updates:
+            connection.execute(table.update().where(table.c.id == bindparam('b_id')), updates)
+    
+    apply_deltas(connection, {key: delta for key, delta in deltas.items() if delta != (0, 0)})
+    _retag(connection, retag)
+    return len(inserts), len(updates)
+
+def _retag(connection, rows):
+    """Rewrite dietary tags for imported guests; Core writes skip the ORM hook"""
+    if not rows:
+        return
+    
+    table = Guest.__table__
+    tags = GuestDietaryTag.__table__
+    ids = dict(connection.execute(
+        select(table.c.email, table.c.id).where(table.c.email.in_([row['email'] for row in rows]))
+    ).all())
+    
+    connection.execute(tags.delete().where(tags.c.guest_id.in_(list(ids.values()))))
+    new_tags = [tag for row in rows for tag in tag_rows(ids[row['email']], row)]
+    if new_tags:
+        connection.execute(tags.insert(), new_tags)
+
+def import_guests(rows, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Create or update guests by email, batch_size rows per transaction.
+    
+    Returns a report with created/updated/failed counts and one error
+    entry per rejected row (1-based row numbers). progress(done, total) is
+    called after each batch when given.
+    """
+    report = {'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    
+    def fail(number, email, message):
+        report['failed'] += 1
+        report['errors'].append({'row': number, 'email': email, 'error': message})
+    
+    batch = {}
+    
+    def flush():
+        if not batch:
+            return
+        try:
+            with db.engine.begin() as connection:
+                created, updated = _write_batch(connection, list(batch.values()))
+            report['created'] += created
+            report['updated'] += updated
+        except SQLAlchemyError as e:
+            for number, values in batch.items():
+                fail(number, values['email'], f'Database error: {e.__class__.__name__}')
+        batch.clear()
+    
+    seen = {}
+    for number, row in enumerate(rows, start=1):
+        values, error = _clean(row)
+        if error:
+            fail(number, row.get('email') if isinstance(row, dict) else None, error)
+            continue
+        
+        # A later row for the same email replaces an earlier one in the batch
+        earlier = seen.get(values['email'])
+        if earlier in batch:
+            del batch[earlier]
+            fail(earlier, values['email'], f'Superseded by row {number} with the same email')
+        seen[values['email']] = number
+        
+        batch[number] = values
+        if len(batch) >= batch_size:
+            flush()
+            if progress:
+                progress(number, len(rows))
+    
+    flush()
+    # Core writes skip the session hooks, so the event stream gets one summary
+    if report['created'] or report['updated']:
+        event_bus.publish('guests.imported', {'created': report['created'], 'updated': report['updated']})
+    return report
+
+@job_handler('guests.import')
+def _import_job(params, progress):
+    return import_guests(params['rows'], params.get('batch_size', DEFAULT_BATCH_SIZE), progress=progress)
@@ -0,0 +1,176 @@
+import re
+from functools import lru_cache
+from sqlalchemy import and_, case, func, or_, select, text
+from src.models import db, Guest
+
+# Created by migration v0007
+FTS_TABLE = 'guest_search'
+TRIGRAM_INDEX = 'ix_guests_search_trgm'
+SEARCH_DOCUMENT = "lower(first_name || ' ' || last_name || ' ' || email || ' ' || coalesce(username, ''))"
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'username')
+MAX_QUERY_LENGTH = 100
+MAX_TERMS = 5
+# SQLite fuzzy stage: FTS candidates rescored in Python, kept above the threshold
+FUZZY_CANDIDATES = 100
+# Rarest trigrams are OR-ed until they cover about this many guests;
+# one found in more than FUZZY_GRAM_LIMIT guests is not selective
+FUZZY_DOC_BUDGET = 3000
+FUZZY_GRAM_LIMIT = 1000
+FUZZY_THRESHOLD = 0.3
+WORD_SPLIT = re.compile(r'[^0-9a-z]+')
+
+_strategies = {}
+
+class SearchError(ValueError):
+    """Raised for a missing or unusable ?q= parameter"""
+
+def parse_query(value):
+    """Split ?q= into lowercase terms"""
+    value = (value or '').strip()[:MAX_QUERY_LENGTH].lower()
+    terms = [term for term in value.replace('"', ' ').split() if term][:MAX_TERMS]
+    if not terms:
+        raise SearchError('q is required')
+    return terms
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _trigrams(value):
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+@lru_cache(maxsize=4096)
+def _word_trigrams(word):
+    # Padded like pg_trgm, so word starts and ends count
+    return frozenset(_trigrams(f'  {word} '))
+
+def _similarity(term_grams, values):
+    """pg_trgm-style similarity: per term, the best trigram overlap with any word"""
+    words = [_word_trigrams(word) for value in values if value for word in WORD_SPLIT.split(value.lower()) if word]
+    total = 0.0
+    for grams in term_grams:
+        total += max((len(grams & word) / len(grams | word) for word in words), default=0.0)
+    return total / len(term_grams)
+
+def strategy():
+    """'trigram' (PostgreSQL), 'fts5' (SQLite) or 'like', depending on the migrated schema"""
+    key = str(db.engine.url)
+    found = _strategies.get(key)
+    if found is None:
+        dialect = db.engine.dialect.name
+        found = 'like'
+        if dialect == 'postgresql':
+            if db.session.execute(text('SELECT to_regclass(:name)'), {'name': TRIGRAM_INDEX}).scalar():
+                found = 'trigram'
+        elif dialect == 'sqlite':
+            if db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': FTS_TABLE}
+            ).first():
+                found = 'fts5'
+        _strategies[key] = found
+    return found
+
+def _trigram_ids(terms, count):
+    # LIKE '%term%' and the <% word-similarity operator are both served by
+    # the gin_trgm_ops index; substring hits rank first, then by similarity
+    params = {'q': ' '.join(terms), 'count': count}
+    likes = []
+    for i, term in enumerate(terms):
+        params[f'p{i}'] = f'%{_escape_like(term)}%'
+        likes.append(f"{SEARCH_DOCUMENT} LIKE :p{i} ESCAPE '\\'")
+    substring = ' AND '.join(likes)
+    return list(db.session.execute(text(
+        f'SELECT id FROM guests WHERE ({substring}) OR :q <% {SEARCH_DOCUMENT} '
+        f'ORDER BY ({substring}) DESC, word_similarity(:q, {SEARCH_DOCUMENT}) DESC, id '
+        f'LIMIT :count'
+    ), params).scalars())
+
+def _rare_trigrams(grams):
+    frequency = []
+    for gram in grams:
+        # Counting stops at the limit, so common trigrams cost no more than rare ones
+        docs = db.session.execute(text(
+            f'SELECT count(*) FROM (SELECT 1 FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match LIMIT :limit)'
+        ), {'match': f'"{gram}"', 'limit': FUZZY_GRAM_LIMIT + 1}).scalar()
+        if 0 < docs <= FUZZY_GRAM_LIMIT:
+            frequency.append((docs, gram))
+    
+    chosen, covered = [], 0
+    for docs, gram in sorted(frequency):
+        if chosen and covered + docs > FUZZY_DOC_BUDGET:
+            break
+        chosen.append(gram)
+        covered += docs
+    return chosen
+
+def _fts_ids(terms, count):
+    # The trigram tokenizer matches substrings of three or more characters
+    usable = [term for term in terms if len(term) >= 3]
+    if not usable:
+        return _prefix_ids(terms, count)
+    
+    phrase = ' '.join(f'"{term}"' for term in usable)
+    ids = list(db.session.execute(text(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match ORDER BY rank LIMIT :count'
+    ), {'match': phrase, 'count': count}).scalars())
+    if len(ids) >= count:
+        return ids
+    
+    # Too few substring hits: guests sharing the query's rarest trigrams
+    # are rescored so near misses like typos come next. Ranking an OR of
+    # common trigrams would touch most of the table.
+    grams = _rare_trigrams(set().union(*(_trigrams(term) for term in usable)))
+    if not grams:
+        return ids
+    candidates = db.session.execute(text(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match ORDER BY rank LIMIT :count'
+    ), {'match': ' OR '.join(f'"{gram}"' for gram in grams), 'count': FUZZY_CANDIDATES}).scalars().all()
+    
+    seen = set(ids)
+    candidates = [guest_id for guest_id in candidates if guest_id not in seen]
+    if not candidates:
+        return ids
+    columns = [getattr(Guest, field) for field in SEARCH_FIELDS]
+    term_grams = [_word_trigrams(term) for term in usable]
+    scored = []
+    for row in db.session.execute(select(Guest.id, *columns).where(Guest.id.in_(candidates))):
+        score = _similarity(term_grams, row[1:])
+        if score >= FUZZY_THRESHOLD:
+            scored.append((-score, row.id))
+    return ids + [guest_id for _, guest_id in sorted(scored)][:count - len(ids)]
+
+def _like_ids(terms, count):
+    columns = [func.lower(getattr(Guest, field)) for field in SEARCH_FIELDS]
+    conditions = [
+        or_(*[column.like(f'%{_escape_like(term)}%', escape='\\') for column in columns])
+        for term in terms
+    ]
+    prefix = f'{_escape_like(terms[0])}%'
+    starts = or_(*[column.like(prefix, escape='\\') for column in columns])
+    return list(db.session.execute(
+        select(Guest.id).where(and_(*conditions))
+        .order_by(case((starts, 0), else_=1), Guest.last_name, Guest.first_name, Guest.id)
+        .limit(count)
+    ).scalars())
+
+def _prefix_ids(terms, count):
+    # One- and two-letter queries: prefix matches in id order, which lets
+    # the scan stop after count rows instead of sorting every match
+    columns = [func.lower(getattr(Guest, field)) for field in SEARCH_FIELDS]
+    conditions = [or_(*[column.like(f'{_escape_like(term)}%', escape='\\') for column in columns]) for term in terms]
+    return list(db.session.execute(
+        select(Guest.id).where(and_(*conditions)).order_by(Guest.id).limit(count)
+    ).scalars())
+
+def search_guest_ids(terms, limit, offset=0):
+    """Ranked ids of guests matching terms; (page of ids, has_more)"""
+    count = offset + limit + 1
+    found = strategy()
+    if found == 'trigram':
+        ids = _trigram_ids(terms, count)
+    elif found == 'fts5':
+        ids = _fts_ids(terms, count)
+    else:
+        ids = _like_ids(terms, count)
+    page = ids[offset:offset + limit]
+    return page, len(ids) > offset + limit
@@ -0,0 +1,189 @@
+from src.models import db, Guest, GuestStats
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+# Guest attributes that feed into the materialized counts
+TRACKED_FIELDS = ('rsvp_status', 'attendance_type', 'number_of_guests')
+
+def _key(rsvp_status, attendance_type):
+    """Stats key for a guest; NULLs are stored as ''"""
+    return (rsvp_status or '', attendance_type or '')
+
+def _attendance(number_of_guests):
+    """number_of_guests as the database will sum it; clients may send it as a string"""
+    try:
+        return int(number_of_guests or 0)
+    except (TypeError, ValueError):
+        # Only SQLite accepts such a value, and SUM() counts it as 0
+        return 0
+
+def _current(guest):
+    return _key(guest.rsvp_status, guest.attendance_type), _attendance(guest.number_of_guests)
+
+def _previous(guest):
+    """Values the guest had before the flush in progress"""
+    state = inspect(guest)
+    values = {}
+    for field in TRACKED_FIELDS:
+        history = state.attrs[field].history
+        values[field] = history.deleted[0] if history.deleted else getattr(guest, field)
+    return _key(values['rsvp_status'], values['attendance_type']), _attendance(values['number_of_guests'])
+
+def _collect_deltas(session):
+    """Per-key (count, attendance) changes caused by the pending flush"""
+    deltas = {}
+    
+    def add(key, count, attendance):
+        old_count, old_attendance = deltas.get(key, (0, 0))
+        deltas[key] = (old_count + count, old_attendance + attendance)
+    
+    for obj in session.new:
+        if isinstance(obj, Guest):
+            key, attendance = _current(obj)
+            add(key, 1, attendance)
+    
+    for obj in session.dirty:
+        if isinstance(obj, Guest) and obj not in session.deleted:
+            old_key, old_attendance = _previous(obj)
+            new_key, new_attendance = _current(obj)
+            if (old_key, old_attendance) != (new_key, new_attendance):
+                add(old_key, -1, -old_attendance)
+                add(new_key, 1, new_attendance)
+    
+    for obj in session.deleted:
+        if isinstance(obj, Guest):
+            key, attendance = _previous(obj)
+            add(key, -1, -attendance)
+    
+    return {key: delta for key, delta in deltas.items() if delta != (0, 0)}
+
+def apply_deltas(connection, deltas):
+    """Add (count, attendance) deltas to the stats rows, creating rows as needed"""
+    table = GuestStats.__table__
+    now = datetime.utcnow()
+    
+    if connection.dialect.name in ('postgresql', 'sqlite'):
+        # One upsert per key, so concurrent first writes of a key cannot collide
+        dialect_insert = postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=['rsvp_status', 'attendance_type'],
+            set_={
+                'guest_count': table.c.guest_count + statement.excluded.guest_count,
+                'attendance': table.c.attendance + statement.excluded.attendance,
+                'updated_at': statement.excluded.updated_at
+            }
+        )
+        for (rsvp_status, attendance_type), (count, attendance) in deltas.items():
+            connection.execute(statement.values(
+                rsvp_status=rsvp_status,
+                attendance_type=attendance_type,
+                guest_count=count,
+                attendance=attendance,
+                updated_at=now
+            ))
+        return
+    
+    for (rsvp_status, attendance_type), (count, attendance) in deltas.items():
+        result = connection.execute(
+            table.update()
+            .where(table.c.rsvp_status == rsvp_status, table.c.attendance_type == attendance_type)
+            .values(
+                guest_count=table.c.guest_count + count,
+                attendance=table.c.attendance + attendance,
+                updated_at=now
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(
+                rsvp_status=rsvp_status,
+                attendance_type=attendance_type,
+                guest_count=count,
+                attendance=attendance,
+                updated_at=now
+            ))
+
+def _after_flush(session, flush_context):
+    deltas = _collect_deltas(session)
+    if deltas:
+        # Same connection, same transaction: the counts commit or roll back with the guests
+        apply_deltas(session.connection(), deltas)
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    # No-op; registered with active_history so the old value is loaded for _previous()
+    pass
+
+def register_guest_stats_listeners():
+    """Keep guest_stats in step with every ORM flush that touches Guest"""
+    if event.contains(Session, 'after_flush', _after_flush):
+        return
+    
+    for field in TRACKED_FIELDS:
+        event.listen(getattr(Guest, field), 'set', _load_previous_value, active_history=True)
+    event.listen(Session, 'after_flush', _after_flush)
+
+def scan_guest_groups():
+    """Recount guests from the guests table in one GROUP BY scan"""
+    rows = db.session.query(
+        Guest.rsvp_status,
+        Guest.attendance_type,
+        func.count(Guest.id),
+        func.sum(Guest.number_of_guests)
+    ).group_by(Guest.rsvp_status, Guest.attendance_type).all()
+    
+    return {
+        (rsvp_status, attendance_type): (count, int(attendance or 0))
+        for rsvp_status, attendance_type, count, attendance in rows
+    }
+
+def read_guest_groups():
+    """Read the materialized counts, keyed like scan_guest_groups()"""
+    return {
+        (row.rsvp_status or None, row.attendance_type or None): (row.guest_count, row.attendance)
+        for row in GuestStats.query.all()
+        if row.guest_count
+    }
+
+def rebuild_guest_stats():
+    """Replace the materialized counts with a full recount"""
+    groups = scan_guest_groups()
+    now = datetime.utcnow()
+    
+    try:
+        GuestStats.query.delete()
+        for (rsvp_status, attendance_type), (count, attendance) in groups.items():
+            db.session.add(GuestStats(
+                rsvp_status=rsvp_status or '',
+                attendance_type=attendance_type or '',
+                guest_count=count,
+                attendance=attendance,
+                updated_at=now
+            ))
+        db.session.commit()
+    except IntegrityError:
+        # Another process rebuilt concurrently; its result is just as fresh
+        db.session.rollback()
+    
+    return groups
+
+def check_guest_stats():
+    """Compare the materialized counts with a full recount.
+    
+    Returns a dict of mismatching keys mapped to (stored, actual).
+    """
+    actual = scan_guest_groups()
+    stored = read_guest_groups()
+    
+    mismatches = {}
+    for key in set(actual) | set(stored):
+        if stored.get(key, (0, 0)) != actual.get(key, (0, 0)):
+            mismatches[key] = (stored.get(key, (0, 0)), actual.get(key, (0, 0)))
+    return mismatches
+
+def ensure_guest_stats():
+    """Build the stats table on first boot against an existing guest list"""
+    if GuestStats.query.first() is None and Guest.query.first() is not None:
+        rebuild_guest_stats()
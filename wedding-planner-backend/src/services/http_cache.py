@@ -0,0 +1,43 @@
+import hashlib
+import os
+from flask import request, make_response
+
+def max_age():
+    """Seconds browsers and CDNs may reuse public content without revalidating"""
+    return int(os.getenv('CONTENT_CACHE_MAX_AGE', 60))
+
+def make_etag(scope, last_modified, *parts):
+    """Strong ETag derived from a scope name, a timestamp and extra parts"""
+    raw = ':'.join([scope, last_modified.isoformat() if last_modified else ''] + [str(part) for part in parts])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def apply_cache_headers(response, etag, last_modified=None, public=True):
+    """Attach validators and Cache-Control to a response"""
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    if public:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age()
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    return response
+
+def not_modified(etag, last_modified=None, public=True):
+    """A 304 response if the request's validators still match, else None.
+    
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if request.if_none_match:
+        matched = request.if_none_match.contains(etag)
+    elif request.if_modified_since and last_modified:
+        matched = last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    else:
+        matched = False
+    
+    if not matched:
+        return None
+    
+    response = make_response('', 304)
+    return apply_cache_headers(response, etag, last_modified, public)
@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from src.models import db, Job
+from src.services import shared_store
+
+logger = logging.getLogger(__name__)
+
+QUEUE_NAME = 'wedding:jobs'
+# Seconds a worker waits on the broker before checking for shutdown
+POLL_TIMEOUT = 1
+# Minimum seconds between progress writes of one job
+PROGRESS_INTERVAL = 0.5
+# Seconds between heartbeat writes for the jobs a process is running
+HEARTBEAT_INTERVAL = 30
+
+handlers = {}
+
+class JobError(ValueError):
+    """Raised for an unknown job kind"""
+
+def job_handler(kind):
+    """Register fn(params, progress) as the runner for jobs of this kind.
+    
+    progress(done, total=None, message=None) records how far the job is;
+    the return value must be JSON-serializable and becomes the job result.
+    """
+    def decorator(fn):
+        handlers[kind] = fn
+        return fn
+    return decorator
+
+class LocalBroker:
+    """In-process queue of job ids; jobs run in the process that queued them"""
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+    
+    def push(self, job_id):
+        self._queue.put(job_id)
+    
+    def pop(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class SharedBroker:
+    """Job ids in a Redis-style list, so any worker process can run them"""
+    
+    def __init__(self, client, name=QUEUE_NAME):
+        self.client = client
+        self.name = name
+    
+    def push(self, job_id):
+        self.client.rpush(self.name, job_id)
+    
+    def pop(self, timeout):
+        item = self.client.blpop([self.name], timeout=timeout)
+        if item is None:
+            return None
+        value = item[1]
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+class JobWorkers:
+    """Threads that take job ids from the broker and run them"""
+    
+    def __init__(self):
+        self.broker = LocalBroker()
+        self.threads = []
+        self.retention_days = 30
+        # A running job without a heartbeat for this long lost its worker
+        self.stale_after = timedelta(minutes=5)
+        self.running = set()
+        self._stop = threading.Event()
+    
+    def start(self, app, count):
+        if self.threads or count <= 0:
+            return
+        self._stop.clear()
+        for i in range(count):
+            thread = threading.Thread(target=self._loop, args=(app, i == 0), name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat_loop, args=(app,), name='job-heartbeat', daemon=True)
+        thread.start()
+        self.threads.append(thread)
+    
+    def stop(self, timeout=5):
+        self._stop.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+    
+    def _loop(self, app, housekeeping):
+        if housekeeping:
+            with app.app_context():
+                self._recover()
+        while not self._stop.is_set():
+            try:
+                job_id = self.broker.pop(POLL_TIMEOUT)
+            except Exception:
+                logger.exception('Job broker unavailable')
+                self._stop.wait(POLL_TIMEOUT)
+                continue
+            if job_id is not None:
+                with app.app_context():
+                    run_job(job_id)
+    
+    def _heartbeat_loop(self, app):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            with app.app_context():
+                try:
+                    with db.engine.begin() as connection:
+                        running = list(self.running)
+                        if running:
+                            connection.execute(
+                                update(Job).where(Job.id.in_(running), Job.status == 'running')
+                                .values(heartbeat_at=datetime.utcnow())
+                            )
+                        self._fail_stale(connection)
+                except SQLAlchemyError:
+                    logger.exception('Could not record job heartbeats')
+    
+    def _fail_stale(self, connection):
+        # Jobs whose process died mid-run (a crash, a recycled worker, a CLI
+        # that exited) are failed, not rerun: they may have half-applied
+        stale = connection.execute(
+            update(Job).where(Job.status == 'running', Job.heartbeat_at < stale_cutoff())
+            .values(status='failed', error='Worker stopped while the job was running', finished_at=datetime.utcnow())
+        ).rowcount
+        if stale:
+            logger.warning('Marked %d stale running jobs as failed', stale)
+    
+    def _recover(self):
+        """Requeue jobs queued before this process started, fail orphaned running ones and drop old finished ones"""
+        try:
+            with db.engine.begin() as connection:
+                self._fail_stale(connection)
+                if self.retention_days:
+                    cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+                    connection.execute(delete(Job).where(
+                        Job.status.in_(('finished', 'failed')), Job.finished_at < cutoff
+                    ))
+                queued = connection.execute(
+                    select(Job.id).where(Job.status == 'queued').order_by(Job.created_at)
+                ).scalars().all()
+        except SQLAlchemyError as e:
+            # e.g. scripts that create the app before migrations have run
+            logger.warning('Could not recover queued jobs: %s', e.__class__.__name__)
+            return
+        if isinstance(self.broker, LocalBroker):
+            # Claiming is atomic, so a job requeued by several processes runs once
+            for job_id in queued:
+                self.broker.push(job_id)
+
+workers = JobWorkers()
+
+def stale_cutoff():
+    """Running jobs with an older heartbeat than this have lost their worker"""
+    return datetime.utcnow() - workers.stale_after
+
+def _dumps(value):
+    return json.dumps(value, default=str)
+
+def _set(job_id, **values):
+    with db.engine.begin() as connection:
+        return connection.execute(update(Job).where(Job.id == job_id).values(**values)).rowcount
+
+def enqueue(kind, params=None, user_id=None):
+    """Record a queued job and hand it to the broker; returns the job id.
+    
+    Written on its own connection, so it is safe from session event hooks
+    and does not commit the caller's transaction.
+    """
+    if kind not in handlers:
+        raise JobError(f"Unknown job kind '{kind}'")
+    job_id = uuid.uuid4().hex
+    with db.engine.begin() as connection:
+        connection.execute(insert(Job).values(
+            id=job_id, kind=kind, status='queued', user_id=user_id, params=_dumps(params or {}),
+            progress=0, created_at=datetime.utcnow()
+        ))
+    workers.broker.push(job_id)
+    return job_id
+
+def find_active(kind):
+    """Id of a queued job of this kind, or of one running with a live heartbeat"""
+    with db.engine.connect() as connection:
+        return connection.execute(
+            select(Job.id).where(
+                Job.kind == kind,
+                or_(Job.status == 'queued', and_(Job.status == 'running', Job.heartbeat_at >= stale_cutoff()))
+            ).order_by(Job.created_at).limit(1)
+        ).scalar()
+
+def has_pending(kind):
+    """True if a job of this kind is queued and not yet started"""
+    with db.engine.connect() as connection:
+        return connection.execute(
+            select(Job.id).where(Job.kind == kind, Job.status == 'queued').limit(1)
+        ).first() is not None
+
+def run_job(job_id):
+    """Claim a queued job and run its handler; a job already claimed elsewhere is skipped"""
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        claimed = connection.execute(
+            update(Job).where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', started_at=now, heartbeat_at=now)
+        ).rowcount
+        row = connection.execute(select(Job.kind, Job.params).where(Job.id == job_id)).first() if claimed else None
+    if not row:
+        return False
+    
+    last = [0.0]
+    
+    def progress(done, total=None, message=None):
+        now = time.monotonic()
+        finished = total is not None and done >= total
+        if now - last[0] < PROGRESS_INTERVAL and not finished:
+            return
+        last[0] = now
+        percent = int(done * 100 / total) if total else int(done)
+        values = {'progress': max(0, min(100, percent)), 'heartbeat_at': datetime.utcnow()}
+        if message is not None:
+            values['message'] = str(message)[:255]
+        _set(job_id, **values)
+    
+    workers.running.add(job_id)
+    try:
+        handler = handlers.get(row.kind)
+        if handler is None:
+            raise JobError(f"Unknown job kind '{row.kind}'")
+        result = handler(json.loads(row.params or '{}'), progress)
+    except Exception as e:
+        logger.exception('Job %s (%s) failed', job_id, row.kind)
+        db.session.rollback()
+        _set(job_id, status='failed', error=f'{e.__class__.__name__}: {e}', finished_at=datetime.utcnow())
+    else:
+        _set(job_id, status='finished', progress=100, result=_dumps(result), finished_at=datetime.utcnow())
+    finally:
+        workers.running.discard(job_id)
+        db.session.remove()
+    return True
+
+def start_job_workers(app):
+    """Start JOB_WORKERS threads (0 disables them) reading from JOB_BROKER (local or shared).
+    
+    Called by the server entry points only, so scripts that create the app
+    never claim jobs they could abandon on exit.
+    """
+    if workers.threads:
+        return
+    if os.getenv('JOB_BROKER', 'local') == 'shared':
+        workers.broker = SharedBroker(shared_store.connect(os.getenv('SHARED_STORE_URL')))
+    else:
+        workers.broker = LocalBroker()
+    workers.retention_days = int(os.getenv('JOB_RETENTION_DAYS', 30))
+    workers.stale_after = timedelta(seconds=max(2 * HEARTBEAT_INTERVAL, int(os.getenv('JOB_STALE_SECONDS', 300))))
+    workers.start(app, int(os.getenv('JOB_WORKERS', 2)))
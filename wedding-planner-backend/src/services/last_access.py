@@ -0,0 +1,147 @@
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, bindparam, column, or_, update, values
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.attributes import set_committed_value
+from src.models import db, Guest
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE statement; keeps the VALUES list under bind parameter limits
+CHUNK_SIZE = 1000
+
+class LastAccessBuffer:
+    """Write-behind buffer for Guest.last_accessed.
+    
+    record() only updates a dict; a flusher thread writes the newest
+    timestamp per guest in one batched UPDATE every interval seconds, or
+    sooner once max_events accesses are pending. Pending timestamps are
+    flushed on stop() and at interpreter exit, and put back if a flush
+    fails, so a crash loses at most one interval of access times.
+    """
+    
+    def __init__(self, interval=5.0, max_events=500):
+        self.interval = interval
+        self.max_events = max_events
+        self.flushes = 0
+        self.written = 0
+        self._pending = {}
+        self._events = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._app = None
+    
+    def record(self, guest, when=None):
+        """Note an access now; the guest instance shows it without a write"""
+        when = when or datetime.utcnow()
+        set_committed_value(guest, 'last_accessed', when)
+        if not self.interval:
+            self._write({guest.id: when})
+            return
+        with self._lock:
+            if when > self._pending.get(guest.id, datetime.min):
+                self._pending[guest.id] = when
+            self._events += 1
+            full = self._events >= self.max_events
+        if full:
+            self._wake.set()
+    
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+    
+    def start(self, app):
+        self._app = app
+        if self._thread is not None or not self.interval:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='last-access-flusher', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the flusher thread and write whatever is still pending"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join()
+        if self._app is not None:
+            with self._app.app_context():
+                self.flush()
+    
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with self._app.app_context():
+                self.flush()
+    
+    def flush(self):
+        """Write pending timestamps now; returns the number of guests written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._events = 0
+            if not batch:
+                return 0
+            try:
+                self._write(batch)
+            except SQLAlchemyError:
+                logger.exception('Could not flush %d last_accessed timestamps', len(batch))
+                with self._lock:
+                    for guest_id, when in batch.items():
+                        if when > self._pending.get(guest_id, datetime.min):
+                            self._pending[guest_id] = when
+                return 0
+            self.flushes += 1
+            self.written += len(batch)
+            return len(batch)
+    
+    def _write(self, batch):
+        # updated_at is set to itself so its onupdate default does not fire:
+        # an access is not a change to the guest
+        table = Guest.__table__
+        items = sorted(batch.items())
+        
+        def newer(value):
+            # Never move a timestamp backwards, e.g. past a newer inline write
+            return or_(table.c.last_accessed.is_(None), table.c.last_accessed < value)
+        
+        with db.engine.begin() as connection:
+            for start in range(0, len(items), CHUNK_SIZE):
+                chunk = items[start:start + CHUNK_SIZE]
+                if connection.dialect.name == 'postgresql':
+                    # UPDATE guests SET ... FROM (VALUES (id, ts), ...) AS v(id, ts)
+                    rows = values(column('id', Integer), column('ts', DateTime), name='v').data(chunk)
+                    connection.execute(
+                        update(table).where(table.c.id == rows.c.id, newer(rows.c.ts))
+                        .values(last_accessed=rows.c.ts, updated_at=table.c.updated_at)
+                    )
+                else:
+                    # SQLite has no column aliases on VALUES; one executemany in one transaction
+                    connection.execute(
+                        update(table).where(table.c.id == bindparam('b_id'), newer(bindparam('b_ts')))
+                        .values(last_accessed=bindparam('b_ts'), updated_at=table.c.updated_at),
+                        [{'b_id': guest_id, 'b_ts': when} for guest_id, when in chunk]
+                    )
+    
+    def stats(self):
+        return {'pending': self.pending(), 'flushes': self.flushes, 'written': self.written}
+
+last_access = LastAccessBuffer()
+
+def configure_last_access(app):
+    """Start the buffer: LAST_ACCESS_FLUSH_INTERVAL seconds (0 writes inline), LAST_ACCESS_FLUSH_EVENTS"""
+    last_access.interval = float(os.getenv('LAST_ACCESS_FLUSH_INTERVAL', 5))
+    last_access.max_events = max(1, int(os.getenv('LAST_ACCESS_FLUSH_EVENTS', 500)))
+    last_access.start(app)
+
+atexit.register(last_access.stop)
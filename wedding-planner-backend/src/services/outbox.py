@@ -0,0 +1,458 @@
+import html
+import logging
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from string import Template
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models import db, Content, Guest, OutboxMessage
+from src.services.jobs import job_handler
+from src.services.rate_limit import Limit, LocalBuckets
+
+logger = logging.getLogger(__name__)
+
+# Guest columns a template may use as $name or ${name}
+TEMPLATE_FIELDS = ('first_name', 'last_name', 'email', 'username', 'rsvp_status', 'attendance_type', 'number_of_guests')
+OUTBOX_STATUSES = ('queued', 'sending', 'sent', 'failed')
+
+# Messages claimed from the outbox per round; their outcomes are written in one batch
+CLAIM_SIZE = 200
+# Rows per INSERT when queueing a campaign
+INSERT_BATCH_SIZE = 1000
+# Retry n waits RETRY_BASE_SECONDS * 3 ** (n - 1)
+RETRY_BASE_SECONDS = 5
+# A dispatch run ends when the next due message is further away than this
+MAX_WAIT_SECONDS = 300
+# Claimed messages of a run that died are queued again after this long
+STALE_CLAIM = timedelta(minutes=10)
+# Pooled connections idle longer than this are replaced rather than reused
+SMTP_IDLE_SECONDS = 60
+
+_settings = {
+    'backend': 'smtp',
+    'host': None,
+    'port': 587,
+    'username': None,
+    'password': None,
+    'starttls': True,
+    'ssl': False,
+    'timeout': 30,
+    'sender': 'wedding@localhost',
+    'concurrency': 4,
+    'domain_rate': Limit(120, 60),
+    'max_attempts': 4
+}
+
+class SendError(Exception):
+    """A message could not be sent; permanent failures are not retried"""
+    
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+class MemoryTransport:
+    """Keeps sent messages in a list instead of delivering them.
+    
+    The local stand-in for an SMTP server (EMAIL_BACKEND=memory); fail
+    maps recipients to an error (permanent=True or False) to exercise the
+    retry paths.
+    """
+    
+    def __init__(self):
+        self.sent = []
+        self.fail = {}
+        self._lock = threading.Lock()
+    
+    def send(self, message):
+        permanent = self.fail.get(message['To'])
+        if permanent is not None:
+            raise SendError(f"Simulated failure for {message['To']}", permanent=permanent)
+        with self._lock:
+            self.sent.append(message)
+    
+    def close(self):
+        pass
+
+memory_transport = MemoryTransport()
+
+class SMTPPool:
+    """Up to size reusable SMTP connections shared by the sending threads.
+    
+    A connection is opened (and logged in) once and then carries many
+    messages; one the server has dropped is replaced and the message
+    retried on the new connection.
+    """
+    
+    def __init__(self, host, port, username=None, password=None, starttls=True, use_ssl=False, timeout=30, size=4):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.connects = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+    
+    def _connect(self):
+        if self.use_ssl:
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout, context=ssl.create_default_context())
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                connection.starttls(context=ssl.create_default_context())
+        if self.username:
+            connection.login(self.username, self.password or '')
+        self.connects += 1
+        return connection
+    
+    def _checkout(self):
+        while True:
+            try:
+                connection, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < SMTP_IDLE_SECONDS:
+                return connection
+            self._discard(connection)
+    
+    def _checkin(self, connection):
+        self._idle.put((connection, time.monotonic()))
+    
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+    
+    def send(self, message):
+        with self._slots:
+            for retry in (False, True):
+                try:
+                    connection = self._checkout()
+                except (smtplib.SMTPException, OSError) as e:
+                    raise SendError(f'Could not connect to {self.host}:{self.port}: {e}')
+                try:
+                    connection.send_message(message)
+                except smtplib.SMTPRecipientsRefused as e:
+                    self._checkin(connection)
+                    code, reply = next(iter(e.recipients.values()))
+                    raise SendError(f'{code} {reply.decode(errors="replace")}', permanent=code >= 500)
+                except smtplib.SMTPResponseException as e:
+                    self._checkin(connection)
+                    raise SendError(f'{e.smtp_code} {e.smtp_error.decode(errors="replace")}', permanent=e.smtp_code >= 500)
+                except (smtplib.SMTPException, OSError) as e:
+                    # Usually a pooled connection the server closed; one retry on a fresh one
+                    connection.close()
+                    if retry:
+                        raise SendError(str(e) or e.__class__.__name__)
+                else:
+                    self._checkin(connection)
+                    return
+    
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+def configure_outbox():
+    """Read EMAIL_BACKEND (smtp or memory), SMTP_* and OUTBOX_* settings"""
+    _settings.update(
+        host=os.getenv('SMTP_HOST'),
+        port=int(os.getenv('SMTP_PORT', 587)),
+        username=os.getenv('SMTP_USERNAME'),
+        password=os.getenv('SMTP_PASSWORD'),
+        starttls=os.getenv('SMTP_STARTTLS', 'true').lower() == 'true',
+        ssl=os.getenv('SMTP_SSL', 'false').lower() == 'true',
+        timeout=float(os.getenv('SMTP_TIMEOUT', 30)),
+        sender=os.getenv('MAIL_FROM', 'wedding@localhost'),
+        concurrency=max(1, int(os.getenv('OUTBOX_CONCURRENCY', 4))),
+        domain_rate=Limit.parse(os.getenv('OUTBOX_DOMAIN_RATE', '120/60')),
+        max_attempts=max(1, int(os.getenv('OUTBOX_MAX_ATTEMPTS', 4)))
+    )
+    # memory only when asked for: as a default it would mark every message sent
+    _settings['backend'] = os.getenv('EMAIL_BACKEND', 'smtp')
+    if _settings['backend'] not in ('smtp', 'memory'):
+        raise RuntimeError(f"EMAIL_BACKEND must be smtp or memory, not '{_settings['backend']}'")
+    if not email_configured():
+        logger.warning('SMTP_HOST is not set; outbox messages stay queued until it is')
+
+def email_configured():
+    """False when the smtp backend has no SMTP_HOST; nothing is sent then"""
+    return _settings['backend'] == 'memory' or bool(_settings['host'])
+
+def make_transport():
+    if not email_configured():
+        raise RuntimeError('Email sending is not configured: set SMTP_HOST')
+    if _settings['backend'] == 'memory':
+        return memory_transport
+    return SMTPPool(
+        _settings['host'], _settings['port'], _settings['username'], _settings['password'],
+        starttls=_settings['starttls'], use_ssl=_settings['ssl'], timeout=_settings['timeout'],
+        size=_settings['concurrency']
+    )
+
+def _domain(email):
+    return email.rsplit('@', 1)[-1].lower()
+
+def queue_messages(template, campaign=None, rsvp_status=None, attendance_type=None, guest_ids=None):
+    """Add one outbox row per matching guest not yet in the campaign; returns the number added"""
+    table = OutboxMessage.__table__
+    campaign = campaign or template
+    query = select(Guest.id, Guest.email).where(Guest.email.contains('@')).order_by(Guest.id)
+    if rsvp_status:
+        query = query.where(Guest.rsvp_status == rsvp_status)
+    if attendance_type:
+        query = query.where(Guest.attendance_type == attendance_type)
+    if guest_ids is not None:
+        query = query.where(Guest.id.in_(guest_ids))
+    
+    now = datetime.utcnow()
+    added = 0
+    with db.engine.begin() as connection:
+        seen = set(connection.execute(select(table.c.recipient).where(table.c.campaign == campaign)).scalars())
+        if connection.dialect.name in ('postgresql', 'sqlite'):
+            dialect_insert = postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert
+            statement = dialect_insert(table).on_conflict_do_nothing(index_elements=['campaign', 'recipient'])
+        else:
+            statement = table.insert()
+        
+        rows = []
+        for guest_id, email in connection.execute(query):
+            recipient = email.strip()
+            if recipient in seen:
+                continue
+            seen.add(recipient)
+            rows.append({'campaign': campaign, 'template': template, 'guest_id': guest_id, 'recipient': recipient,
+                         'domain': _domain(recipient), 'status': 'queued', 'attempts': 0,
+                         'next_attempt_at': now, 'created_at': now})
+            if len(rows) >= INSERT_BATCH_SIZE:
+                connection.execute(statement, rows)
+                added += len(rows)
+                rows = []
+        if rows:
+            connection.execute(statement, rows)
+            added += len(rows)
+    return added
+
+def render(content, fields):
+    """(subject, body) of a Content template with the guest's fields substituted"""
+    if content.content_type == 'html':
+        fields = {name: html.escape(str(value)) for name, value in fields.items()}
+    subject = Template(content.title or '').safe_substitute(fields)
+    body = Template(content.content).safe_substitute(fields)
+    return subject, body
+
+def _build(row, guests, templates):
+    content = templates.get(row.template)
+    if content is None:
+        content = templates[row.template] = db.session.execute(
+            select(Content.title, Content.content, Content.content_type).where(Content.key == row.template)
+        ).first() or False
+    if content is False:
+        raise SendError(f"Template '{row.template}' not found", permanent=True)
+    fields = guests.get(row.guest_id)
+    if fields is None:
+        raise SendError('Guest no longer exists', permanent=True)
+    
+    subject, body = render(content, {name: '' if value is None else value for name, value in fields.items()})
+    message = EmailMessage()
+    try:
+        message['From'] = _settings['sender']
+        message['To'] = row.recipient
+        # Guest fields come from public registration; a line break in a header is an injection
+        message['Subject'] = ' '.join(subject.splitlines())
+        message['Date'] = formatdate(localtime=False)
+        message['Message-ID'] = make_msgid(domain=_domain(_settings['sender']))
+        message.set_content(body, subtype='html' if content.content_type == 'html' else 'plain')
+    except ValueError as e:
+        # e.g. a recipient address with a line break; retrying cannot fix it
+        raise SendError(f'Invalid message: {e}', permanent=True)
+    return message
+
+def _claim(limit):
+    """Mark up to limit due messages as sending and return them"""
+    table = OutboxMessage.__table__
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        due = select(table.c.id).where(table.c.status == 'queued', table.c.next_attempt_at <= now).order_by(table.c.id).limit(limit)
+        if connection.dialect.name == 'postgresql':
+            # Concurrent dispatchers take disjoint rows instead of waiting on each other
+            due = due.with_for_update(skip_locked=True)
+        return connection.execute(
+            update(table).where(table.c.id.in_(due), table.c.status == 'queued')
+            .values(status='sending', claimed_at=now)
+            .returning(table.c.id, table.c.template, table.c.guest_id, table.c.recipient, table.c.domain, table.c.attempts)
+        ).all()
+
+def _write_outcomes(outcomes):
+    """One executemany UPDATE for a round of sends"""
+    if not outcomes:
+        return
+    table = OutboxMessage.__table__
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(table).where(table.c.id == bindparam('b_id')).values(
+                status=bindparam('b_status'), attempts=bindparam('b_attempts'),
+                next_attempt_at=bindparam('b_next_attempt_at'), last_error=bindparam('b_last_error'),
+                sent_at=bindparam('b_sent_at')
+            ),
+            outcomes
+        )
+
+def _outcome(row, error=None):
+    now = datetime.utcnow()
+    if error is None:
+        return {'b_id': row.id, 'b_status': 'sent', 'b_attempts': row.attempts + 1, 'b_next_attempt_at': now,
+                'b_last_error': None, 'b_sent_at': now}
+    attempts = row.attempts + 1
+    if error.permanent or attempts >= _settings['max_attempts']:
+        status, next_attempt_at = 'failed', now
+    else:
+        status, next_attempt_at = 'queued', now + timedelta(seconds=RETRY_BASE_SECONDS * 3 ** (attempts - 1))
+    return {'b_id': row.id, 'b_status': status, 'b_attempts': attempts, 'b_next_attempt_at': next_attempt_at,
+            'b_last_error': str(error)[:1000], 'b_sent_at': None}
+
+def _release_stale():
+    table = OutboxMessage.__table__
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(table).where(table.c.status == 'sending', table.c.claimed_at < datetime.utcnow() - STALE_CLAIM)
+            .values(status='queued')
+        )
+
+def _next_due():
+    """Seconds until the next queued message is due, or None if none is queued"""
+    with db.engine.connect() as connection:
+        due = connection.execute(
+            select(func.min(OutboxMessage.next_attempt_at)).where(OutboxMessage.status == 'queued')
+        ).scalar()
+    return None if due is None else max(0.0, (due - datetime.utcnow()).total_seconds())
+
+def _guest_fields(rows):
+    ids = {row.guest_id for row in rows if row.guest_id is not None}
+    if not ids:
+        return {}
+    columns = [getattr(Guest, name) for name in TEMPLATE_FIELDS]
+    result = db.session.execute(select(Guest.id, *columns).where(Guest.id.in_(ids))).all()
+    return {row.id: dict(zip(TEMPLATE_FIELDS, row[1:])) for row in result}
+
+def dispatch(progress=None, transport=None):
+    """Send every due outbox message; returns counts and the send rate.
+    
+    Claims CLAIM_SIZE messages at a time and sends them on
+    OUTBOX_CONCURRENCY threads, at most OUTBOX_DOMAIN_RATE per recipient
+    domain; a throttled domain waits in memory while other domains go
+    ahead. Each round's outcomes are written in one batch. Transient
+    failures are retried with backoff up to OUTBOX_MAX_ATTEMPTS.
+    """
+    owned = transport is None
+    transport = transport or make_transport()
+    limiter = LocalBuckets(_settings['domain_rate'])
+    _release_stale()
+    with db.engine.connect() as connection:
+        total = connection.execute(
+            select(func.count()).select_from(OutboxMessage).where(OutboxMessage.status == 'queued')
+        ).scalar()
+    
+    counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+    backlog = {}  # domain -> claimed rows waiting for a token
+    ready = []  # claimed rows of the round in progress, until their outcomes are written
+    templates = {}
+    started = time.perf_counter()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=_settings['concurrency'], thread_name_prefix='outbox') as executor:
+            while True:
+                waiting = sum(len(rows) for rows in backlog.values())
+                if waiting < CLAIM_SIZE:
+                    for row in _claim(CLAIM_SIZE - waiting):
+                        backlog.setdefault(row.domain, deque()).append(row)
+                if not backlog:
+                    wait = _next_due()
+                    if wait is None or wait > MAX_WAIT_SECONDS:
+                        break
+                    time.sleep(max(wait, 0.05))
+                    continue
+                
+                ready, throttled = [], []
+                for domain, rows in list(backlog.items()):
+                    while rows:
+                        wait = limiter.take(domain)
+                        if wait:
+                            throttled.append(wait)
+                            break
+                        ready.append(rows.popleft())
+                    if not rows:
+                        del backlog[domain]
+                if not ready:
+                    time.sleep(min(throttled))
+                    continue
+                
+                guests = _guest_fields(ready)
+                sends, outcomes = [], []
+                for row in ready:
+                    try:
+                        sends.append((row, executor.submit(transport.send, _build(row, guests, templates))))
+                    except SendError as e:
+                        outcomes.append(_outcome(row, e))
+                for row, future in sends:
+                    try:
+                        future.result()
+                    except SendError as e:
+                        outcomes.append(_outcome(row, e))
+                    else:
+                        outcomes.append(_outcome(row))
+                _write_outcomes(outcomes)
+                ready = []
+                db.session.rollback()
+                
+                for outcome in outcomes:
+                    counts['sent' if outcome['b_status'] == 'sent' else
+                           'failed' if outcome['b_status'] == 'failed' else 'retrying'] += 1
+                if progress:
+                    progress(counts['sent'] + counts['failed'], max(total, counts['sent'] + counts['failed']))
+    finally:
+        if owned:
+            transport.close()
+        # Claimed rows a crash left behind go back to the queue
+        stranded = [row.id for rows in backlog.values() for row in rows] + [row.id for row in ready]
+        if stranded:
+            table = OutboxMessage.__table__
+            with db.engine.begin() as connection:
+                connection.execute(update(table).where(table.c.id.in_(stranded)).values(status='queued'))
+    
+    elapsed = time.perf_counter() - started
+    counts['seconds'] = round(elapsed, 3)
+    counts['messages_per_second'] = round(counts['sent'] / elapsed, 1) if elapsed else 0.0
+    logger.info('Outbox dispatch finished: %s', counts)
+    return counts
+
+@job_handler('outbox.send')
+def _dispatch_job(params, progress):
+    return dispatch(progress)
+
+def campaign_counts():
+    """{campaign: {status: count}} over the whole outbox"""
+    rows = db.session.execute(
+        select(OutboxMessage.campaign, OutboxMessage.status, func.count())
+        .group_by(OutboxMessage.campaign, OutboxMessage.status)
+    ).all()
+    campaigns = {}
+    for campaign, status, count in rows:
+        campaigns.setdefault(campaign, dict.fromkeys(OUTBOX_STATUSES, 0))[status] = count
+    return campaigns
@@ -0,0 +1,87 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import or_, and_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class PaginationError(ValueError):
+    """Raised for a malformed limit, cursor or fields parameter"""
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse the ?limit= parameter, clamped to maximum"""
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('limit must be an integer')
+    if limit < 1:
+        raise PaginationError('limit must be positive')
+    return min(limit, maximum)
+
+def parse_offset(value):
+    """Parse the ?offset= parameter for ranked (non-keyset) results"""
+    if value in (None, ''):
+        return 0
+    try:
+        offset = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('offset must be an integer')
+    if offset < 0:
+        raise PaginationError('offset must not be negative')
+    return offset
+
+def parse_fields(value, allowed, required=()):
+    """Parse ?fields=a,b,c into a list of column names.
+    
+    Returns None when no projection was requested. Required fields
+    (e.g. the keyset columns) are always included.
+    """
+    if not value:
+        return None
+    
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise PaginationError(f"Unknown field(s): {', '.join(unknown)}")
+    
+    for field in required:
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+def encode_cursor(timestamp, row_id):
+    """Opaque cursor for the keyset position (timestamp, id)"""
+    payload = json.dumps([timestamp.isoformat() if timestamp else None, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor()"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(timestamp) if timestamp else None), int(row_id)
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+
+def order_desc(timestamp_column, id_column):
+    """ORDER BY for keyset pages: timestamp DESC NULLS LAST, id DESC.
+    
+    NULLS LAST is explicit because PostgreSQL would otherwise sort NULLs
+    first, and after_cursor_desc() relies on them coming last.
+    """
+    return timestamp_column.desc().nulls_last(), id_column.desc()
+
+def after_cursor_desc(timestamp_column, id_column, cursor):
+    """Filter for rows after the cursor in order_desc() order"""
+    timestamp, row_id = decode_cursor(cursor)
+    if timestamp is None:
+        # Rows without a timestamp sort last; continue by id among them
+        return and_(timestamp_column.is_(None), id_column < row_id)
+    return or_(
+        timestamp_column < timestamp,
+        and_(timestamp_column == timestamp, id_column < row_id),
+        timestamp_column.is_(None)
+    )
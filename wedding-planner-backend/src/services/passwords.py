@@ -0,0 +1,115 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Hashing backends: 'bcrypt' or 'werkzeug' (scrypt/pbkdf2 via werkzeug.security)
+SCHEMES = ('bcrypt', 'werkzeug')
+
+_config = {
+    'scheme': 'werkzeug',
+    'bcrypt_rounds': 12,
+    'werkzeug_method': 'scrypt',
+    'werkzeug_prefix': None,
+    'workers': 0
+}
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+def configure(scheme=None, bcrypt_rounds=None, werkzeug_method=None, workers=None):
+    """Set the hashing backend, its cost and the size of the hashing pool.
+    
+    workers=0 hashes inline on the request thread. Pool processes start
+    with forkserver (or spawn), which re-imports __main__: scripts that
+    enable the pool need an if __name__ == '__main__' guard.
+    """
+    global _executor, _slots
+    
+    if scheme is not None:
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password hashing scheme '{scheme}'")
+        _config['scheme'] = scheme
+    if bcrypt_rounds is not None:
+        _config['bcrypt_rounds'] = int(bcrypt_rounds)
+    if werkzeug_method is not None:
+        _config['werkzeug_method'] = werkzeug_method
+    if workers is not None:
+        _config['workers'] = int(workers)
+    
+    # Werkzeug expands e.g. 'scrypt' to 'scrypt:32768:8:1'; remember the full prefix
+    _config['werkzeug_prefix'] = generate_password_hash('', _config['werkzeug_method']).split('$', 1)[0]
+    
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+        _slots = None
+
+def configure_from_env():
+    configure(
+        scheme=os.getenv('PASSWORD_HASHER', 'werkzeug'),
+        bcrypt_rounds=os.getenv('BCRYPT_ROUNDS', 12),
+        werkzeug_method=os.getenv('WERKZEUG_HASH_METHOD', 'scrypt'),
+        workers=os.getenv('PASSWORD_HASH_WORKERS', 0)
+    )
+
+def _hash(password, scheme, bcrypt_rounds, werkzeug_method):
+    if scheme == 'bcrypt':
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=bcrypt_rounds)).decode('ascii')
+    return generate_password_hash(password, werkzeug_method)
+
+def _verify(password_hash, password):
+    if password_hash.startswith(('$2a$', '$2b$', '$2y$')):
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('ascii'))
+    return check_password_hash(password_hash, password)
+
+def _run(fn, *args):
+    """Run fn in the hashing pool, or inline when no pool is configured"""
+    global _executor, _slots
+    
+    workers = _config['workers']
+    if workers <= 0:
+        return fn(*args)
+    
+    with _lock:
+        if _executor is None:
+            # Not fork: this runs inside threaded gunicorn workers, and a forked
+            # child could inherit a lock (logging, the DB pool) held by another thread
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            # Bound the queue so a login burst cannot pile up unbounded work
+            _slots = threading.BoundedSemaphore(workers * 4)
+        executor, slots = _executor, _slots
+    
+    with slots:
+        return executor.submit(fn, *args).result()
+
+def hash_password(password):
+    """Hash a password with the configured backend and cost"""
+    return _run(_hash, password, _config['scheme'], _config['bcrypt_rounds'], _config['werkzeug_method'])
+
+def verify_password(password_hash, password):
+    """Check a password against a hash produced by either backend"""
+    if not password_hash:
+        return False
+    return _run(_verify, password_hash, password)
+
+def needs_rehash(password_hash):
+    """True when a hash was made with a different backend or cost than configured"""
+    if _config['werkzeug_prefix'] is None:
+        configure()
+    
+    is_bcrypt = password_hash.startswith(('$2a$', '$2b$', '$2y$'))
+    if _config['scheme'] == 'bcrypt':
+        return not is_bcrypt or int(password_hash.split('$')[2]) != _config['bcrypt_rounds']
+    return is_bcrypt or password_hash.split('$', 1)[0] != _config['werkzeug_prefix']
+
+def _shutdown():
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+atexit.register(_shutdown)
@@ -0,0 +1,189 @@
+import logging
+import os
+import threading
+import time
+from flask import Response, g, has_app_context, request
+from flask.json.provider import JSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.services.admin_auth import admin_required
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+class Histogram:
+    """Cumulative-bucket histogram per label value, Prometheus style"""
+    
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+    
+    def observe(self, label, value):
+        series = self._series.get(label)
+        if series is None:
+            series = self._series[label] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+    
+    def render(self, pid):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label, (counts, total, count) in sorted(self._series.items()):
+            labels = f'endpoint="{label}",pid="{pid}"'
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total:.6f}')
+            lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+class RequestMetrics:
+    """Per-endpoint request histograms shared by all threads of a process.
+    
+    Every series carries a pid label: with several gunicorn workers a scrape
+    reaches one of them, so sum by (endpoint) over pids for the totals.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build()
+    
+    def reset(self):
+        with self._lock:
+            self._build()
+    
+    def _build(self):
+        self.duration = Histogram('http_request_duration_seconds', 'Wall time per request', DURATION_BUCKETS)
+        self.sql_statements = Histogram('http_request_sql_statements', 'SQL statements per request', STATEMENT_BUCKETS)
+        self.sql_duration = Histogram('http_request_sql_duration_seconds', 'SQL time per request', DURATION_BUCKETS)
+        self.serialize_duration = Histogram('http_request_serialize_duration_seconds', 'JSON serialization time per request', DURATION_BUCKETS)
+        self.n_plus_one = {}
+    
+    def observe(self, endpoint, profile, wall):
+        with self._lock:
+            self.duration.observe(endpoint, wall)
+            self.sql_statements.observe(endpoint, profile['sql_count'])
+            self.sql_duration.observe(endpoint, profile['sql_time'])
+            self.serialize_duration.observe(endpoint, profile['serialize_time'])
+    
+    def flag_n_plus_one(self, endpoint):
+        with self._lock:
+            self.n_plus_one[endpoint] = self.n_plus_one.get(endpoint, 0) + 1
+    
+    def render(self):
+        pid = os.getpid()
+        with self._lock:
+            lines = []
+            for histogram in (self.duration, self.sql_statements, self.sql_duration, self.serialize_duration):
+                lines.extend(histogram.render(pid))
+            lines.append('# HELP http_request_n_plus_one_total Requests over the SQL statement threshold')
+            lines.append('# TYPE http_request_n_plus_one_total counter')
+            for endpoint, count in sorted(self.n_plus_one.items()):
+                lines.append(f'http_request_n_plus_one_total{{endpoint="{endpoint}",pid="{pid}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+metrics = RequestMetrics()
+
+def _current_profile():
+    if not has_app_context():
+        return None
+    return g.get('_profile')
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile()
+    starts = conn.info.get('profile_query_start')
+    if profile is None or not starts:
+        return
+    profile['sql_count'] += 1
+    profile['sql_time'] += time.perf_counter() - starts.pop()
+
+def _add_serialize_time(start):
+    profile = _current_profile()
+    if profile is not None:
+        profile['serialize_time'] += time.perf_counter() - start
+
+class TimedJSONProvider(JSONProvider):
+    """Wraps the app's JSON provider, adding encode time to the request profile"""
+    
+    def __init__(self, app, inner):
+        super().__init__(app)
+        self.inner = inner
+    
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.inner.dumps(obj, **kwargs)
+        finally:
+            _add_serialize_time(start)
+    
+    def loads(self, s, **kwargs):
+        return self.inner.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.inner.response(*args, **kwargs)
+        finally:
+            _add_serialize_time(start)
+
+def _start_profile():
+    g._profile = {'start': time.perf_counter(), 'sql_count': 0, 'sql_time': 0.0, 'serialize_time': 0.0}
+
+def _finish_profile(response, threshold):
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return response
+    
+    wall = time.perf_counter() - profile['start']
+    endpoint = request.endpoint or 'unmatched'
+    metrics.observe(endpoint, profile, wall)
+    
+    response.headers.add('Server-Timing', ', '.join([
+        f'app;dur={wall * 1000:.2f}',
+        f'db;dur={profile["sql_time"] * 1000:.2f};desc="{profile["sql_count"]} queries"',
+        f'serialize;dur={profile["serialize_time"] * 1000:.2f}'
+    ]))
+    
+    if threshold and profile['sql_count'] > threshold:
+        metrics.flag_n_plus_one(endpoint)
+        logger.warning(
+            'Possible N+1: %s %s issued %d SQL statements (threshold %d)',
+            request.method, request.path, profile['sql_count'], threshold
+        )
+    return response
+
+def init_profiling(app):
+    """Opt-in request profiling: Server-Timing headers, /api/metrics and an N+1 warning.
+    
+    Enabled by PROFILING_ENABLED=true; PROFILING_N_PLUS_ONE_THRESHOLD sets the
+    per-request statement count that triggers a warning (0 disables it).
+    """
+    if os.getenv('PROFILING_ENABLED', 'false').lower() != 'true':
+        return False
+    
+    threshold = int(os.getenv('PROFILING_N_PLUS_ONE_THRESHOLD', 20))
+    
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    
+    app.json = TimedJSONProvider(app, app.json)
+    app.before_request(_start_profile)
+    app.after_request(lambda response: _finish_profile(response, threshold))
+    
+    @app.route('/api/metrics')
+    @admin_required
+    def prometheus_metrics():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4', headers={'X-Worker-Pid': str(os.getpid())})
+    
+    return True
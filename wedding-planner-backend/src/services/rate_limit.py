@@ -0,0 +1,216 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import jsonify, request
+from src.services import shared_store
+
+# Blueprint -> (IP limit, username limit) unless RATE_LIMIT_<BLUEPRINT>_IP /
+# RATE_LIMIT_<BLUEPRINT>_USERNAME override them, as "<attempts>/<seconds>"
+DEFAULT_LIMITS = {
+    'auth': ('20/60', '5/60'),
+    'guest_auth': ('20/60', '5/60'),
+}
+
+class Limit:
+    """capacity attempts, refilled evenly over period seconds"""
+    
+    def __init__(self, capacity, period):
+        if capacity < 1 or period <= 0:
+            raise ValueError('A rate limit needs a positive capacity and period')
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+    
+    @classmethod
+    def parse(cls, value):
+        try:
+            capacity, period = value.split('/')
+            return cls(int(capacity), float(period))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit '{value}', expected <attempts>/<seconds>")
+    
+    def __repr__(self):
+        return f'{self.capacity}/{self.period:g}'
+
+class LocalBuckets:
+    """Token buckets for one limit, in a per-process LRU of key -> (tokens, updated).
+    
+    Keys are kept in last-touched order, so the front holds the bucket that
+    refilled longest ago; a bucket that has refilled completely is the same
+    as no bucket and is evicted from there, O(1) amortized per take().
+    """
+    
+    def __init__(self, limit, maxsize=100000):
+        self.limit = limit
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def take(self, key):
+        """Spend one token; 0 if allowed, else seconds until one is available"""
+        limit = self.limit
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                tokens = limit.capacity
+            else:
+                tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                wait = 0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (1 - tokens) / limit.rate
+            self._evict(now)
+        return wait
+    
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+    
+    def _evict(self, now):
+        buckets = self._buckets
+        while buckets:
+            key, (tokens, updated) = next(iter(buckets.items()))
+            full = tokens + (now - updated) * self.limit.rate >= self.limit.capacity
+            if not full and len(buckets) <= self.maxsize:
+                break
+            buckets.popitem(last=False)
+    
+    def __len__(self):
+        return len(self._buckets)
+
+class SharedBuckets:
+    """The same limit across workers, in a Redis-style store.
+    
+    The store subset has no scripting, so instead of a read-modify-write
+    bucket each key gets an INCR counter per period-long window: atomic,
+    O(1), and expired by the store. Bursts can reach twice the capacity
+    across a window boundary.
+    """
+    
+    def __init__(self, client, limit, prefix):
+        self.client = client
+        self.limit = limit
+        self.prefix = prefix
+    
+    def take(self, key):
+        now = time.time()
+        window = math.floor(now / self.limit.period)
+        name = f'{self.prefix}{key}:{window}'
+        count = self.client.incr(name)
+        if count == 1:
+            self.client.expire(name, math.ceil(self.limit.period))
+        if count <= self.limit.capacity:
+            return 0
+        return (window + 1) * self.limit.period - now
+    
+    def reset(self, key):
+        window = math.floor(time.time() / self.limit.period)
+        self.client.delete(f'{self.prefix}{key}:{window}')
+
+class RateLimiter:
+    """Per-IP and per-username attempt limits for one blueprint's logins"""
+    
+    def __init__(self, name, by_ip, by_username):
+        self.name = name
+        self.by_ip = by_ip
+        self.by_username = by_username
+        self.allowed = 0
+        self.rejected = 0
+    
+    def check(self, ip, username):
+        """0 if the attempt may proceed, else seconds to wait"""
+        wait = self.by_ip.take(ip)
+        if not wait and username:
+            wait = self.by_username.take(username)
+        if wait:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return wait
+    
+    def succeeded(self, username):
+        # Username limits count consecutive failures, not successful logins
+        if username:
+            self.by_username.reset(username)
+    
+    def stats(self):
+        return {
+            'ip_limit': repr(self.by_ip.limit),
+            'username_limit': repr(self.by_username.limit),
+            'allowed': self.allowed,
+            'rejected': self.rejected
+        }
+
+limiters = {}
+_settings = {'proxy_hops': 0}
+
+def _limit(blueprint, scope, default):
+    return Limit.parse(os.getenv(f'RATE_LIMIT_{blueprint.upper()}_{scope}', default))
+
+def configure_rate_limits():
+    """Build the login limiters from RATE_LIMIT_* (RATE_LIMIT_ENABLED=false turns them off)"""
+    limiters.clear()
+    _settings['proxy_hops'] = int(os.getenv('RATE_LIMIT_PROXY_HOPS', 0))
+    if os.getenv('RATE_LIMIT_ENABLED', 'true').lower() != 'true':
+        return
+    
+    shared = os.getenv('RATE_LIMIT_BACKEND', 'local') == 'shared'
+    client = shared_store.connect(os.getenv('SHARED_STORE_URL')) if shared else None
+    for blueprint, (ip_default, username_default) in DEFAULT_LIMITS.items():
+        by_ip = _limit(blueprint, 'IP', ip_default)
+        by_username = _limit(blueprint, 'USERNAME', username_default)
+        if shared:
+            limiters[blueprint] = RateLimiter(
+                blueprint,
+                SharedBuckets(client, by_ip, f'wedding:ratelimit:{blueprint}:ip:'),
+                SharedBuckets(client, by_username, f'wedding:ratelimit:{blueprint}:user:')
+            )
+        else:
+            limiters[blueprint] = RateLimiter(blueprint, LocalBuckets(by_ip), LocalBuckets(by_username))
+
+def client_ip():
+    """Remote address, or the client address a trusted proxy chain added (RATE_LIMIT_PROXY_HOPS)"""
+    hops = _settings['proxy_hops']
+    if hops:
+        route = request.access_route
+        return route[-hops] if len(route) >= hops else route[0]
+    return request.remote_addr or 'unknown'
+
+def login_rate_limited(field):
+    """Reject a login with 429, before any lookup or hashing, once the
+    client IP or the account named by the JSON field is over its limit.
+    
+    Limits come from the blueprint's limiter; without one the view runs
+    unthrottled.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            limiter = limiters.get(request.blueprint)
+            if limiter is None:
+                return view(*args, **kwargs)
+            
+            data = request.get_json(silent=True)
+            username = data.get(field) if isinstance(data, dict) else None
+            username = str(username).strip().lower() if username else None
+            
+            wait = limiter.check(client_ip(), username)
+            if wait:
+                response = jsonify({'error': 'Too many login attempts. Try again later.'})
+                response.headers['Retry-After'] = str(math.ceil(wait))
+                return response, 429
+            
+            response = view(*args, **kwargs)
+            status = response[1] if isinstance(response, tuple) else response.status_code
+            if status == 200:
+                limiter.succeeded(username)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,140 @@
+import os
+from datetime import datetime
+from flask import has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from src.models import db, Guest, Table, SeatAssignment, SeatingConstraint
+from src.services.jobs import enqueue, has_pending, job_handler
+from src.services.seating_solver import SeatingProblem, solve
+
+MAX_ITERATIONS = 2000000
+
+_settings = {'auto_resolve': True}
+
+def load_problem(incremental=False):
+    """SeatingProblem for the confirmed guests, tables and constraints in the database"""
+    guests = db.session.execute(
+        select(Guest.id, Guest.number_of_guests).where(Guest.rsvp_status == 'confirmed').order_by(Guest.id)
+    ).all()
+    tables = db.session.execute(select(Table.id, Table.capacity).order_by(Table.id)).all()
+    constraints = db.session.execute(select(
+        SeatingConstraint.kind, SeatingConstraint.guest_id, SeatingConstraint.other_guest_id, SeatingConstraint.weight
+    )).all()
+    current = db.session.execute(select(SeatAssignment.guest_id, SeatAssignment.table_id, SeatAssignment.pinned)).all()
+    
+    pinned = {row.guest_id: row.table_id for row in current if row.pinned}
+    previous = {row.guest_id: row.table_id for row in current} if incremental else None
+    return SeatingProblem(
+        [tuple(row) for row in guests], [tuple(row) for row in tables],
+        [tuple(row) for row in constraints], previous=previous, pinned=pinned
+    )
+
+def save_assignments(result):
+    """Write the solver's assignment, touching only rows that changed"""
+    assignment = result['assignment']
+    seats = dict(db.session.execute(select(Guest.id, Guest.number_of_guests).where(Guest.id.in_(assignment))).all()) if assignment else {}
+    current = {row.guest_id: row for row in SeatAssignment.query.all()}
+    now = datetime.utcnow()
+    changed = 0
+    
+    for guest_id, row in current.items():
+        if assignment.get(guest_id) is None:
+            db.session.delete(row)
+            changed += 1
+    for guest_id, table_id in assignment.items():
+        if table_id is None:
+            continue
+        row = current.get(guest_id)
+        count = max(1, seats.get(guest_id) or 1)
+        if row is None:
+            db.session.add(SeatAssignment(guest_id=guest_id, table_id=table_id, seats=count, assigned_at=now))
+            changed += 1
+        elif row.table_id != table_id or row.seats != count:
+            row.table_id = table_id
+            row.seats = count
+            row.assigned_at = now
+            changed += 1
+    db.session.commit()
+    return changed
+
+def run_solve(iterations=None, seed=None, incremental=False):
+    """Solve and save the seating plan; returns the solver summary"""
+    problem = load_problem(incremental)
+    result = solve(problem, iterations=iterations, seed=seed, incremental=incremental)
+    result['stats']['changed_rows'] = save_assignments(result)
+    result.pop('assignment')
+    return result
+
+@job_handler('seating.solve')
+def _solve_job(params, progress):
+    return run_solve(**params)
+
+def submit_solve(iterations=None, seed=None, incremental=False, user_id=None):
+    """Queue a solve on the job workers; returns the job id"""
+    return enqueue('seating.solve', {'iterations': iterations, 'seed': seed, 'incremental': incremental}, user_id)
+
+def plan():
+    """Tables with their seated guests, plus confirmed guests without a seat"""
+    tables = {table.id: dict(table.to_dict(), guests=[], seated=0) for table in Table.query.order_by(Table.id)}
+    rows = db.session.execute(
+        select(SeatAssignment.table_id, SeatAssignment.seats, SeatAssignment.pinned,
+               Guest.id, Guest.first_name, Guest.last_name)
+        .join(Guest, Guest.id == SeatAssignment.guest_id)
+        .order_by(SeatAssignment.table_id, Guest.last_name, Guest.first_name)
+    ).all()
+    for row in rows:
+        table = tables[row.table_id]
+        table['guests'].append({'guest_id': row.id, 'first_name': row.first_name, 'last_name': row.last_name,
+                                'seats': row.seats, 'pinned': row.pinned})
+        table['seated'] += row.seats
+    
+    unseated = db.session.execute(
+        select(Guest.id, Guest.first_name, Guest.last_name, Guest.number_of_guests)
+        .outerjoin(SeatAssignment, SeatAssignment.guest_id == Guest.id)
+        .where(Guest.rsvp_status == 'confirmed', SeatAssignment.id.is_(None))
+        .order_by(Guest.last_name, Guest.first_name)
+    ).all()
+    return {
+        'tables': list(tables.values()),
+        'unseated': [{'guest_id': row.id, 'first_name': row.first_name, 'last_name': row.last_name,
+                      'seats': row.number_of_guests or 1} for row in unseated]
+    }
+
+def configure_seating():
+    """SEATING_AUTO_RESOLVE=false stops RSVP changes from queueing a re-solve"""
+    _settings['auto_resolve'] = os.getenv('SEATING_AUTO_RESOLVE', 'true').lower() == 'true'
+
+def _seating_changed(guest):
+    state = inspect(guest)
+    return any(state.attrs[name].history.has_changes() for name in ('rsvp_status', 'number_of_guests'))
+
+def _after_flush(session, flush_context):
+    changed = any(isinstance(obj, Guest) and obj.rsvp_status == 'confirmed' for obj in session.new) or any(
+        isinstance(obj, Guest) and _seating_changed(obj) for obj in session.dirty
+    )
+    if changed:
+        session.info['seating_dirty'] = True
+
+def _after_commit(session):
+    if not session.info.pop('seating_dirty', None):
+        return
+    if not _settings['auto_resolve'] or not has_app_context():
+        return
+    # Only once a plan exists, and one queued re-solve covers any burst of RSVPs
+    if has_pending('seating.solve'):
+        return
+    with db.engine.connect() as connection:
+        seated = connection.execute(select(SeatAssignment.id).limit(1)).first()
+    if seated is not None:
+        submit_solve(incremental=True)
+
+def _after_rollback(session):
+    session.info.pop('seating_dirty', None)
+
+def register_seating_listeners():
+    """Queue an incremental re-solve after a commit that changes an RSVP or party size"""
+    if event.contains(Session, 'after_commit', _after_commit):
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
@@ -0,0 +1,321 @@
+import time
+import numpy as np
+
+HARD_KINDS = ('together', 'apart')
+SOFT_KINDS = ('prefer', 'avoid')
+CONSTRAINT_KINDS = HARD_KINDS + SOFT_KINDS
+
+# Score of seating a keep-apart pair at one table; large enough that no
+# combination of soft preferences outweighs it
+APART_PENALTY = 1000.0
+# Incremental re-solves: score per seat for staying at the previous table
+STABILITY_BONUS = 2.0
+# Share of annealing steps that move a party toward its best table; the
+# rest are random swaps and random moves in equal parts
+TARGETED_SHARE = 0.3
+
+class SeatingProblem:
+    """Guests, tables and constraints compiled to arrays over parties.
+    
+    Guests linked by together constraints form one party (union-find) that
+    is always seated at a single table; a party's weight is the sum of its
+    guests' seats. Pairwise scores live in a dense party x party matrix.
+    """
+    
+    def __init__(self, guests, tables, constraints, previous=None, pinned=None):
+        # guests: [(guest_id, seats)], tables: [(table_id, capacity)],
+        # constraints: [(kind, guest_id, other_guest_id, weight)],
+        # previous/pinned: {guest_id: table_id}
+        previous = previous or {}
+        pinned = pinned or {}
+        guest_ids = [guest_id for guest_id, _ in guests]
+        index = {guest_id: i for i, guest_id in enumerate(guest_ids)}
+        
+        parent = list(range(len(guest_ids)))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for kind, a, b, _ in constraints:
+            if kind == 'together' and a in index and b in index:
+                parent[find(index[a])] = find(index[b])
+        
+        roots = {}
+        self.members = []
+        for i, guest_id in enumerate(guest_ids):
+            root = find(i)
+            if root not in roots:
+                roots[root] = len(self.members)
+                self.members.append([])
+            self.members[roots[root]].append(guest_id)
+        party_of = {guest_id: roots[find(i)] for i, guest_id in enumerate(guest_ids)}
+        
+        count = len(self.members)
+        seats = dict(guests)
+        self.weights = np.array([sum(max(1, seats[g] or 1) for g in members) for members in self.members], dtype=np.int64)
+        self.table_ids = [table_id for table_id, _ in tables]
+        self.capacity = np.array([capacity for _, capacity in tables], dtype=np.int64)
+        table_index = {table_id: t for t, table_id in enumerate(self.table_ids)}
+        
+        self.scores = np.zeros((count, count), dtype=np.float64)
+        self.apart = []
+        self.soft = []
+        self.conflicts = []
+        for kind, a, b, weight in constraints:
+            if a not in party_of or b not in party_of or kind == 'together':
+                continue
+            u, v = party_of[a], party_of[b]
+            if u == v:
+                # apart/avoid between guests of one party cannot be honoured
+                if kind == 'apart':
+                    self.conflicts.append((a, b))
+                continue
+            if kind == 'apart':
+                value = -APART_PENALTY
+                self.apart.append((u, v))
+            else:
+                value = abs(weight) if kind == 'prefer' else -abs(weight)
+                self.soft.append((u, v, value))
+            self.scores[u, v] += value
+            self.scores[v, u] += value
+        
+        # Pinned parties stay put; a party's previous table is where most of its seats sat
+        self.pinned = np.full(count, -1, dtype=np.int64)
+        self.home = np.full(count, -1, dtype=np.int64)
+        for u, members in enumerate(self.members):
+            for source, target in ((pinned, self.pinned), (previous, self.home)):
+                votes = {}
+                for guest_id in members:
+                    t = table_index.get(source.get(guest_id))
+                    if t is not None:
+                        votes[t] = votes.get(t, 0) + max(1, seats[guest_id] or 1)
+                if votes:
+                    target[u] = max(votes, key=votes.get)
+        self.home[self.pinned >= 0] = self.pinned[self.pinned >= 0]
+    
+    def __len__(self):
+        return len(self.members)
+
+class SeatingState:
+    """Assignment of parties to tables plus the running per-table sums.
+    
+    table_scores[u, t] is the summed pair score between party u and the
+    parties at table t, so the score change of any move or swap is a few
+    lookups and applying a move updates two columns.
+    """
+    
+    def __init__(self, problem, assignment, stability=0.0):
+        self.problem = problem
+        self.assignment = assignment
+        self.stability = stability
+        count, tables = len(problem), len(problem.capacity)
+        
+        self.load = np.zeros(tables, dtype=np.int64)
+        self.table_scores = np.zeros((count, tables), dtype=np.float64)
+        for u in np.flatnonzero(assignment >= 0):
+            self.load[assignment[u]] += problem.weights[u]
+            self.table_scores[:, assignment[u]] += problem.scores[:, u]
+    
+    def bonus(self, u, t):
+        home = self.problem.home[u]
+        return self.stability * self.problem.weights[u] if t >= 0 and t == home else 0.0
+    
+    def place(self, u, t):
+        """Move party u to table t (-1 unseats it)"""
+        old = self.assignment[u]
+        column = self.problem.scores[:, u]
+        if old >= 0:
+            self.load[old] -= self.problem.weights[u]
+            self.table_scores[:, old] -= column
+        if t >= 0:
+            self.load[t] += self.problem.weights[u]
+            self.table_scores[:, t] += column
+        self.assignment[u] = t
+    
+    def objective(self):
+        """What the solver maximizes: pair scores (each pair once) plus the stability bonus"""
+        seated = np.flatnonzero(self.assignment >= 0)
+        total = float(self.table_scores[seated, self.assignment[seated]].sum()) / 2
+        if self.stability:
+            at_home = seated[self.assignment[seated] == self.problem.home[seated]]
+            total += self.stability * float(self.problem.weights[at_home].sum())
+        return total
+
+def _greedy(state, order):
+    """Seat each unseated party at the table with the best score that has room"""
+    problem = state.problem
+    for u in order:
+        if state.assignment[u] >= 0:
+            continue
+        room = state.load + problem.weights[u] <= problem.capacity
+        if not room.any():
+            continue
+        gain = np.where(room, state.table_scores[u], -np.inf)
+        home = problem.home[u]
+        if home >= 0 and room[home]:
+            gain[home] += state.stability * problem.weights[u]
+        # Ties go to the emptiest table, so parties spread out evenly
+        gain = gain - (state.load / np.maximum(problem.capacity, 1)) * 1e-6
+        state.place(u, int(np.argmax(gain)))
+
+def _anneal(state, movable, iterations, start_temperature, end_temperature, rng):
+    problem = state.problem
+    weights = problem.weights
+    capacity = problem.capacity
+    scores = problem.scores
+    assignment = state.assignment
+    tables = len(capacity)
+    if len(movable) == 0 or tables < 2 or iterations <= 0:
+        return 0
+    
+    # Random draws for the whole run up front, one NumPy call each
+    first = movable[rng.integers(0, len(movable), iterations)]
+    second = movable[rng.integers(0, len(movable), iterations)]
+    targets = rng.integers(0, tables, iterations)
+    kinds = rng.random(iterations)
+    thresholds = np.log(rng.random(iterations) + 1e-300)
+    cooling = (end_temperature / start_temperature) ** (1.0 / iterations)
+    is_movable = np.zeros(len(problem), dtype=bool)
+    is_movable[movable] = True
+    
+    temperature = start_temperature
+    accepted = 0
+    for i in range(iterations):
+        temperature *= cooling
+        u = first[i]
+        a = assignment[u]
+        if a < 0:
+            continue
+        
+        kind = kinds[i]
+        v = -1
+        if kind < TARGETED_SHARE:
+            # Toward u's best other table: a move if it has room, else a swap
+            # with the party there that gains least from sitting at it
+            row_u = state.table_scores[u].copy()
+            row_u[a] = -np.inf
+            b = int(np.argmax(row_u))
+            if state.load[b] + weights[u] > capacity[b]:
+                at_b = np.flatnonzero((assignment == b) & is_movable)
+                if len(at_b) == 0:
+                    continue
+                v = at_b[np.argmin(state.table_scores[at_b, b])]
+        elif kind < (1 + TARGETED_SHARE) / 2:
+            v = second[i]
+            b = assignment[v]
+        else:
+            b = targets[i]
+        
+        if b < 0 or a == b:
+            continue
+        row_u = state.table_scores[u]
+        if v >= 0:
+            wu, wv = weights[u], weights[v]
+            if state.load[a] - wu + wv > capacity[a] or state.load[b] - wv + wu > capacity[b]:
+                continue
+            row_v = state.table_scores[v]
+            delta = row_u[b] - row_u[a] + row_v[a] - row_v[b] - 2 * scores[u, v]
+            if state.stability:
+                delta += state.bonus(u, b) - state.bonus(u, a) + state.bonus(v, a) - state.bonus(v, b)
+        else:
+            if state.load[b] + weights[u] > capacity[b]:
+                continue
+            delta = row_u[b] - row_u[a]
+            if state.stability:
+                delta += state.bonus(u, b) - state.bonus(u, a)
+        
+        if delta >= 0 or delta > temperature * thresholds[i]:
+            state.place(u, b)
+            if v >= 0:
+                state.place(v, a)
+            accepted += 1
+    return accepted
+
+def solve(problem, iterations=None, seed=None, incremental=False):
+    """Seat every party, maximizing the pair score under the hard constraints.
+    
+    Returns {'assignment': {guest_id: table_id or None}, 'score', 'violations',
+    'stats'}. incremental=True starts from problem.home, favours staying there
+    and runs a short, cool schedule, so one RSVP change moves few guests.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    count = len(problem)
+    assignment = np.full(count, -1, dtype=np.int64)
+    state = SeatingState(problem, assignment, stability=STABILITY_BONUS if incremental else 0.0)
+    
+    for u in np.flatnonzero(problem.pinned >= 0):
+        state.place(u, problem.pinned[u])
+    if incremental:
+        # Keep previous seats that still fit; changed parties are re-placed below
+        for u in np.flatnonzero((problem.home >= 0) & (problem.pinned < 0)):
+            t = problem.home[u]
+            if state.load[t] + problem.weights[u] <= problem.capacity[t]:
+                state.place(u, t)
+    
+    # Heaviest parties first: they are the hardest to fit
+    _greedy(state, np.argsort(-problem.weights, kind='stable'))
+    
+    movable = np.flatnonzero(problem.pinned < 0)
+    if iterations is None:
+        iterations = 20 * count if incremental else min(400000, 400 * count)
+    if incremental:
+        temperatures = (0.5, 0.01)
+    else:
+        temperatures = (1.0, 0.01)
+    
+    start = state.assignment.copy()
+    start_objective = state.objective()
+    accepted = _anneal(state, movable, iterations, temperatures[0], temperatures[1], rng)
+    if state.objective() < start_objective:
+        state = SeatingState(problem, start, stability=state.stability)
+    # Parties a tighter packing may now fit
+    _greedy(state, np.argsort(-problem.weights, kind='stable'))
+    
+    return _result(problem, state, {
+        'parties': count,
+        'iterations': iterations,
+        'accepted': accepted,
+        'incremental': incremental,
+        'seconds': round(time.perf_counter() - started, 3)
+    })
+
+def _result(problem, state, stats):
+    table_ids = problem.table_ids
+    assignment = {}
+    unseated = []
+    for u, members in enumerate(problem.members):
+        t = state.assignment[u]
+        for guest_id in members:
+            assignment[guest_id] = table_ids[t] if t >= 0 else None
+            if t < 0:
+                unseated.append(guest_id)
+    
+    def together(u, v):
+        return state.assignment[u] >= 0 and state.assignment[u] == state.assignment[v]
+    
+    apart = [[problem.members[u][0], problem.members[v][0]] for u, v in problem.apart if together(u, v)]
+    score = sum(value for u, v, value in problem.soft if together(u, v))
+    
+    moved = 0
+    if state.stability:
+        moved = int(sum(
+            len(members) for u, members in enumerate(problem.members)
+            if problem.home[u] >= 0 and state.assignment[u] != problem.home[u]
+        ))
+    stats['moved_guests'] = moved
+    
+    return {
+        'assignment': assignment,
+        # Soft preferences met minus avoidances broken; hard ones are violations
+        'score': round(float(score), 3),
+        'violations': {
+            'unseated': unseated,
+            'apart': apart,
+            'conflicting': [list(pair) for pair in problem.conflicts]
+        },
+        'stats': stats
+    }
@@ -0,0 +1,165 @@
+import json
+import os
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Date, DateTime, Numeric
+from src.models import Guest
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Never serialized; columns in HIDDEN are emitted as null, as to_dict() does
+EXCLUDED = ('password_hash',)
+HIDDEN = {Guest: ('username',)}
+
+_backend = {'name': 'stdlib'}
+_serializers = {}
+
+def _isoformat(value):
+    return value.isoformat()
+
+def _decimal(value):
+    return float(value)
+
+class ModelSerializer:
+    """Column -> JSON-ready value mapping for one model, compiled once.
+    
+    Per row this is a dict build plus a converter call only for Numeric
+    (and, for the stdlib backend, date/datetime) columns, instead of a
+    hand-written to_dict() and a second pass inside jsonify.
+    """
+    
+    def __init__(self, model, fields=None, native_datetimes=False):
+        columns = model.__table__.columns
+        hidden = HIDDEN.get(model, ())
+        names = fields or [column.key for column in columns if column.key not in EXCLUDED]
+        
+        self.model = model
+        self.fields = tuple(names)
+        self.plain = []
+        self.converted = []
+        self.hidden = tuple(name for name in hidden if name in names)
+        for name in names:
+            if name in self.hidden:
+                continue
+            column_type = columns[name].type
+            if isinstance(column_type, Numeric):
+                self.converted.append((name, _decimal))
+            elif isinstance(column_type, (DateTime, Date)) and not native_datetimes:
+                self.converted.append((name, _isoformat))
+            else:
+                self.plain.append(name)
+        # Column order for select_columns() and rows()
+        self.selected = tuple(self.plain) + tuple(name for name, _ in self.converted)
+    
+    def one(self, row):
+        """Serialize an ORM instance or a Row with the same attribute names"""
+        try:
+            # Loaded ORM attributes live in the instance __dict__; reading it
+            # skips the instrumented descriptor on every column
+            source = row.__dict__
+            result = {name: source[name] for name in self.plain}
+            converted = [(name, convert, source[name]) for name, convert in self.converted]
+        except (AttributeError, KeyError):
+            # Rows, or instances with expired/deferred attributes
+            result = {name: getattr(row, name) for name in self.plain}
+            converted = [(name, convert, getattr(row, name)) for name, convert in self.converted]
+        
+        for name, convert, value in converted:
+            result[name] = None if value is None else convert(value)
+        for name in self.hidden:
+            result[name] = None
+        return result
+    
+    def many(self, rows):
+        one = self.one
+        return [one(row) for row in rows]
+    
+    def select_columns(self):
+        """Model attributes to select() for rows(), in matching order"""
+        return [getattr(self.model, name) for name in self.selected]
+    
+    def rows(self, rows):
+        """Serialize plain tuples from select(*select_columns()), no ORM instances"""
+        names = self.selected
+        offset = len(self.plain)
+        converted = [(offset + i, name, convert) for i, (name, convert) in enumerate(self.converted)]
+        hidden = self.hidden
+        
+        result = []
+        for row in rows:
+            item = dict(zip(names, row))
+            for index, name, convert in converted:
+                value = row[index]
+                if value is not None:
+                    item[name] = convert(value)
+            for name in hidden:
+                item[name] = None
+            result.append(item)
+        return result
+
+def serializer_for(model, fields=None):
+    """Cached ModelSerializer for model (optionally limited to fields)"""
+    key = (model, tuple(fields) if fields else None, _backend['name'])
+    serializer = _serializers.get(key)
+    if serializer is None:
+        serializer = _serializers[key] = ModelSerializer(
+            model, fields, native_datetimes=_backend['name'] == 'orjson'
+        )
+    return serializer
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson and writes bytes directly.
+    
+    Keys are sorted like the stdlib provider's, so ETags over bodies stay
+    stable. datetime/date are written as ISO 8601 by orjson itself.
+    """
+    
+    options = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+    
+    def dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=self.default, option=self.options)
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+def backend_name():
+    return _backend['name']
+
+def configure_json(app):
+    """Install the JSON provider selected by JSON_BACKEND (auto, orjson or stdlib)"""
+    choice = os.getenv('JSON_BACKEND', 'auto').lower()
+    if choice == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_BACKEND=orjson but orjson is not installed')
+    
+    if orjson is not None and choice in ('auto', 'orjson'):
+        _backend['name'] = 'orjson'
+        app.json = OrjsonProvider(app)
+    else:
+        _backend['name'] = 'stdlib'
+        app.json = DefaultJSONProvider(app)
+    return _backend['name']
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return float(value)
+
+def dumps_line(obj):
+    """One compact JSON document as str, for NDJSON exports"""
+    if _backend['name'] == 'orjson':
+        return orjson.dumps(obj, default=_plain).decode('utf-8')
+    return json.dumps(obj, default=_plain)
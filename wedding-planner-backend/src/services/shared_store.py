@@ -0,0 +1,167 @@
+import collections
+import fnmatch
+import threading
+import time
+
+class InMemoryStore:
+    """Process-local stand-in for the subset of the Redis client API we use.
+    
+    Lets every shared-store feature run (and be exercised in tests)
+    without a Redis server; values are returned as bytes like redis-py.
+    """
+    
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lists = {}
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._pushed = threading.Condition(self._lock)
+    
+    def _alive(self, name):
+        expires = self._expires.get(name)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return name in self._data
+    
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode('utf-8')
+    
+    def get(self, name):
+        with self._lock:
+            return self._data[name] if self._alive(name) else None
+    
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = self._encode(value)
+            if ex:
+                self._expires[name] = time.monotonic() + ex
+            else:
+                self._expires.pop(name, None)
+            return True
+    
+    def delete(self, *names):
+        with self._lock:
+            removed = 0
+            for name in names:
+                if self._alive(name):
+                    removed += 1
+                self._data.pop(name, None)
+                self._expires.pop(name, None)
+            return removed
+    
+    def incr(self, name, amount=1):
+        with self._lock:
+            value = int(self._data[name]) + amount if self._alive(name) else amount
+            self._data[name] = self._encode(value)
+            return value
+    
+    def expire(self, name, seconds):
+        with self._lock:
+            if not self._alive(name):
+                return False
+            self._expires[name] = time.monotonic() + seconds
+            return True
+    
+    def keys(self, pattern='*'):
+        with self._lock:
+            return [name.encode('utf-8') for name in list(self._data)
+                    if self._alive(name) and fnmatch.fnmatchcase(name, pattern)]
+    
+    def rpush(self, name, *values):
+        with self._lock:
+            items = self._lists.setdefault(name, [])
+            items.extend(self._encode(value) for value in values)
+            self._pushed.notify_all()
+            return len(items)
+    
+    def blpop(self, keys, timeout=0):
+        """(key, value) from the first non-empty list, waiting up to timeout seconds (0: forever)"""
+        if isinstance(keys, str):
+            keys = [keys]
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            while True:
+                for name in keys:
+                    items = self._lists.get(name)
+                    if items:
+                        value = items.pop(0)
+                        if not items:
+                            del self._lists[name]
+                        return name.encode('utf-8'), value
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._pushed.wait(remaining)
+    
+    def llen(self, name):
+        with self._lock:
+            return len(self._lists.get(name, ()))
+    
+    def publish(self, channel, message):
+        with self._lock:
+            receivers = [pubsub for pubsub in self._subscribers if channel in pubsub.channels]
+            for pubsub in receivers:
+                pubsub.messages.append({'type': 'message', 'channel': channel.encode('utf-8'),
+                                        'data': self._encode(message)})
+            self._pushed.notify_all()
+            return len(receivers)
+    
+    def pubsub(self):
+        return InMemoryPubSub(self)
+    
+    def flushall(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self._lists.clear()
+
+class InMemoryPubSub:
+    """Subscriber side of InMemoryStore.publish, shaped like redis-py's PubSub"""
+    
+    def __init__(self, store):
+        self.store = store
+        self.channels = set()
+        self.messages = collections.deque()
+    
+    def subscribe(self, *channels):
+        with self.store._lock:
+            self.channels.update(channels)
+            if self not in self.store._subscribers:
+                self.store._subscribers.append(self)
+    
+    def unsubscribe(self, *channels):
+        with self.store._lock:
+            self.channels.difference_update(channels or list(self.channels))
+    
+    def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        """Next published message, waiting up to timeout seconds; None if there is none"""
+        deadline = time.monotonic() + (timeout or 0)
+        with self.store._lock:
+            while not self.messages:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.store._pushed.wait(remaining)
+            return self.messages.popleft()
+    
+    def close(self):
+        with self.store._lock:
+            self.channels.clear()
+            if self in self.store._subscribers:
+                self.store._subscribers.remove(self)
+
+def connect(url):
+    """Client for a shared store URL: redis://... or memory:// for the stand-in"""
+    if not url or url.startswith('memory://'):
+        return InMemoryStore()
+    
+    try:
+        import redis
+    except ImportError:
+        raise RuntimeError('A redis:// shared store requires the redis package (pip install redis)')
+    return redis.Redis.from_url(url)
@@ -0,0 +1,172 @@
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select, update
+from src.models import db, Task
+from src.services.events import event_bus
+
+MAX_BATCH_SIZE = 1000
+
+# Columns a batch change may set, as in update_task
+TASK_FIELDS = (
+    'title', 'description', 'priority', 'status', 'due_date', 'category',
+    'assigned_to', 'estimated_cost', 'actual_cost'
+)
+
+class BatchError(ValueError):
+    """The batch as a whole is malformed"""
+
+def _parse_fields(item):
+    """Validate the settable fields of one item; returns (values, error)"""
+    values = {}
+    for field in TASK_FIELDS:
+        if field not in item:
+            continue
+        value = item[field]
+        if not isinstance(value, (str, int, float, type(None))):
+            return None, f'Invalid value for {field}'
+        if field == 'due_date' and value:
+            try:
+                value = datetime.strptime(value, '%Y-%m-%d').date()
+            except (TypeError, ValueError):
+                return None, 'Invalid date format. Use YYYY-MM-DD'
+        elif field == 'due_date':
+            value = None
+        values[field] = value
+    return values, None
+
+def _check_size(items):
+    if not isinstance(items, list):
+        raise BatchError('Expected a list')
+    if len(items) > MAX_BATCH_SIZE:
+        raise BatchError(f'At most {MAX_BATCH_SIZE} items per batch')
+
+def _existing_ids(user_id, ids):
+    if not ids:
+        return set()
+    return set(db.session.execute(
+        select(Task.id).where(Task.id.in_(ids), Task.user_id == user_id)
+    ).scalars())
+
+def _summary(results):
+    summary = {}
+    for result in results:
+        summary[result['result']] = summary.get(result['result'], 0) + 1
+    return {'results': results, 'summary': summary}
+
+def batch_create(user_id, items):
+    """Insert tasks with one executemany; per-item results in input order"""
+    _check_size(items)
+    now = datetime.utcnow()
+    results, rows = [], []
+    
+    for index, item in enumerate(items):
+        values, error = _parse_fields(item) if isinstance(item, dict) else (None, 'Item must be an object')
+        if error is None and not values.get('title'):
+            error = 'Title is required'
+        if error:
+            results.append({'index': index, 'result': 'error', 'error': error})
+            continue
+        
+        values.setdefault('priority', 'medium')
+        values.setdefault('status', 'todo')
+        values.update(
+            user_id=user_id, created_at=now, updated_at=now,
+            completed_at=now if values['status'] == 'completed' else None
+        )
+        results.append({'index': index, 'result': 'created'})
+        rows.append((len(results) - 1, values))
+    
+    if rows:
+        ids = db.session.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [values for _, values in rows]
+        ).scalars().all()
+        for (position, _), task_id in zip(rows, ids):
+            results[position]['id'] = task_id
+    db.session.commit()
+    
+    # Core inserts bypass the session hooks that publish ORM changes
+    for position, values in rows:
+        if values['status'] == 'completed':
+            event_bus.publish('task.completed', {'id': results[position]['id'], 'user_id': user_id, 'title': values['title']})
+    return _summary(results)
+
+def batch_update(user_id, items):
+    """Apply per-task changes with one UPDATE ... WHERE id IN (...) per distinct change set"""
+    _check_size(items)
+    now = datetime.utcnow()
+    results, groups, seen = [], {}, set()
+    
+    for item in items:
+        task_id = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            results.append({'id': task_id, 'result': 'error', 'error': 'Each item needs an integer id'})
+            continue
+        if task_id in seen:
+            results.append({'id': task_id, 'result': 'error', 'error': 'Duplicate id in batch'})
+            continue
+        seen.add(task_id)
+        
+        values, error = _parse_fields(item)
+        if error:
+            results.append({'id': task_id, 'result': 'error', 'error': error})
+            continue
+        
+        groups.setdefault(tuple(sorted(values.items())), []).append(task_id)
+        results.append({'id': task_id, 'result': 'updated'})
+    
+    existing = _existing_ids(user_id, [task_id for ids in groups.values() for task_id in ids])
+    for result in results:
+        if result['result'] == 'updated' and result['id'] not in existing:
+            result['result'] = 'not_found'
+    
+    completed = []
+    for key, ids in groups.items():
+        ids = [task_id for task_id in ids if task_id in existing]
+        if not ids:
+            continue
+        values = dict(key, updated_at=now)
+        if values.get('status') == 'completed':
+            # Tasks this change completes, for the task.completed events
+            completed.extend(
+                {'id': task_id, 'user_id': user_id, 'title': values.get('title', title)}
+                for task_id, title in db.session.execute(
+                    select(Task.id, Task.title).where(Task.id.in_(ids), Task.status.is_distinct_from('completed'))
+                )
+            )
+        # Same completed_at rules as update_task: stamped once on completion,
+        # cleared when the task leaves the completed state
+        if 'status' in values:
+            values['completed_at'] = (
+                func.coalesce(Task.completed_at, now) if values['status'] == 'completed' else None
+            )
+        db.session.execute(
+            update(Task).where(Task.id.in_(ids), Task.user_id == user_id).values(**values),
+            execution_options={'synchronize_session': False}
+        )
+    db.session.commit()
+    
+    # Core updates bypass the session hooks that publish ORM changes
+    for data in completed:
+        event_bus.publish('task.completed', data)
+    return _summary(results)
+
+def batch_delete(user_id, ids):
+    """Delete the user's tasks among ids with a single DELETE"""
+    _check_size(ids)
+    valid = [task_id for task_id in ids if isinstance(task_id, int) and not isinstance(task_id, bool)]
+    existing = _existing_ids(user_id, valid)
+    
+    if existing:
+        db.session.execute(
+            delete(Task).where(Task.id.in_(existing), Task.user_id == user_id),
+            execution_options={'synchronize_session': False}
+        )
+    db.session.commit()
+    
+    results = []
+    for task_id in ids:
+        if task_id not in valid:
+            results.append({'id': task_id, 'result': 'error', 'error': 'Ids must be integers'})
+        else:
+            results.append({'id': task_id, 'result': 'deleted' if task_id in existing else 'not_found'})
+    return _summary(results)
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from src.models import db, User
+
+class UserCache:
+    """Small thread-safe TTL + LRU cache of admin user id -> role.
+    
+    Only existing users are cached, so a newly created user is found on
+    the next lookup and a deleted one at most ttl seconds later in other
+    processes (immediately in this one, via the mapper listeners).
+    """
+    
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def configure(self, maxsize=None, ttl=None):
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if ttl is not None:
+            self.ttl = ttl
+        self.clear()
+    
+    def get_role(self, user_id):
+        """Role of the user, or None if no such user exists"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        
+        row = db.session.query(User.role).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        
+        with self._lock:
+            self._entries[user_id] = (row.role, now + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return row.role
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0
+        }
+
+user_cache = UserCache()
+
+def _invalidate_user(mapper, connection, target):
+    user_cache.invalidate(target.id)
+
+def register_user_cache_listeners():
+    """Drop cached entries whenever a User row is updated or deleted"""
+    if event.contains(User, 'after_update', _invalidate_user):
+        return
+    event.listen(User, 'after_update', _invalidate_user)
+    event.listen(User, 'after_delete', _invalidate_user)
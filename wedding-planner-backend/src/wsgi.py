@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers.
+Usage: gunicorn -c gunicorn.conf.py src.wsgi:app
+"""
+
+from src.main import create_app
+from src.services.jobs import start_job_workers
+
+app = create_app()
+
+# Only server processes run jobs: worker threads for imports, rebuilds,
+# solves and email sends queued as jobs (JOB_*)
+start_job_workers(app)